@@ -0,0 +1,45 @@
+import json
+import os
+
+# Persistent state of an incremental analysis (see Analyzer.analyze_runs_incremental).
+# One JSON file holds, for every analyzed raw data file (keyed by its path relative to
+# the run tree), the file fingerprint, column maxima, Pareto front and metrics, plus the
+# global reference point and reference Pareto front they were scored against, for one list
+# of objective columns.
+
+STATE_VERSION = 2
+DEFAULT_STATE_FILE = "analysis_state.json"
+
+
+def empty_state(root_dir, objectives=None):
+    return {
+        'version': STATE_VERSION,
+        'root_dir': os.path.abspath(root_dir),
+        'objectives': list(objectives) if objectives is not None else None,
+        'files': {},
+        'reference_point': None,
+        'reference_front': None,
+    }
+
+# 🛠️ Function to load the analysis state of a run tree
+def load_state(state_path, root_dir, objectives=None):
+    """
+    Returns the stored state, or a fresh one if the file is missing, unreadable or belongs to
+    another run tree or another list of objectives.
+    """
+    try:
+        with open(state_path, 'r') as file:
+            state = json.load(file)
+    except (OSError, ValueError):
+        return empty_state(root_dir, objectives)
+    if (state.get('version') != STATE_VERSION or state.get('root_dir') != os.path.abspath(root_dir)
+            or (objectives is not None and state.get('objectives') != list(objectives))):
+        return empty_state(root_dir, objectives)
+    return state
+
+# 🛠️ Function to save the analysis state atomically
+def save_state(state_path, state):
+    temp_path = state_path + '.tmp'
+    with open(temp_path, 'w') as file:
+        json.dump(state, file)
+    os.replace(temp_path, state_path)
@@ -1,9 +1,14 @@
 import pandas as pd
 import numpy as np
 import os
-import matplotlib.pyplot as plt
-from tqdm import tqdm
-from scipy.spatial.distance import euclidean
+import json
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial, lru_cache
+from Dominance import pareto_filter, nondominated_mask, non_dominated_ranks
+import QualityIndicators as qi
+import RunCache
+import AnalysisState
+import Instrumentation
 
 # 🛠️ Function to find all CSV files in the directory structure
 def find_all_csv_files(root_dir):
@@ -24,172 +29,429 @@ def find_all_csv_files(root_dir):
                             csv_files.append((run_folder, algo_folder, file_path))
     return csv_files
 
+OBJECTIVES = ['WalkingTime', 'ExposureTime']
+DEFAULT_CHUNKSIZE = 100_000
+# Cold-food decay of SuperMarketPlotter_v2. The optimizer does not store it, so it is derived
+# from IsleOrder/WalkingPattern when listed among the objectives, e.g. OBJECTIVES + [DECAY_OBJECTIVE].
+DECAY_OBJECTIVE = 'ColdDecay'
+ROUTE_COLUMNS = ['IsleOrder', 'WalkingPattern']
+LAYOUT_FILE = "market_layout.json"
+
+# 🛠️ Function to run a per-file task serially or across a process pool
+def parallel_map(func, items, workers=1, desc=None):
+    """
+    Applies `func` to every item with a tqdm progress bar and returns the results in input order.
+    workers=1 runs in-process; any other value uses a process pool of that size (None = all cores),
+    so serial and parallel runs produce identical results.
+    """
+    from tqdm import tqdm  # Imported on first use to keep `import Analyzer` light
+
+    items = list(items)
+    results = []
+    with tqdm(total=len(items), desc=desc, unit="file") as pbar:
+        if workers == 1:
+            for item in items:
+                results.append(func(item))
+                pbar.update(1)
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                for result in executor.map(func, items):
+                    results.append(result)
+                    pbar.update(1)
+    return results
+
 # 🛠️ Function to compute Pareto front
-def pareto_front(df):
-    df['WalkingTime'] = pd.to_numeric(df['WalkingTime'], errors='coerce')
-    df['ExposureTime'] = pd.to_numeric(df['ExposureTime'], errors='coerce')
-    df = df.dropna(subset=['WalkingTime', 'ExposureTime'])
-    solutions = df[['WalkingTime', 'ExposureTime']].dropna().values
-    solutions = np.array([list(map(float, sol)) for sol in solutions if len(sol) == 2])
-    solutions = solutions[np.argsort(solutions[:, 0])]
-    pareto_front = []
-    best_exposure = float('inf')
-
-    for sol in solutions:
-        if sol[1] < best_exposure:
-            pareto_front.append(sol.tolist())
-            best_exposure = sol[1]
-
-    return pd.DataFrame(pareto_front, columns=['WalkingTime', 'ExposureTime'])
+def pareto_front(df, objectives=OBJECTIVES):
+    solutions = df[objectives].apply(pd.to_numeric, errors='coerce').values
+    return pd.DataFrame(pareto_filter(solutions), columns=objectives)
+
+# 🛠️ Function to read selected columns of a raw data file in chunks
+def read_raw_chunks(file_path, columns, dtypes, chunksize=DEFAULT_CHUNKSIZE, use_cache=False):
+    """
+    Yields DataFrames with only `columns`, `chunksize` rows at a time (all at once if chunksize is None),
+    parsed from the CSV or, with use_cache, memory-mapped from its RunCache entry (built on first use).
+    """
+    if use_cache:
+        yield from RunCache.read_chunks(file_path, columns, chunksize)
+        return
+    reader = pd.read_csv(file_path, usecols=columns, dtype=dtypes, chunksize=chunksize)
+    yield from ([reader] if chunksize is None else reader)
+
+# 🛠️ Function to find the market layout a raw data file was produced on
+def find_layout_file(file_path):
+    """Returns the closest market_layout.json above the file (Run_<timestamp>/market_layout.json)."""
+    folder = os.path.dirname(os.path.abspath(file_path))
+    while True:
+        candidate = os.path.join(folder, LAYOUT_FILE)
+        if os.path.isfile(candidate):
+            return candidate
+        parent = os.path.dirname(folder)
+        if parent == folder:
+            raise FileNotFoundError(f"No {LAYOUT_FILE} found above {file_path}")
+        folder = parent
+
+@lru_cache(maxsize=8)
+def _decay_evaluator(layout_file):
+    from RouteEvaluator import RouteEvaluator  # Only needed for derived objectives
+
+    with open(layout_file, 'r') as file:
+        return RouteEvaluator.from_layout(json.load(file))
+
+# 🛠️ Function to list the raw data columns read for some objectives
+def objective_read_columns(objectives=OBJECTIVES, columns=()):
+    """`columns`, the stored objectives and, if DECAY_OBJECTIVE is wanted, the route columns it is derived from."""
+    stored = [objective for objective in objectives if objective != DECAY_OBJECTIVE]
+    return list(columns) + stored + (ROUTE_COLUMNS if len(stored) < len(objectives) else [])
+
+# 🛠️ Function to read the objective columns of a raw data file in chunks
+def read_objective_chunks(file_path, objectives=OBJECTIVES, chunksize=DEFAULT_CHUNKSIZE, use_cache=False, columns=()):
+    """
+    Like read_raw_chunks for `columns` plus `objectives` (as float64). DECAY_OBJECTIVE is computed
+    from the routes with the decay model of SuperMarketPlotter_v2 on the run's market layout.
+    """
+    stored = [objective for objective in objectives if objective != DECAY_OBJECTIVE]
+    derived = len(stored) < len(objectives)
+    read = objective_read_columns(objectives, columns)
+    dtypes = {column: ('int64' if column == 'Generation' else object) for column in read}
+    dtypes.update({objective: 'float64' for objective in stored})
+    evaluator = _decay_evaluator(find_layout_file(file_path)) if derived else None
+    for chunk in read_raw_chunks(file_path, read, dtypes, chunksize, use_cache):
+        if derived:
+            chunk[DECAY_OBJECTIVE] = evaluator.evaluate_frame(chunk, model='decay')['ExposureTime'].astype('float64')
+        yield chunk
+
+# 🛠️ Function to read a raw data file once and summarize it
+def read_raw_summary(file_path, chunksize=DEFAULT_CHUNKSIZE, use_cache=False, objectives=OBJECTIVES):
+    """
+    Reads only the objective columns of a raw data CSV, in typed chunks of
+    `chunksize` rows (or all at once if chunksize is None).
+    Returns (column maxima, Pareto front array); memory stays bounded by the chunk size.
+    """
+    maxima = np.full(len(objectives), np.nan)
+    archive = np.empty((0, len(objectives)))
+    with Instrumentation.stage('read_file', bytes_read=0 if use_cache else os.path.getsize(file_path)) as reading:
+        chunks = read_objective_chunks(file_path, objectives, chunksize, use_cache)
+        for chunk in Instrumentation.timed_iter('parse', chunks):
+            values = chunk[objectives].values
+            reading.add(rows=len(values))
+            if len(values) == 0:
+                continue
+            with Instrumentation.stage('front', rows=len(values)):
+                maxima = np.fmax(maxima, np.nanmax(values, axis=0))
+                archive = pareto_filter(np.vstack([archive, values]))
+        if use_cache:  # Only the mapped column files are read, not the CSV
+            reading.add(bytes_read=RunCache.cached_bytes(file_path, objective_read_columns(objectives)))
+    return maxima, archive
+
+# 🛠️ Function to track the running Pareto archive of a raw data file generation by generation
+def read_raw_trajectory(file_path, chunksize=DEFAULT_CHUNKSIZE, use_cache=False, objectives=OBJECTIVES):
+    """
+    Reads Generation and the objective columns of a raw data CSV in chunks and updates a
+    running non-dominated archive one generation at a time (rows are in generation order,
+    as the optimizer writes them).
+    Returns (column maxima, generations, snapshots) where snapshots[i] is the archive after generations[i].
+    """
+    maxima = np.full(len(objectives), np.nan)
+    archive = np.empty((0, len(objectives)))
+    generations, snapshots = [], []
+    for chunk in read_objective_chunks(file_path, objectives, chunksize, use_cache, columns=['Generation']):
+        values = chunk[objectives].values
+        chunk_generations = chunk['Generation'].values
+        if len(values) == 0:
+            continue
+        maxima = np.fmax(maxima, np.nanmax(values, axis=0))
+        starts = np.flatnonzero(np.r_[True, chunk_generations[1:] != chunk_generations[:-1]])
+        for start, end in zip(starts, np.r_[starts[1:], len(values)]):
+            # Only this generation's own front can enter the archive
+            archive = pareto_filter(np.vstack([archive, pareto_filter(values[start:end])]))
+            generation = int(chunk_generations[start])
+            if generations and generations[-1] == generation:  # Generation split across chunks
+                snapshots[-1] = archive
+            else:
+                generations.append(generation)
+                snapshots.append(archive)
+    return maxima, np.array(generations, dtype=np.int64), snapshots
 
 # 🛠️ Function to compute Hypervolume (HV)
-def compute_hypervolume(df, reference_point):
-    pareto_solutions = df[['WalkingTime', 'ExposureTime']].values.tolist()
-    pareto_solutions.sort(key=lambda x: x[0])
-    hv = 0.0
-    previous_point = reference_point[:]
-    for point in pareto_solutions:
-        width = abs(previous_point[0] - point[0])
-        height = abs(reference_point[1] - point[1])
-        hv += width * height
-        previous_point = point
-    return hv
+def compute_hypervolume(df, reference_point, objectives=OBJECTIVES):
+    """Exact up to QualityIndicators.EXACT_HV_OBJECTIVES objectives, a Monte Carlo estimate beyond."""
+    return qi.hypervolume(df[objectives].values, reference_point)
 
 # 🛠️ Function to compute IGD (Inverted Generational Distance)
-def compute_igd(df, reference_pareto):
-    obtained_solutions = df[['WalkingTime', 'ExposureTime']].values
-    reference_solutions = reference_pareto[['WalkingTime', 'ExposureTime']].values
-
-    if np.array_equal(obtained_solutions, reference_solutions):
-        return 0.0  # Avoid unnecessary calculations
-
-    igd_values = [np.min(np.linalg.norm(obtained_solutions - ref, axis=1)) for ref in reference_solutions]
-    return np.mean(igd_values)
+def compute_igd(df, reference_pareto, objectives=OBJECTIVES):
+    return qi.igd(df[objectives].values, reference_pareto[objectives].values)
 
 # 🛠️ Function to compute Spread
-def compute_spread(df, pareto_df):
-    pareto_points = pareto_df[['WalkingTime', 'ExposureTime']].values
-    pareto_points = sorted(pareto_points, key=lambda x: x[0])
-    distances = [euclidean(pareto_points[i], pareto_points[i+1]) for i in range(len(pareto_points)-1)]
-    distances = np.array(distances)
-    threshold = np.percentile(distances, 99)
-    filtered_distances = distances[distances < threshold]
-    if len(filtered_distances) == 0:
-        return float('inf')
-    mean_dist = np.mean(filtered_distances)
-    return np.sum((filtered_distances - mean_dist) ** 2) / len(filtered_distances)
-
-def compute_global_reference_point(root_dir):
+def compute_spread(df, pareto_df, objectives=OBJECTIVES):
+    return qi.spread(pareto_df[objectives].values)
+
+# 🛠️ Function to compute all metrics of one Pareto front
+def score_front(pareto_df, reference_point, reference_pareto, objectives=OBJECTIVES):
+    """Computes HV, IGD, Spread, the number of Pareto solutions, IGD+, GD and additive epsilon for a single front."""
+    front = pareto_df[objectives].values
+    reference_front = reference_pareto[objectives].values
+    metrics = {
+        'Hypervolume': lambda: compute_hypervolume(pareto_df, reference_point, objectives),  # Use global reference
+        'IGD': lambda: compute_igd(pareto_df, reference_pareto, objectives),  # Use the computed reference
+        'Spread': lambda: compute_spread(pareto_df, pareto_df, objectives),
+        'Pareto Solutions': lambda: len(pareto_df),
+        'IGD+': lambda: qi.igd_plus(front, reference_front),
+        'GD': lambda: qi.gd(front, reference_front),
+        'Epsilon': lambda: qi.additive_epsilon(front, reference_front)
+    }
+    results = {}
+    for name, metric in metrics.items():
+        with Instrumentation.stage(f"metric {name}", rows=len(front)):
+            results[name] = metric()
+    return results
+
+# 🛠️ Function to score every (run, algorithm, generation) front in one call
+def score_generation_fronts(df, reference_point, reference_pareto, by=('Run', 'Algorithm', 'Generation'),
+                            objectives=OBJECTIVES):
+    """
+    Takes raw solutions tagged with the `by` columns (e.g. a merged raw data table),
+    extracts the Pareto front of every group and scores all of them in one batched call.
+    Returns one row per group with the same metric columns as score_front.
+    """
+    by = list(by)
+    group_ids = df.groupby(by, sort=False).ngroup().values
+    solutions = df[objectives].apply(pd.to_numeric, errors='coerce').values
+    labels, metrics = qi.score_fronts(solutions, group_ids, reference_point, reference_pareto[objectives].values)
+    keys = df[by].groupby(group_ids).first().loc[labels].reset_index(drop=True)
+    return pd.concat([keys, pd.DataFrame(metrics)], axis=1)
+
+# 🛠️ Function to build the HV reference point objective by objective
+def resolve_reference_point(maxima, objectives=OBJECTIVES, reference_point=None):
+    """
+    Returns the reference point as a list: the observed maximum of every objective, except
+    where `reference_point` (a dict objective -> value, or a full list) fixes the value.
+    """
+    point = np.nanmax(np.reshape(maxima, (-1, len(objectives))), axis=0).tolist()
+    if isinstance(reference_point, dict):
+        unknown = set(reference_point) - set(objectives)
+        if unknown:
+            raise ValueError(f"Reference point given for unknown objectives {sorted(unknown)}")
+        point = [float(reference_point.get(objective, value)) for objective, value in zip(objectives, point)]
+    elif reference_point is not None:
+        if len(reference_point) != len(objectives):
+            raise ValueError(f"Reference point needs {len(objectives)} values, got {len(reference_point)}")
+        point = [float(value) for value in reference_point]
+    return point
+
+def compute_global_reference_point(root_dir, chunksize=DEFAULT_CHUNKSIZE, workers=1, use_cache=False, objectives=OBJECTIVES):
     """
     Computes a single reference point across all runs and algorithms.
     """
-    all_max_walking = []
-    all_max_exposure = []
+    file_paths = [file_path for _, _, file_path in find_all_csv_files(root_dir)]
+    summaries = parallel_map(partial(read_raw_summary, chunksize=chunksize, use_cache=use_cache, objectives=objectives),
+                             file_paths, workers, "Reading Maxima")
+    return resolve_reference_point([maxima for maxima, _ in summaries], objectives)
 
-    for run, algorithm, file_path in find_all_csv_files(root_dir):
-        df = pd.read_csv(file_path)
-        all_max_walking.append(df['WalkingTime'].max())
-        all_max_exposure.append(df['ExposureTime'].max())
-
-    return [max(all_max_walking), max(all_max_exposure)]
-
-def compute_reference_pareto(pareto_df):
+def compute_reference_pareto(pareto_df, objectives=OBJECTIVES):
     """
     Computes a unified reference Pareto front across all runs and algorithms.
     """
-    all_solutions = pareto_df[['WalkingTime', 'ExposureTime']].values.tolist()
+    all_solutions = pareto_df[objectives].values
 
     # Remove dominated solutions to get the best known Pareto front
-    reference_solutions = []
-    for sol in all_solutions:
-        dominated = False
-        for other in all_solutions:
-            if (other[0] <= sol[0] and other[1] <= sol[1]) and (other[0] < sol[0] or other[1] < sol[1]):
-                dominated = True
-                break
-        if not dominated:
-            reference_solutions.append(sol)
-
-    return pd.DataFrame(reference_solutions, columns=['WalkingTime', 'ExposureTime'])
+    reference_solutions = all_solutions[nondominated_mask(all_solutions)]
 
+    return pd.DataFrame(reference_solutions, columns=objectives)
 
-def analyze_runs(root_dir):
+# 🛠️ Function to count solutions per non-domination rank
+def compute_rank_histogram(df, objectives=OBJECTIVES):
     """
-    Processes all CSV files in the directory structure.
-    Computes performance metrics & Pareto solutions.
-    Stores all final-generation Pareto solutions.
+    Assigns every solution its non-domination rank (1 = Pareto front) and
+    returns a DataFrame with the number of solutions per rank.
     """
-    csv_files = find_all_csv_files(root_dir)
-    print(f"🔍 Found {len(csv_files)} CSV files. Starting analysis...\n")
+    solutions = df[objectives].apply(pd.to_numeric, errors='coerce').dropna().values
+    ranks, counts = np.unique(non_dominated_ranks(solutions), return_counts=True)
+    return pd.DataFrame({'Rank': ranks, 'Solutions': counts})
 
-    # Compute a single reference point for HV
-    global_reference_point = compute_global_reference_point(root_dir)
-    print(f"✅ Using Global Reference Point for HV: {global_reference_point}\n")
 
-    performance_results = []
+# 🛠️ Function to assemble the analysis tables from per-file fronts and metrics
+def collect_results(csv_files, fronts, metrics, objectives=OBJECTIVES):
+    """
+    Builds (performance_df, pareto_df, all_final_pareto_df) from one front array and one
+    metrics dict per (run, algorithm, file_path) entry, in discovery order.
+    """
     pareto_results = []
     all_final_pareto = []  # Stores all last-generation Pareto solutions
+    for (run, algorithm, _), front in zip(csv_files, fronts):
+        # Store Pareto solutions per run & algorithm
+        pareto_df = pd.DataFrame(front, columns=objectives)
+        pareto_df['Run'] = run
+        pareto_df['Algorithm'] = algorithm
+        pareto_results.append(pareto_df)
 
-    # **Step 1: First pass - Extract Pareto fronts for all runs**
-    with tqdm(total=len(csv_files), desc="Extracting Pareto Fronts", unit="file") as pbar:
-        for run, algorithm, file_path in csv_files:
-            df = pd.read_csv(file_path)
-            pareto_df = pareto_front(df)
-
-            # Store Pareto solutions per run & algorithm
-            pareto_df['Run'] = run
-            pareto_df['Algorithm'] = algorithm
-            pareto_results.append(pareto_df)
-
-            # **Store final Pareto solutions in a global table**
-            for _, row in pareto_df.iterrows():
-                all_final_pareto.append({
-                    'Algorithm': algorithm,
-                    'Run': run,
-                    'WalkingTime': row['WalkingTime'],
-                    'ExposureTime': row['ExposureTime']
-                })
-
-            pbar.update(1)
-
-    # Convert Pareto results to DataFrame
-    pareto_df = pd.concat(pareto_results, ignore_index=True)
-
-    # **Step 2: Compute Unified Reference Pareto Front**
-    print("\n🔍 Computing Unified Reference Pareto Front...")
-    reference_pareto = compute_reference_pareto(pareto_df)
-    print(f"✅ Reference Pareto Front computed with {len(reference_pareto)} solutions.\n")
-
-    # **Step 3: Second pass - Compute IGD and other metrics**
-    with tqdm(total=len(csv_files), desc="Computing Metrics", unit="file") as pbar:
-        for run, algorithm, file_path in csv_files:
-            df = pd.read_csv(file_path)
-            pareto_df = pareto_front(df)
+        # **Store final Pareto solutions in a global table**
+        all_final_pareto.append(pareto_df[['Algorithm', 'Run'] + list(objectives)])
 
-            hv = compute_hypervolume(pareto_df, global_reference_point)  # Use global reference
-            igd = compute_igd(pareto_df, reference_pareto)  # Use the computed reference
-            spread = compute_spread(df, pareto_df)
-
-            # Store performance metrics per run & algorithm
-            performance_results.append({
-                'Run': run,
-                'Algorithm': algorithm,
-                'Hypervolume': hv,
-                'IGD': igd,
-                'Spread': spread,
-                'Pareto Solutions': len(pareto_df)
-            })
-
-            pbar.update(1)
-
-    print("\n✅ Analysis Completed!")
+    # Store performance metrics per run & algorithm
+    performance_results = [{'Run': run, 'Algorithm': algorithm, **front_metrics}
+                           for (run, algorithm, _), front_metrics in zip(csv_files, metrics)]
 
     # Convert lists to DataFrames
     performance_df = pd.DataFrame(performance_results)
-    all_final_pareto_df = pd.DataFrame(all_final_pareto)  # Store all Pareto solutions
-
+    pareto_df = pd.concat(pareto_results, ignore_index=True)
+    all_final_pareto_df = pd.concat(all_final_pareto, ignore_index=True)  # Store all Pareto solutions
     return performance_df, pareto_df, all_final_pareto_df
 
+def analyze_runs(root_dir, chunksize=DEFAULT_CHUNKSIZE, workers=1, use_cache=False, objectives=OBJECTIVES,
+                 reference_point=None):
+    """
+    Processes all CSV files in the directory structure.
+    Computes performance metrics & Pareto solutions.
+    Stores all final-generation Pareto solutions.
+
+    Each file is read exactly once, `chunksize` rows at a time: the same pass
+    updates the global reference point and the per-file Pareto archive, and the
+    metrics are then computed on the small in-memory fronts.
+    Per-file work is spread over `workers` processes (see parallel_map); the
+    reference point and reference Pareto front are reduced in this process.
+    With use_cache, files are read from their columnar RunCache entries instead of re-parsing the CSVs.
+    `objectives` may list any number of objective columns (and DECAY_OBJECTIVE); the HV reference
+    point is taken per objective from the data unless `reference_point` fixes it (see resolve_reference_point).
+    """
+    objectives = list(objectives)
+    with Instrumentation.stage('analyze_runs'):
+        with Instrumentation.stage('discovery') as discovery:
+            csv_files = find_all_csv_files(root_dir)
+            discovery.add(rows=len(csv_files))
+        print(f"🔍 Found {len(csv_files)} CSV files. Starting analysis...\n")
+
+        # **Step 1: Single streaming pass - Reference point maxima & Pareto fronts**
+        file_paths = [file_path for _, _, file_path in csv_files]
+        with Instrumentation.stage('read_fronts'):
+            summaries = parallel_map(partial(read_raw_summary, chunksize=chunksize, use_cache=use_cache, objectives=objectives),
+                                     file_paths, workers, "Extracting Pareto Fronts")
+        fronts = [front for _, front in summaries]
+
+        # Compute a single reference point for HV
+        global_reference_point = resolve_reference_point([maxima for maxima, _ in summaries], objectives, reference_point)
+        print(f"✅ Using Global Reference Point for HV: {global_reference_point}\n")
+
+        # **Step 2: Compute Unified Reference Pareto Front**
+        print("\n🔍 Computing Unified Reference Pareto Front...")
+        with Instrumentation.stage('reference_front', rows=sum(len(front) for front in fronts)):
+            reference_pareto = compute_reference_pareto(pd.DataFrame(np.vstack(fronts), columns=objectives), objectives)
+        print(f"✅ Reference Pareto Front computed with {len(reference_pareto)} solutions.\n")
+
+        # **Step 3: Compute IGD and other metrics on the in-memory fronts**
+        scorer = partial(score_front, reference_point=global_reference_point, reference_pareto=reference_pareto,
+                         objectives=objectives)
+        with Instrumentation.stage('metrics', rows=sum(len(front) for front in fronts)):
+            metrics = parallel_map(scorer, [pd.DataFrame(front, columns=objectives) for front in fronts], workers, "Computing Metrics")
+
+        print("\n✅ Analysis Completed!")
+
+        with Instrumentation.stage('collect'):
+            return collect_results(csv_files, fronts, metrics, objectives)
+
+def analyze_runs_incremental(root_dir, state_path=AnalysisState.DEFAULT_STATE_FILE, chunksize=DEFAULT_CHUNKSIZE,
+                             workers=1, use_cache=False, objectives=OBJECTIVES, reference_point=None):
+    """
+    Same results as analyze_runs, but keeps per-file fronts, maxima and metrics in a
+    persistent state file keyed by file fingerprint (see AnalysisState). Only new or
+    changed files are read; their fronts are merged into the stored reference Pareto
+    front, and stored metrics are only recomputed when the global reference point or
+    reference front actually changed. A state written for other objectives starts over.
+    """
+    objectives = list(objectives)
+    csv_files = find_all_csv_files(root_dir)
+    state = AnalysisState.load_state(state_path, root_dir, objectives)
+    entries = state['files']
+    keys = [os.path.relpath(file_path, root_dir) for _, _, file_path in csv_files]
+
+    changed = [key for key in keys if key in entries and not RunCache.file_unchanged(os.path.join(root_dir, key), entries[key]['source'])]
+    removed = [key for key in entries if key not in set(keys)]
+    stale = [(key, csv_file) for key, csv_file in zip(keys, csv_files) if key not in entries or key in changed]
+    print(f"🔍 Found {len(csv_files)} CSV files: {len(stale)} new or changed, {len(removed)} removed.\n")
+
+    # **Step 1: Read only the new or changed files**
+    with Instrumentation.stage('read_fronts'):
+        summaries = parallel_map(partial(read_raw_summary, chunksize=chunksize, use_cache=use_cache, objectives=objectives),
+                                 [file_path for _, (_, _, file_path) in stale], workers, "Extracting Pareto Fronts")
+    for (key, (run, algorithm, file_path)), (maxima, front) in zip(stale, summaries):
+        entries[key] = {'run': run, 'algorithm': algorithm, 'source': RunCache.file_fingerprint(file_path),
+                        'maxima': maxima.tolist(), 'front': front.tolist(), 'metrics': None}
+    for key in removed:
+        del entries[key]
+
+    # **Step 2: Update the reference point and reference Pareto front**
+    reference_point = resolve_reference_point([entries[key]['maxima'] for key in keys], objectives, reference_point)
+    if changed or removed or state['reference_front'] is None:
+        candidates = [entries[key]['front'] for key in keys]  # Stored fronts may have left the reference
+    else:
+        candidates = [state['reference_front']] + [entries[key]['front'] for key, _ in stale]
+    with Instrumentation.stage('reference_front') as reduction:
+        candidates = np.vstack([np.reshape(front, (-1, len(objectives))) for front in candidates])
+        reduction.add(rows=len(candidates))
+        reference_front = candidates[nondominated_mask(candidates)]
+        reference_front = reference_front[np.lexsort(reference_front.T[::-1])]
+
+    reference_changed = (reference_point != state['reference_point']
+                         or not np.array_equal(reference_front, np.reshape(state['reference_front'] or [], (-1, len(objectives)))))
+    state['reference_point'] = reference_point
+    state['reference_front'] = reference_front.tolist()
+    print(f"✅ Reference point {reference_point}, reference front with {len(reference_front)} solutions"
+          f" ({'changed' if reference_changed else 'unchanged'}).\n")
+
+    # **Step 3: Score the new files, or every file if the reference changed**
+    to_score = [key for key in keys if reference_changed or entries[key]['metrics'] is None]
+    reference_pareto = pd.DataFrame(reference_front, columns=objectives)
+    scorer = partial(score_front, reference_point=reference_point, reference_pareto=reference_pareto, objectives=objectives)
+    fronts = {key: np.reshape(entries[key]['front'], (-1, len(objectives))) for key in keys}
+    with Instrumentation.stage('metrics', rows=sum(len(fronts[key]) for key in to_score)):
+        metrics = parallel_map(scorer, [pd.DataFrame(fronts[key], columns=objectives) for key in to_score], workers, "Computing Metrics")
+    for key, front_metrics in zip(to_score, metrics):
+        entries[key]['metrics'] = {name: float(value) for name, value in front_metrics.items()}
+
+    with Instrumentation.stage('save_state'):
+        AnalysisState.save_state(state_path, state)
+    print(f"\n✅ Analysis Completed! State saved to {state_path}")
+
+    results = collect_results(csv_files, [fronts[key] for key in keys], [entries[key]['metrics'] for key in keys], objectives)
+    results[0]['Pareto Solutions'] = results[0]['Pareto Solutions'].astype(int)
+    return results
+
+
+def analyze_trajectories(root_dir, chunksize=DEFAULT_CHUNKSIZE, workers=1, reference_point=None, reference_pareto=None,
+                         use_cache=False, objectives=OBJECTIVES):
+    """
+    Computes the convergence trajectory of every run & algorithm: the HV, IGD and size of the
+    running Pareto archive after each generation, as one compact table
+    (Run, Algorithm, Generation, Hypervolume, IGD, Pareto Solutions).
+    The reference point and reference Pareto front default to the ones analyze_runs uses.
+    """
+    csv_files = find_all_csv_files(root_dir)
+    print(f"🔍 Found {len(csv_files)} CSV files. Tracking convergence trajectories...\n")
+
+    file_paths = [file_path for _, _, file_path in csv_files]
+    trajectories = parallel_map(partial(read_raw_trajectory, chunksize=chunksize, use_cache=use_cache, objectives=objectives),
+                                file_paths, workers, "Tracking Archives")
+
+    reference_point = resolve_reference_point([maxima for maxima, _, _ in trajectories], objectives, reference_point)
+    if reference_pareto is None:
+        final_fronts = [snapshots[-1] for _, _, snapshots in trajectories if snapshots]
+        reference_pareto = compute_reference_pareto(pd.DataFrame(np.vstack(final_fronts), columns=objectives), objectives)
+
+    # One row per (file, generation) archive, all scored in a single batched call
+    keys = pd.DataFrame([(run, algorithm, generation)
+                         for (run, algorithm, _), (_, generations, _) in zip(csv_files, trajectories)
+                         for generation in generations],
+                        columns=['Run', 'Algorithm', 'Generation'])
+    snapshots = [snapshot for _, _, file_snapshots in trajectories for snapshot in file_snapshots]
+    groups = np.repeat(np.arange(len(snapshots)), [len(snapshot) for snapshot in snapshots])
+    labels, metrics = qi.score_fronts(np.vstack(snapshots), groups, reference_point, reference_pareto[objectives].values)
+
+    trajectory_df = keys.loc[labels].reset_index(drop=True)
+    trajectory_df['Generation'] = trajectory_df['Generation'].astype('int32')
+    for metric in ['Hypervolume', 'IGD', 'Pareto Solutions']:
+        trajectory_df[metric] = metrics[metric]
+    print("\n✅ Convergence trajectories computed!")
+    return trajectory_df
+
 
 # **Main Execution**
 if __name__ == "__main__":
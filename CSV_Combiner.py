@@ -1,7 +1,32 @@
 import pandas as pd
 import numpy as np
 import os
-from tqdm import tqdm
+import bz2
+import gzip
+import lzma
+import shutil
+import importlib.util
+import tempfile
+from functools import partial
+from Analyzer import parallel_map, read_raw_chunks, DEFAULT_CHUNKSIZE, OBJECTIVES, ROUTE_COLUMNS
+from Dominance import pareto_filter
+import RunCache
+
+# Streaming merge of a run tree: every raw data file is read in chunks of `chunksize` rows,
+# tagged with Run/Algorithm and appended to the output, so memory stays at a few chunks
+# whatever the size of the sweep. Filters are pushed down to the reader:
+#   - algorithms       - files of other algorithms are never opened,
+#   - last_generations - a Generation-only pre-pass finds each file's last generation,
+#   - pareto_only      - an objectives-only pre-pass finds each file's Pareto front
+#                        (over the rows the generation filter keeps).
+# Outputs: one CSV ('csv', optionally gzip/bz2/xz compressed) or a directory partitioned
+# as Run=<run>/Algorithm=<algorithm>/ holding CSV parts ('csv-partitioned') or Parquet
+# parts ('parquet', needs pyarrow or fastparquet).
+
+OUTPUT_FORMATS = ('csv', 'csv-partitioned', 'parquet')
+COMPRESSIONS = {'gzip': ('.gz', gzip.open), 'bz2': ('.bz2', bz2.open), 'xz': ('.xz', lzma.open)}
+TAG_COLUMNS = ['Run', 'Algorithm']
+
 
 def find_all_csv_files(root_dir):
     """Traverses the directory structure to find CSV files inside each algorithm folder."""
@@ -18,28 +43,183 @@ def find_all_csv_files(root_dir):
                             csv_files.append((run_folder, algo_folder, file_path))
     return csv_files
 
-def merge_all_runs(root_dir, output_file="merged_raw_data.csv"):
-    """Merges all raw data solutions from all runs and algorithms into a unified CSV file."""
+# 🛠️ Function to pick the output compression
+def resolve_compression(output_file, compression='infer'):
+    """Returns 'gzip', 'bz2', 'xz' or None; 'infer' looks at the output file extension."""
+    if compression == 'infer':
+        return next((name for name, (extension, _) in COMPRESSIONS.items() if output_file.endswith(extension)), None)
+    if compression is not None and compression not in COMPRESSIONS:
+        raise ValueError(f"Unknown compression '{compression}', expected one of {list(COMPRESSIONS)}")
+    return compression
+
+def _open_text(path, compression, mode='wt'):
+    if compression is None:
+        return open(path, mode.replace('t', ''), newline='')
+    return COMPRESSIONS[compression][1](path, mode, newline='')
+
+def read_header(file_path, use_cache=False):
+    """Column names of a raw data file (from its RunCache entry with use_cache)."""
+    if use_cache:
+        return list(RunCache.ensure_cache(file_path)['header'])
+    return list(pd.read_csv(file_path, nrows=0).columns)
+
+# 🛠️ Function to resolve the pushed-down row filters of one file
+def scan_filters(file_path, last_generations=None, pareto_only=False, chunksize=DEFAULT_CHUNKSIZE, use_cache=False):
+    """
+    Reads only the columns the filters need. Returns (first generation to keep or None,
+    Pareto front array of the kept generations or None).
+    """
+    first_generation, front = None, None
+    if last_generations is not None:
+        last = max((int(chunk['Generation'].max()) for chunk in
+                    read_raw_chunks(file_path, ['Generation'], {'Generation': 'int64'}, chunksize, use_cache) if len(chunk)),
+                   default=0)
+        first_generation = last - last_generations + 1
+    if pareto_only:
+        columns = OBJECTIVES + (['Generation'] if first_generation is not None else [])
+        dtypes = {column: ('int64' if column == 'Generation' else 'float64') for column in columns}
+        front = np.empty((0, len(OBJECTIVES)))
+        for chunk in read_raw_chunks(file_path, columns, dtypes, chunksize, use_cache):
+            if first_generation is not None:
+                chunk = chunk[chunk['Generation'] >= first_generation]
+            if len(chunk):
+                front = pareto_filter(np.vstack([front, chunk[OBJECTIVES].values]))
+    return first_generation, front
+
+def _row_keys(values):
+    """One hashable-by-bytes key per row of a float array, for exact row matching."""
+    values = np.ascontiguousarray(values, dtype=np.float64)
+    return values.view(np.dtype((np.void, values.dtype.itemsize * values.shape[1]))).ravel()
+
+# 🛠️ Function to stream the filtered, tagged chunks of one raw data file
+def read_filtered_chunks(csv_file, chunksize=DEFAULT_CHUNKSIZE, use_cache=False, last_generations=None, pareto_only=False,
+                         counts=None, output_columns=None):
+    """
+    Yields the rows of one (run, algorithm, file_path) entry that pass the filters, tagged with
+    Run/Algorithm, `chunksize` rows at a time. `counts` (a dict) receives rows read and kept.
+    With `output_columns`, chunks are aligned to those columns by name (missing ones left empty).
+    """
+    run, algorithm, file_path = csv_file
+    counts = {} if counts is None else counts
+    counts.setdefault('Rows Read', 0)
+    counts.setdefault('Rows Written', 0)
+    first_generation, front = scan_filters(file_path, last_generations, pareto_only, chunksize, use_cache)
+    front_keys = _row_keys(front) if front is not None else None
+
+    columns = read_header(file_path, use_cache)
+    dtypes = {column: object for column in ROUTE_COLUMNS if column in columns}
+    for chunk in read_raw_chunks(file_path, columns, dtypes, chunksize, use_cache):
+        counts['Rows Read'] += len(chunk)
+        if first_generation is not None:
+            chunk = chunk[chunk['Generation'] >= first_generation]
+        if front_keys is not None:
+            chunk = chunk[np.isin(_row_keys(chunk[OBJECTIVES].values), front_keys)]
+        if len(chunk) == 0:
+            continue
+        chunk = chunk.assign(Run=run, Algorithm=algorithm)
+        if output_columns is not None:
+            chunk = chunk.reindex(columns=output_columns + TAG_COLUMNS)
+        counts['Rows Written'] += len(chunk)
+        yield chunk
+
+# 🛠️ Function to append the filtered rows of one file to an open CSV stream
+def write_csv_rows(csv_file, handle, **filters):
+    counts = {}
+    for chunk in read_filtered_chunks(csv_file, counts=counts, **filters):
+        chunk.to_csv(handle, header=False, index=False)
+    return counts
+
+# 🛠️ Function to write the filtered rows of one file to its own headerless CSV part
+def write_csv_part(task, compression=None, **filters):
+    csv_file, part_path = task
+    with _open_text(part_path, compression) as handle:
+        return write_csv_rows(csv_file, handle, **filters)
+
+# 🛠️ Function to write the filtered rows of one file into its Run=/Algorithm= partition
+def write_partition(csv_file, output_dir, output_format='csv-partitioned', compression=None, **filters):
+    """
+    CSV partitions get one part-00000.csv[.gz] per file (with the Run/Algorithm columns);
+    Parquet partitions get one part-<n>.parquet per chunk, without the partition columns.
+    """
+    run, algorithm, _ = csv_file
+    partition = os.path.join(output_dir, f"Run={run}", f"Algorithm={algorithm}")
+    os.makedirs(partition, exist_ok=True)
+    counts = {}
+    chunks = read_filtered_chunks(csv_file, counts=counts, **filters)
+    if output_format == 'parquet':
+        for number, chunk in enumerate(chunks):
+            chunk.drop(columns=TAG_COLUMNS).to_parquet(os.path.join(partition, f"part-{number:05d}.parquet"),
+                                                       index=False, compression=compression or 'snappy')
+        return counts
+    extension = '.csv' + (COMPRESSIONS[compression][0] if compression else '')
+    with _open_text(os.path.join(partition, f"part-00000{extension}"), compression) as handle:
+        handle.write(','.join(read_header(csv_file[2], filters.get('use_cache', False)) + TAG_COLUMNS) + '\n')
+        for chunk in chunks:
+            chunk.to_csv(handle, header=False, index=False)
+    return counts
+
+def merge_all_runs(root_dir, output_file="merged_raw_data.csv", workers=1, use_cache=False, chunksize=DEFAULT_CHUNKSIZE,
+                   output_format='csv', compression='infer', algorithms=None, last_generations=None, pareto_only=False):
+    """
+    Streams all raw data solutions from all runs and algorithms into `output_file` (a CSV, or a
+    directory for the partitioned formats) without holding more than a few chunks in memory.
+    Files are processed across `workers` processes (None = all cores); CSV rows keep discovery order.
+    `algorithms` (names), `last_generations` (N) and `pareto_only` filter rows before they are written.
+    Returns a dict with the files merged and the rows read and written.
+    """
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"Unknown output format '{output_format}', expected one of {OUTPUT_FORMATS}")
+    if output_format != 'parquet':
+        compression = resolve_compression(output_file, compression)
+    elif compression == 'infer':
+        compression = None
+    if output_format == 'parquet' and not any(importlib.util.find_spec(engine) for engine in ('pyarrow', 'fastparquet')):
+        raise ImportError("The 'parquet' output format needs pyarrow or fastparquet installed")
     csv_files = find_all_csv_files(root_dir)
+    if algorithms is not None:
+        csv_files = [csv_file for csv_file in csv_files if csv_file[1] in set(algorithms)]
     print(f"🔍 Found {len(csv_files)} CSV files. Starting merging process...\n")
-    
-    all_data = []
-    with tqdm(total=len(csv_files), desc="Processing Files", unit="file") as pbar:
-        for run, algorithm, file_path in csv_files:
-            df = pd.read_csv(file_path)
-            df['Run'] = run
-            df['Algorithm'] = algorithm
-            all_data.append(df)
-            pbar.update(1)
-    
-    merged_df = pd.concat(all_data, ignore_index=True)
-    merged_df.to_csv(output_file, index=False)
-    print(f"✅ Merging completed! Data saved to {output_file}\n")
-    return merged_df
+    filters = {'chunksize': chunksize, 'use_cache': use_cache, 'last_generations': last_generations, 'pareto_only': pareto_only}
+
+    if output_format != 'csv':
+        write = partial(write_partition, output_dir=output_file, output_format=output_format, compression=compression, **filters)
+        counts = parallel_map(write, csv_files, workers, "Processing Files")
+    else:
+        # One header for all files: every column in first-seen order, as pd.concat would align them
+        headers = [read_header(csv_file[2], use_cache) for csv_file in csv_files]
+        output_columns = list(dict.fromkeys(column for file_header in headers for column in file_header))
+        mismatched = [csv_file[2] for csv_file, file_header in zip(csv_files, headers) if file_header != output_columns]
+        if mismatched:
+            print(f"⚠️ {len(mismatched)} file(s) have other columns or column order than the merged header; "
+                  f"their rows are aligned by column name (e.g. {mismatched[0]})")
+        filters['output_columns'] = output_columns
+        header = ','.join(output_columns + TAG_COLUMNS) + '\n'
+        if workers == 1:
+            with _open_text(output_file, compression) as handle:
+                handle.write(header)
+                counts = parallel_map(partial(write_csv_rows, handle=handle, **filters), csv_files, 1, "Processing Files")
+        else:
+            # Workers write one part per file; concatenated compressed streams are still one valid file
+            with tempfile.TemporaryDirectory(dir=os.path.dirname(os.path.abspath(output_file))) as part_dir:
+                tasks = [(csv_file, os.path.join(part_dir, f"{number:06d}.part")) for number, csv_file in enumerate(csv_files)]
+                counts = parallel_map(partial(write_csv_part, compression=compression, **filters), tasks, workers, "Processing Files")
+                with _open_text(output_file, compression) as handle:
+                    handle.write(header)
+                with open(output_file, 'ab') as output:
+                    for _, part_path in tasks:
+                        with open(part_path, 'rb') as part:
+                            shutil.copyfileobj(part, output)
+
+    summary = {'Files': len(csv_files),
+               'Rows Read': sum(count.get('Rows Read', 0) for count in counts),
+               'Rows Written': sum(count.get('Rows Written', 0) for count in counts),
+               'Output': output_file, 'Format': output_format, 'Compression': compression}
+    print(f"✅ Merging completed! {summary['Rows Written']:,} of {summary['Rows Read']:,} rows saved to {output_file}\n")
+    return summary
 
 # **Main Execution**
 if __name__ == "__main__":
     root_directory = r"C:\Users\Jeryes\github\SuperMarketNavigation\MultiObject\SuperMarketNavigation\bin\Debug\net9.0\Run_20250209_004552"
-    merged_df = merge_all_runs(root_directory)
+    merge_summary = merge_all_runs(root_directory)
     print("\n📊 **Merged Data Sample:**")
-    print(merged_df.head())
+    print(pd.read_csv(merge_summary['Output'], nrows=5))
@@ -0,0 +1,232 @@
+import numpy as np
+from bisect import bisect_right
+
+# Objectives are minimized, exactly as in Sorting/NonDominatedSorting.cs.
+BLOCK_SIZE = 16384
+MIN_BLOCK_SIZE = 512
+
+
+# 🛠️ Function to check Pareto dominance between two points
+def dominates(p, q):
+    """Returns True if p is no worse than q in every objective and strictly better in at least one."""
+    p, q = np.asarray(p), np.asarray(q)
+    return bool(np.all(p <= q) and np.any(p < q))
+
+def _as_points(points):
+    points = np.asarray(points, dtype=float)
+    return points.reshape(len(points), -1) if points.ndim != 2 else points
+
+# 🛠️ Function to get the unique rows of an objective array in lexicographic order
+def _unique_rows(points):
+    """Like np.unique(points, axis=0, return_inverse=True), but with a plain lexsort (much faster)."""
+    order = np.lexsort(points.T[::-1])
+    ordered = points[order]
+    new = np.ones(len(points), dtype=bool)
+    new[1:] = np.any(ordered[1:] != ordered[:-1], axis=1)
+    inverse = np.empty(len(points), dtype=np.int64)
+    inverse[order] = np.cumsum(new) - 1
+    return ordered[new], inverse
+
+# 🛠️ Function to compare two sets of points objective by objective
+def _weakly_dominates(a, b):
+    """Returns the (len(a), len(b)) matrix of "a[i] <= b[j] in every objective"."""
+    result = a[:, None, 0] <= b[None, :, 0]
+    for m in range(1, a.shape[1]):
+        result &= a[:, None, m] <= b[None, :, m]
+    return result
+
+# 🛠️ Function to mark dominated rows of lexicographically sorted unique points (3+ objectives)
+def _unique_mask_kd(unique, block_size=BLOCK_SIZE):
+    """
+    Block sweep: a unique row can only be dominated by a lexicographically earlier row,
+    so rows are checked block by block against the non-dominated rows found so far
+    and then against the surviving rows of their own block, with broadcasting
+    instead of Python loops. Large survivor sets are swept recursively in smaller blocks.
+    """
+    keep = np.zeros(len(unique), dtype=bool)
+    archive = np.empty((0, unique.shape[1]))
+    for start in range(0, len(unique), block_size):
+        block = unique[start:start + block_size]
+        candidates = np.arange(len(block))
+        # Most rows are eliminated by the (small) archive before the in-block check
+        for a_start in range(0, len(archive), MIN_BLOCK_SIZE):
+            chunk = archive[a_start:a_start + MIN_BLOCK_SIZE]
+            dominated = _weakly_dominates(chunk, block[candidates]).any(axis=0)
+            candidates = candidates[~dominated]
+        # A row dominated by an eliminated row is also dominated by the archive, so only
+        # survivors need comparing with each other
+        survivors = block[candidates]
+        if len(survivors) > MIN_BLOCK_SIZE:
+            candidates = candidates[_unique_mask_kd(survivors, max(MIN_BLOCK_SIZE, block_size // 8))]
+        else:
+            # Rows are unique, so "<= in every objective" between two different rows means dominance
+            within = _weakly_dominates(survivors, survivors)
+            np.fill_diagonal(within, False)
+            candidates = candidates[~within.any(axis=0)]
+        keep[start + candidates] = True
+        archive = np.vstack([archive, block[candidates]])
+    return keep
+
+# 🛠️ Function to find the non-dominated points of a 2-objective array
+def _nondominated_mask_2d(points):
+    """
+    Sort-and-sweep on the first objective only (one unstable argsort): a row is dominated
+    iff a row with a smaller first objective has a smaller or equal second objective, or
+    a row with the same first objective has a strictly smaller second objective.
+    """
+    order = np.argsort(points[:, 0])
+    first, second = points[order, 0], points[order, 1]
+    starts = np.flatnonzero(np.r_[True, first[1:] != first[:-1]])
+    group_min = np.minimum.reduceat(second, starts)
+    best_before = np.r_[np.inf, np.minimum.accumulate(group_min)[:-1]]
+    sizes = np.diff(np.r_[starts, len(points)])
+    dominated = (second >= np.repeat(best_before, sizes)) | (second > np.repeat(group_min, sizes))
+    mask = np.empty(len(points), dtype=bool)
+    mask[order] = ~dominated
+    return mask
+
+# 🛠️ Function to find the non-dominated points of an objective array
+def nondominated_mask(points):
+    """
+    Returns a boolean mask of the rows of an (n, m) array that no other row dominates.
+    Duplicate rows are all kept, like rank 1 of NonDominatedSorting.PerformSorting.
+    Rows containing NaN are left out of the comparison and marked False.
+    Runs in O(n log n) for 2 objectives.
+    """
+    points = _as_points(points)
+    mask = np.zeros(len(points), dtype=bool)
+    valid = ~np.isnan(points).any(axis=1)
+    points = points[valid]
+    if len(points) == 0:
+        return mask
+    if points.shape[1] == 2:
+        mask[valid] = _nondominated_mask_2d(points)
+    else:
+        unique, inverse = _unique_rows(points)
+        mask[valid] = _unique_mask_kd(unique)[inverse]
+    return mask
+
+# 🛠️ Function to filter an objective array down to its unique Pareto front
+def pareto_filter(points):
+    """
+    Returns the unique non-dominated rows of an (n, m) array in lexicographic order.
+    Rows containing NaN are dropped.
+    """
+    points = _as_points(points)
+    points = points[~np.isnan(points).any(axis=1)]
+    if len(points) == 0:
+        return points
+    return _unique_rows(points[nondominated_mask(points)])[0]
+
+# 🛠️ Function to extract the Pareto front of every group of points at once
+def grouped_pareto_filter(points, groups):
+    """
+    Returns (front_points, front_groups): the unique non-dominated rows of each group,
+    ordered by group and then lexicographically. `groups` holds one integer label per row.
+    For 2 objectives all groups are swept in one pass; rows with NaN are dropped.
+    """
+    points = _as_points(points)
+    groups = np.asarray(groups, dtype=np.int64)
+    valid = ~np.isnan(points).any(axis=1)
+    points, groups = points[valid], groups[valid]
+    if len(points) == 0:
+        return points, groups
+    if points.shape[1] != 2:
+        labels = np.unique(groups)
+        fronts = [pareto_filter(points[groups == label]) for label in labels]
+        return np.vstack(fronts), np.repeat(labels, [len(front) for front in fronts])
+    order = np.lexsort((points[:, 1], points[:, 0], groups))
+    points, groups = points[order], groups[order]
+    new = np.r_[True, (groups[1:] != groups[:-1]) | np.any(points[1:] != points[:-1], axis=1)]
+    points, groups = points[new], groups[new]
+    # Shift dense ranks of the second objective so every group lies strictly below the
+    # previous ones; one running minimum then restarts at each group boundary
+    _, second_rank = np.unique(points[:, 1], return_inverse=True)
+    group_index = np.cumsum(np.r_[True, groups[1:] != groups[:-1]]) - 1
+    shifted = second_rank.ravel() + (group_index[-1] - group_index) * (second_rank.max() + 1)
+    keep = np.r_[True, shifted[1:] < np.minimum.accumulate(shifted)[:-1]]
+    return points[keep], groups[keep]
+
+# 🛠️ Function to assign non-domination ranks (2 objectives)
+def _unique_ranks_2d(unique):
+    """
+    Each front keeps the smallest second objective seen so far; these tails are
+    non-decreasing with the rank, so every row finds its front by binary search.
+    """
+    tails = []
+    ranks = np.empty(len(unique), dtype=np.int64)
+    for i, second in enumerate(unique[:, 1].tolist()):
+        k = bisect_right(tails, second)
+        if k == len(tails):
+            tails.append(second)
+        else:
+            tails[k] = second
+        ranks[i] = k + 1
+    return ranks
+
+# 🛠️ Function to assign non-domination ranks (3+ objectives)
+def _unique_ranks_kd(unique):
+    """Peels one front at a time with the block sweep."""
+    ranks = np.zeros(len(unique), dtype=np.int64)
+    remaining = np.arange(len(unique))
+    rank = 1
+    while len(remaining):
+        keep = _unique_mask_kd(unique[remaining])
+        ranks[remaining[keep]] = rank
+        remaining = remaining[~keep]
+        rank += 1
+    return ranks
+
+# 🛠️ Function to perform full non-dominated sorting
+def non_dominated_ranks(points):
+    """
+    Returns the 1-based front rank of every row of an (n, m) array, as assigned by
+    NonDominatedSorting.PerformSorting (rank 1 = non-dominated; duplicates share a rank).
+    Rows containing NaN are left out of the sort and share one rank after the last front.
+    """
+    points = _as_points(points)
+    ranks = np.ones(len(points), dtype=np.int64)
+    valid = ~np.isnan(points).any(axis=1)
+    if valid.any():
+        unique, inverse = _unique_rows(points[valid])
+        unique_ranks = _unique_ranks_2d(unique) if unique.shape[1] == 2 else _unique_ranks_kd(unique)
+        ranks[valid] = unique_ranks[inverse]
+        ranks[~valid] = unique_ranks.max() + 1
+    return ranks
+
+# 🛠️ Function to compute crowding distance within every front
+def crowding_distance(points, ranks=None):
+    """
+    Returns the crowding distance of every row, computed within its front as in
+    NonDominatedSorting.CalculateCrowdingDistance: per objective, the stable-sorted
+    boundary rows get infinity and interior rows add (next - previous) / (max - min),
+    with ties kept in the order left by the previous objective.
+    An objective with max == min contributes 0 instead of the NaN the C# code produces.
+    `ranks` defaults to non_dominated_ranks(points); pass all-ones to treat the rows as one front.
+    """
+    points = _as_points(points)
+    n = len(points)
+    distance = np.zeros(n)
+    if n == 0:
+        return distance
+    ranks = non_dominated_ranks(points) if ranks is None else np.asarray(ranks)
+    order = np.arange(n)
+    for m in range(points.shape[1]):
+        # Group by front and stable-sort by objective m, starting from the previous objective's
+        # order like the C# code re-sorting the already sorted list
+        order = order[np.lexsort((points[order, m], ranks[order]))]
+        values = points[order, m]
+        front = ranks[order]
+        first = np.r_[True, front[1:] != front[:-1]]
+        last = np.r_[front[1:] != front[:-1], True]
+        starts = np.maximum.accumulate(np.where(first, np.arange(n), 0))
+        ends = np.minimum.accumulate(np.where(last, np.arange(n), n - 1)[::-1])[::-1]
+        span = values[ends] - values[starts]
+        interior = ~(first | last)
+        gap = np.zeros(n)
+        gap[1:-1] = values[2:] - values[:-2]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            contribution = np.where(interior & (span > 0), gap / np.where(span > 0, span, 1), 0.0)
+        distance[order] += contribution
+        distance[order[first | last]] = np.inf
+    return distance
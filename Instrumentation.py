@@ -0,0 +1,237 @@
+import os
+import sys
+import json
+import time
+import cProfile
+from contextlib import contextmanager
+
+try:
+    import resource  # Peak RSS on Linux/macOS
+except ImportError:  # Windows
+    resource = None
+
+# Stage-level instrumentation of the analysis pipeline. Code marks its stages with
+#     with Instrumentation.stage('parse') as s:
+#         ...
+#         s.add(rows=len(chunk))
+# and every finished stage becomes a record (wall time, CPU time, rows, rows/sec, bytes read,
+# peak RSS) handed to the enabled sinks: JsonLinesSink (trace file), SummarySink (table at
+# the end) and CProfileSink (one .prof file per stage). While disabled, stage() returns a
+# shared no-op object, so instrumented code pays one function call per stage.
+#
+# Records are only taken in the process that enabled instrumentation; stages run inside
+# worker processes (workers > 1) are not recorded individually.
+
+_sinks = []
+_owner_pid = None
+_stack = []
+
+
+# 🛠️ Function to read the peak resident set size of this process
+def peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2**20 if sys.platform == 'darwin' else peak / 2**10  # Bytes on macOS, KiB elsewhere
+
+class _NullStage:
+    """Stand-in returned by stage() while instrumentation is disabled."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def add(self, rows=0, bytes_read=0):
+        pass
+
+_NULL_STAGE = _NullStage()
+
+class Stage:
+    """A timed stage; use through stage()."""
+
+    def __init__(self, name, rows=0, bytes_read=0):
+        self.name = name
+        self.rows = rows
+        self.bytes_read = bytes_read
+
+    def add(self, rows=0, bytes_read=0):
+        """Counts rows processed and bytes read by this stage."""
+        self.rows += rows
+        self.bytes_read += bytes_read
+
+    def __enter__(self):
+        _stack.append(self.name)
+        self.path = '/'.join(_stack)
+        self.depth = len(_stack) - 1
+        for sink in _sinks:
+            sink.start(self)
+        self._started = time.time()
+        self._wall = time.perf_counter()
+        self._cpu = time.process_time()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        wall = time.perf_counter() - self._wall
+        cpu = time.process_time() - self._cpu
+        _stack.pop()
+        record = {
+            'stage': self.name,
+            'path': self.path,
+            'depth': self.depth,
+            'start': self._started,
+            'wall_s': wall,
+            'cpu_s': cpu,
+            'rows': self.rows,
+            'rows_per_s': self.rows / wall if wall > 0 else None,
+            'bytes_read': self.bytes_read,
+            'peak_rss_mb': peak_rss_mb(),
+            'failed': exc_type is not None,
+        }
+        for sink in _sinks:
+            sink.finish(self, record)
+        return False
+
+# 🛠️ Function to open an instrumented stage
+def stage(name, rows=0, bytes_read=0):
+    """Returns a context manager timing the stage `name` (a no-op unless instrumentation is enabled)."""
+    if _owner_pid is None or _owner_pid != os.getpid():
+        return _NULL_STAGE
+    return Stage(name, rows, bytes_read)
+
+# 🛠️ Function to time every item fetched from an iterator as a stage
+def timed_iter(name, iterable, size=len):
+    """Yields the items of `iterable`, recording each fetch as stage `name` with size(item) rows."""
+    if _owner_pid is None or _owner_pid != os.getpid():
+        return iterable
+    return _timed_items(name, iter(iterable), size)
+
+def _timed_items(name, iterator, size):
+    done = object()
+    while True:
+        with stage(name) as fetch:
+            item = next(iterator, done)
+            if item is not done:
+                fetch.add(rows=size(item))
+        if item is done:
+            return
+        yield item
+
+def enabled():
+    return _owner_pid is not None and _owner_pid == os.getpid()
+
+# 🛠️ Functions to switch instrumentation on and off
+def enable(*sinks):
+    """Starts recording stages into `sinks` in this process."""
+    global _owner_pid
+    _sinks[:] = sinks
+    _owner_pid = os.getpid()
+
+def disable():
+    """Stops recording and closes the sinks (the summary table is printed here)."""
+    global _owner_pid
+    _owner_pid = None
+    for sink in _sinks:
+        sink.close()
+    _sinks.clear()
+
+@contextmanager
+def instrumented(*sinks):
+    """Enables instrumentation into `sinks` for the duration of a with-block; without sinks it does nothing."""
+    if not sinks:
+        yield
+        return
+    enable(*sinks)
+    try:
+        yield
+    finally:
+        disable()
+
+
+class Sink:
+    """Base sink: receives every stage when it starts and its record when it finishes."""
+
+    def start(self, stage):
+        pass
+
+    def finish(self, stage, record):
+        pass
+
+    def close(self):
+        pass
+
+class JsonLinesSink(Sink):
+    """Appends one JSON record per finished stage to a trace file."""
+
+    def __init__(self, path):
+        self.file = open(path, 'w')
+
+    def finish(self, stage, record):
+        self.file.write(json.dumps(record) + '\n')
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+class SummarySink(Sink):
+    """Aggregates the records per stage path and prints a table when closed."""
+
+    def __init__(self, stream=None):
+        self.stream = stream
+        self.totals = {}
+
+    def start(self, stage):
+        # Registering paths on start keeps parents above their children in the table
+        self.totals.setdefault(stage.path, {'calls': 0, 'wall_s': 0.0, 'cpu_s': 0.0, 'rows': 0,
+                                            'bytes_read': 0, 'peak_rss_mb': None})
+
+    def finish(self, stage, record):
+        total = self.totals[record['path']]
+        total['calls'] += 1
+        for key in ('wall_s', 'cpu_s', 'rows', 'bytes_read'):
+            total[key] += record[key]
+        if record['peak_rss_mb'] is not None:
+            total['peak_rss_mb'] = max(total['peak_rss_mb'] or 0.0, record['peak_rss_mb'])
+
+    def table(self):
+        lines = [f"{'Stage':44s} {'Calls':>6s} {'Wall s':>9s} {'CPU s':>9s} {'Rows':>11s} {'Rows/s':>12s} {'MB read':>9s} {'Peak RSS MB':>12s}"]
+        for path, total in self.totals.items():
+            rate = f"{total['rows'] / total['wall_s']:12,.0f}" if total['rows'] and total['wall_s'] > 0 else f"{'-':>12s}"
+            peak = f"{total['peak_rss_mb']:12.1f}" if total['peak_rss_mb'] is not None else f"{'-':>12s}"
+            name = '  ' * path.count('/') + path.rsplit('/', 1)[-1]
+            lines.append(f"{name:44s} {total['calls']:6d} {total['wall_s']:9.3f} {total['cpu_s']:9.3f} "
+                         f"{total['rows']:11,d} {rate} {total['bytes_read'] / 2**20:9.1f} {peak}")
+        return '\n'.join(lines)
+
+    def close(self):
+        print("\n📊 **Stage Profile:**", file=self.stream or sys.stdout)
+        print(self.table(), file=self.stream or sys.stdout)
+
+class CProfileSink(Sink):
+    """
+    Runs cProfile over stages and dumps one <n>_<stage path>.prof file per stage into
+    `output_dir`. `stages` limits profiling to those stage names; stages nested in a
+    profiled stage are part of its profile.
+    """
+
+    def __init__(self, output_dir, stages=None):
+        self.output_dir = output_dir
+        self.stages = set(stages) if stages else None
+        self.active = None
+        self.count = 0
+        os.makedirs(output_dir, exist_ok=True)
+
+    def start(self, stage):
+        if self.active is None and (self.stages is None or stage.name in self.stages):
+            self.active = (stage, cProfile.Profile())
+            self.active[1].enable()
+
+    def finish(self, stage, record):
+        if self.active is None or self.active[0] is not stage:
+            return
+        profiler = self.active[1]
+        profiler.disable()
+        self.active = None
+        self.count += 1
+        profiler.dump_stats(os.path.join(self.output_dir, f"{self.count:03d}_{stage.path.replace('/', '.')}.prof"))
@@ -0,0 +1,214 @@
+import numpy as np
+from RouteCodec import RouteCodec, PATTERNS, route_symbols, pattern_name
+from MarketLayout import as_market_layout
+
+# Precomputed lookups over a market layout, built once and shared by everything that walks
+# routes: an integer-coded grid, the coordinates of every aisle symbol, prefix sums of foul
+# ('x') cells and, for every (origin aisle, target aisle, walking pattern), the leg length
+# and the number of foul cells stepped on. Pattern indices follow RouteCodec.PATTERNS.
+# Layouts come as MarketLayout coordinate lists, so building the index costs O(cells)
+# numeric work plus the (aisles x aisles) leg tables, never a loop over grid cells. A ZgZg
+# leg is a straight run plus a staircase of alternating steps, whose cells lie on two
+# diagonals, so its fouls come from diagonal prefix sums in O(1) per leg whatever its length.
+
+EMPTY_CELL = -1
+FOUL_CELL = -2
+ZIGZAG_RULES = ('parity', 'balance')
+
+
+class LayoutIndex:
+    """
+    Leg cost tables of a layout: a MarketLayout, a layout dict or a grid from convert_layout_to_grid.
+
+    `zigzag` selects how a ZgZg leg picks its next step:
+    'parity'  - horizontal first on cells with an even row + column, vertical first on odd
+                ones (SuperMarketPlotter / SuperMarketPlotter_v2);
+    'balance' - along the axis with the larger remaining distance, horizontal on ties
+                (ObjectiveFunction.walkIndiv in the optimizer).
+    """
+
+    def __init__(self, layout, zigzag='parity'):
+        if zigzag not in ZIGZAG_RULES:
+            raise ValueError(f"Unknown zigzag rule '{zigzag}', expected one of {ZIGZAG_RULES}")
+        self.layout = as_market_layout(layout)
+        self.shape = self.layout.shape
+        self.zigzag = zigzag
+        self.codec = RouteCodec(self.layout.symbols)
+        self.symbols = self.codec.symbols
+
+        # Integer-coded grid: aisle codes from the codec, EMPTY_CELL for '0', FOUL_CELL for 'x'
+        self.foul = self.layout.foul_mask()
+        self.cells = np.full(self.shape, EMPTY_CELL, dtype=np.int32)
+        self.cells[self.foul] = FOUL_CELL
+        for code, symbol in enumerate(self.symbols):
+            cells = self.layout.aisles[symbol]
+            self.cells[cells[:, 0], cells[:, 1]] = code
+
+        # Symbol -> (row, col) of its access cell, the cell routes walk to
+        self.coords = self.layout.coords.astype(np.int32).reshape(-1, 2)
+
+        # row_fouls[r, c] = foul cells in row r left of column c; col_fouls[r, c] = above row r
+        self.row_fouls = np.zeros((self.shape[0], self.shape[1] + 1), dtype=np.int32)
+        self.row_fouls[:, 1:] = np.cumsum(self.foul, axis=1)
+        self.col_fouls = np.zeros((self.shape[0] + 1, self.shape[1]), dtype=np.int32)
+        self.col_fouls[1:] = np.cumsum(self.foul, axis=0)
+        # main_fouls[r + 1, c + 1] = foul cells on the down-right diagonal ending at (r, c), anti_fouls on the down-left one
+        self.main_fouls = np.zeros((self.shape[0] + 1, self.shape[1] + 2), dtype=np.int32)
+        self.anti_fouls = np.zeros((self.shape[0] + 1, self.shape[1] + 2), dtype=np.int32)
+        for r in range(self.shape[0]):
+            self.main_fouls[r + 1, 1:-1] = self.foul[r] + self.main_fouls[r, :-2]
+            self.anti_fouls[r + 1, 1:-1] = self.foul[r] + self.anti_fouls[r, 2:]
+
+        self.leg_length, self.leg_fouls = self._leg_tables()
+
+    @classmethod
+    def from_layout(cls, layout, zigzag='parity'):
+        """Builds the index from a layout dict loaded by load_market_layout (dense or sparse)."""
+        return cls(layout, zigzag)
+
+    @property
+    def grid(self):
+        """Dense grid of cell labels (built on demand; prefer `layout` on large stores)."""
+        return self.layout.to_grid()
+
+    @property
+    def positions(self):
+        """Symbol -> (row, col) dictionary, as find_positions returns it."""
+        return {symbol: (int(r), int(c)) for symbol, (r, c) in zip(self.symbols, self.coords)}
+
+    # 🛠️ Functions counting foul cells on straight segments with the prefix sums
+    def _row_segment_fouls(self, row, start, end):
+        """Foul cells of row `row` stepped on walking from column `start` (excluded) to `end` (included)."""
+        forward = end >= start
+        low = np.where(forward, start + 1, end)
+        high = np.where(forward, end + 1, start)
+        return self.row_fouls[row, high] - self.row_fouls[row, low]
+
+    def _col_segment_fouls(self, col, start, end):
+        """Foul cells of column `col` stepped on walking from row `start` (excluded) to `end` (included)."""
+        forward = end >= start
+        low = np.where(forward, start + 1, end)
+        high = np.where(forward, end + 1, start)
+        return self.col_fouls[high, col] - self.col_fouls[low, col]
+
+    def _diagonal_fouls(self, row, col, row_step, col_step, count):
+        """Foul cells among (row + j * row_step, col + j * col_step) for j < count (steps of +-1)."""
+        row, col = np.where(count > 0, row, 0), np.where(count > 0, col, 0)  # Empty runs may start off the grid
+        last = np.maximum(count - 1, 0)
+        end_row, end_col = row + last * row_step, col + last * col_step
+        down = end_row >= row
+        bottom_row, bottom_col = np.where(down, end_row, row), np.where(down, end_col, col)
+        top_row, top_col = np.where(down, row, end_row), np.where(down, col, end_col)
+        main = row_step == col_step
+        # Prefix sums are padded by one row on top and one column on each side
+        before_col = np.where(main, top_col - 1, top_col + 1) + 1
+        fouls = np.where(main, self.main_fouls[bottom_row + 1, bottom_col + 1] - self.main_fouls[top_row, before_col],
+                         self.anti_fouls[bottom_row + 1, bottom_col + 1] - self.anti_fouls[top_row, before_col])
+        return np.where(count > 0, fouls, 0)
+
+    # 🛠️ Function to count the fouls of every ZgZg leg in closed form
+    def _zigzag_fouls(self, row, col, target_row, target_col):
+        """
+        'parity' legs alternate steps (horizontal first from an even cell) until one axis is done,
+        then finish in a straight line; 'balance' legs first walk straight along the longer axis
+        until both distances are equal, then alternate starting horizontally.
+        """
+        row_step, col_step = np.sign(target_row - row), np.sign(target_col - col)
+        rows_left, cols_left = np.abs(target_row - row), np.abs(target_col - col)
+        stairs = np.minimum(rows_left, cols_left)
+        if self.zigzag == 'parity':
+            horizontal_first = (row + col) % 2 == 0
+            stair_row, stair_col = row, col
+            end_row, end_col = row + stairs * row_step, col + stairs * col_step
+            straight = (self._row_segment_fouls(end_row, end_col, target_col) +
+                        self._col_segment_fouls(end_col, end_row, target_row))
+        else:
+            horizontal_first = np.ones(row.shape, dtype=bool)
+            stair_row = np.where(cols_left >= rows_left, row, target_row - stairs * row_step)
+            stair_col = np.where(cols_left >= rows_left, target_col - stairs * col_step, col)
+            straight = self._row_segment_fouls(row, col, stair_col) + self._col_segment_fouls(col, row, stair_row)
+        # Staircase cells: after the first kind of step, and after each completed pair of steps
+        row_step, col_step = np.where(row_step == 0, 1, row_step), np.where(col_step == 0, 1, col_step)
+        first = self._diagonal_fouls(stair_row + row_step * ~horizontal_first, stair_col + col_step * horizontal_first,
+                                     row_step, col_step, stairs)
+        second = self._diagonal_fouls(stair_row + row_step, stair_col + col_step, row_step, col_step, stairs)
+        return (straight + first + second).astype(np.int32)
+
+    # 🛠️ Function to build the (origin, target, pattern) leg tables
+    def _leg_tables(self):
+        n = len(self.symbols)
+        origin, target = np.meshgrid(np.arange(n), np.arange(n), indexing='ij')
+        (r0, c0), (r1, c1) = self.coords[origin].transpose(2, 0, 1), self.coords[target].transpose(2, 0, 1)
+        length = np.abs(r1 - r0) + np.abs(c1 - c0)
+        fouls = np.empty((n, n, len(PATTERNS)), dtype=np.int32)
+        fouls[:, :, PATTERNS.index('V2H')] = self._col_segment_fouls(c0, r0, r1) + self._row_segment_fouls(r1, c0, c1)
+        fouls[:, :, PATTERNS.index('H2V')] = self._row_segment_fouls(r0, c0, c1) + self._col_segment_fouls(c1, r0, r1)
+        fouls[:, :, PATTERNS.index('ZgZg')] = self._zigzag_fouls(r0, c0, r1, c1)
+        # Every pattern moves monotonically towards the target, so all legs have Manhattan length
+        return np.repeat(length[:, :, None], len(PATTERNS), axis=2).astype(np.int32), fouls
+
+    # 🛠️ Function to list the cells a set of legs steps on
+    def walk_legs(self, origin, target, pattern):
+        """
+        Returns a (legs, steps) int64 array with the flat grid index (row * cols + col) of every
+        cell each (origin code, target code, pattern code) leg steps on, in walking order and
+        without its origin, right-padded with -1. All legs are stepped at once.
+        """
+        origin, target, pattern = (np.asarray(values, dtype=np.intp).ravel() for values in (origin, target, pattern))
+        (r0, c0), (r1, c1) = self.coords[origin].T.astype(np.int64), self.coords[target].T.astype(np.int64)
+        steps = int((np.abs(r1 - r0) + np.abs(c1 - c0)).max(initial=0))
+        paths = np.full((len(origin), steps), -1, dtype=np.int64)
+        row, col = r0.copy(), c0.copy()
+        for step in range(steps):
+            active = (row != r1) | (col != c1)
+            parity = np.where((row + col) % 2 == 0, col != c1, row == r1)
+            balance = np.abs(c1 - col) >= np.abs(r1 - row)
+            horizontal = np.select([pattern == PATTERNS.index('V2H'), pattern == PATTERNS.index('H2V')],
+                                   [row == r1, col != c1], parity if self.zigzag == 'parity' else balance)
+            col += np.sign(c1 - col) * (active & horizontal)
+            row += np.sign(r1 - row) * (active & ~horizontal)
+            paths[:, step] = np.where(active, row * self.shape[1] + col, -1)
+        return paths
+
+    def leg_paths(self):
+        """walk_legs of every (origin, target, pattern) leg, shaped (origin, target, pattern, steps); small layouts only."""
+        n = len(self.symbols)
+        origin, target, pattern = np.meshgrid(np.arange(n), np.arange(n), np.arange(len(PATTERNS)), indexing='ij')
+        return self.walk_legs(origin, target, pattern).reshape(n, n, len(PATTERNS), -1)
+
+    # 🛠️ Function to look up a single leg
+    def leg_cost(self, origin, target, walking_pattern):
+        """Returns (steps, foul cells) of the leg between two aisle symbols."""
+        a, b = self.codec.index[origin], self.codec.index[target]
+        p = PATTERNS.index(pattern_name(walking_pattern))
+        return int(self.leg_length[a, b, p]), int(self.leg_fouls[a, b, p])
+
+    # 🛠️ Function to cost a single route with table lookups
+    def route_cost(self, route, walking_pattern, codec=None):
+        """
+        Returns (walking steps, foul cells) of a route given as an "A->B->C" string, a list of
+        symbols or a code row of `codec` (defaults to this index's codec).
+        """
+        symbols = route_symbols(route, codec or self.codec)
+        codes = np.array([[self.codec.index[symbol] for symbol in symbols]], dtype=self.codec.dtype)
+        walking, fouls = self.route_costs(codes, [PATTERNS.index(pattern_name(walking_pattern))])
+        return int(walking[0]), int(fouls[0])
+
+    # 🛠️ Function to cost a whole population of encoded routes
+    def route_costs(self, route_codes, pattern_codes):
+        """
+        Vectorized totals for an (n, route length) matrix of this index's route codes
+        (padded entries are skipped) and n pattern codes: returns (walking steps, foul cells).
+        """
+        route_codes = np.asarray(route_codes)
+        pattern_codes = np.asarray(pattern_codes, dtype=np.intp)
+        if route_codes.shape[1] < 2:
+            zeros = np.zeros(len(route_codes), dtype=np.int64)
+            return zeros, zeros.copy()
+        origin, target = route_codes[:, :-1], route_codes[:, 1:]
+        valid = (origin != self.codec.pad) & (target != self.codec.pad)
+        origin, target = np.where(valid, origin, 0), np.where(valid, target, 0)
+        pattern = pattern_codes[:, None]
+        walking = (self.leg_length[origin, target, pattern] * valid).sum(axis=1, dtype=np.int64)
+        fouls = (self.leg_fouls[origin, target, pattern] * valid).sum(axis=1, dtype=np.int64)
+        return walking, fouls
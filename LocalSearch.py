@@ -0,0 +1,189 @@
+import time
+from functools import lru_cache
+import numpy as np
+import pandas as pd
+from Dominance import nondominated_mask, pareto_filter
+from RouteCodec import PATTERNS, decode_patterns
+from RouteEvaluator import RouteEvaluator
+import QualityIndicators as qi
+
+# Pareto local search that polishes the optimizer's final routes. Every route of a
+# non-dominated archive is expanded into all of its neighbours at once:
+#   '2opt'    - reverse one segment of the aisle order,
+#   'oropt'   - move a segment of 1-3 consecutive aisles to another position,
+#   'pattern' - switch the walking pattern (V2H / H2V / ZgZg).
+# Moves are precomputed as position permutations, so a batch of routes becomes a
+# (routes, moves, aisles) array with one fancy index and is scored with one
+# RouteEvaluator call under the optimizer's own model (zigzag='balance').
+# Neighbours that no archive member dominates join the archive and are expanded in turn.
+
+MOVES = ('2opt', 'oropt', 'pattern')
+OR_OPT_SEGMENTS = (1, 2, 3)
+MAX_CANDIDATES = 250_000  # Neighbours scored per RouteEvaluator call
+OBJECTIVE_COLUMNS = ['WalkingTime', 'ExposureTime']
+
+
+# 🛠️ Function to precompute the position permutations of the route moves
+@lru_cache(maxsize=16)
+def move_permutations(length, moves=MOVES, segments=OR_OPT_SEGMENTS):
+    """
+    Returns a (moves, length) array: row r lists the old positions of a route in the order
+    the r-th 2-opt / or-opt move puts them. Identical moves and the identity are removed.
+    """
+    positions = np.arange(length)
+    permutations = []
+    if '2opt' in moves:
+        for i in range(length - 1):
+            for j in range(i + 1, length):
+                permutation = positions.copy()
+                permutation[i:j + 1] = positions[i:j + 1][::-1]
+                permutations.append(permutation)
+    if 'oropt' in moves:
+        for size in segments:
+            for i in range(length - size + 1):
+                rest = np.r_[positions[:i], positions[i + size:]]
+                for k in range(len(rest) + 1):
+                    if k != i:
+                        permutations.append(np.r_[rest[:k], positions[i:i + size], rest[k:]])
+    if not permutations:
+        return np.empty((0, length), dtype=np.intp)
+    permutations = np.unique(np.array(permutations, dtype=np.intp), axis=0)
+    return permutations[(permutations != positions).any(axis=1)]
+
+# 🛠️ Function to build every neighbour of a batch of routes
+def neighbours(route_codes, pattern_codes, moves=MOVES):
+    """
+    Returns (neighbour route codes, neighbour pattern codes, parent index) for routes of
+    equal length (aisles only, without entrance and exit).
+    """
+    n, length = route_codes.shape
+    permutations = move_permutations(length, tuple(moves))
+    routes = [route_codes[:, permutations].reshape(-1, length)]
+    patterns = [np.repeat(pattern_codes, len(permutations))]
+    parents = [np.repeat(np.arange(n), len(permutations))]
+    if 'pattern' in moves:
+        for shift in range(1, len(PATTERNS)):
+            routes.append(route_codes)
+            patterns.append(((pattern_codes.astype(np.int64) + shift) % len(PATTERNS)).astype(np.uint8))
+            parents.append(np.arange(n))
+    return np.vstack(routes), np.concatenate(patterns), np.concatenate(parents)
+
+# 🛠️ Function to score routes in bounded batches
+def score_routes(evaluator, route_codes, pattern_codes):
+    """Returns the (n, 2) WalkingTime/ExposureTime array of aisle-only routes under the optimizer's model."""
+    objectives = np.empty((len(route_codes), 2))
+    for start in range(0, len(route_codes), MAX_CANDIDATES):
+        end = start + MAX_CANDIDATES
+        scores = evaluator.evaluate(evaluator.with_entrance_exit(route_codes[start:end]), pattern_codes[start:end], model='optimizer')
+        objectives[start:end, 0] = scores['WalkingTime']
+        objectives[start:end, 1] = scores['ExposureTime']
+    return objectives
+
+# 🛠️ Function to merge candidates into a non-dominated archive
+def merge_archive(archive, candidates):
+    """
+    Both arguments are (route codes, pattern codes, objectives, explored) tuples. Returns the
+    non-dominated union, keeping one route per objective vector (archive members first).
+    """
+    merged = [np.concatenate([a, c]) for a, c in zip(archive, candidates)]
+    objectives = merged[2]
+    keep = np.flatnonzero(nondominated_mask(objectives))
+    _, first = np.unique(objectives[keep], axis=0, return_index=True)
+    keep = np.sort(keep[first])
+    return tuple(part[keep] for part in merged)
+
+# 🛠️ Function to run the Pareto local search
+def polish_routes(evaluator, route_codes, pattern_codes, moves=MOVES, max_iterations=100, batch_size=None):
+    """
+    Improves a set of aisle-only routes of equal length. Each iteration expands up to
+    `batch_size` unexplored archive members (default: as many as fit in MAX_CANDIDATES
+    neighbours) and merges their neighbours into the archive; the search stops when every
+    member has been expanded or after `max_iterations`.
+    Returns (route codes, pattern codes, objectives, stats) of the final archive.
+    """
+    route_codes = np.asarray(route_codes)
+    pattern_codes = np.asarray(pattern_codes, dtype=np.uint8)
+    objectives = score_routes(evaluator, route_codes, pattern_codes)
+    empty = (route_codes[:0], pattern_codes[:0], objectives[:0], np.zeros(0, dtype=bool))
+    archive = merge_archive(empty, (route_codes, pattern_codes, objectives, np.zeros(len(route_codes), dtype=bool)))
+
+    per_route = len(move_permutations(route_codes.shape[1], tuple(moves))) + ('pattern' in moves) * (len(PATTERNS) - 1)
+    batch_size = batch_size or max(1, MAX_CANDIDATES // max(1, per_route))
+    evaluations, iterations = len(route_codes), 0
+    while iterations < max_iterations:
+        todo = np.flatnonzero(~archive[3])[:batch_size]
+        if len(todo) == 0:
+            break
+        archive[3][todo] = True
+        candidate_routes, candidate_patterns, _ = neighbours(archive[0][todo], archive[1][todo], moves)
+        candidate_objectives = score_routes(evaluator, candidate_routes, candidate_patterns)
+        evaluations += len(candidate_routes)
+        # Only neighbours no archive member dominates can enter
+        fresh = nondominated_mask(np.vstack([archive[2], candidate_objectives]))[len(archive[2]):]
+        archive = merge_archive(archive, (candidate_routes[fresh], candidate_patterns[fresh], candidate_objectives[fresh],
+                                          np.zeros(int(fresh.sum()), dtype=bool)))
+        iterations += 1
+    stats = {'Iterations': iterations, 'Evaluations': evaluations, 'Converged': bool(archive[3].all())}
+    return archive[0], archive[1], archive[2], stats
+
+# 🛠️ Function to polish the routes of a Pareto table and report the HV gain
+def polish_pareto_front(pareto_df, layout, reference_point=None, moves=MOVES, max_iterations=100):
+    """
+    Takes Pareto solutions with IsleOrder/WalkingPattern (e.g. all_final_pareto.csv after
+    RouteRenderer.attach_routes) and the run's layout dict. Returns (polished_df, report):
+    the improved front (Origin = 'original' or 'polished') and a dict with the hypervolume
+    before and after, against `reference_point` (default: the input's objective maxima).
+    """
+    start = time.perf_counter()
+    solutions = pareto_df.dropna(subset=['IsleOrder', 'WalkingPattern'])
+    evaluator = RouteEvaluator.from_layout(layout, zigzag='balance')
+    route_codes, pattern_codes = evaluator.codec.encode_frame(solutions)
+    stored = solutions[OBJECTIVE_COLUMNS].values.astype(float)
+    mismatches = int((score_routes(evaluator, route_codes, pattern_codes) != stored).any(axis=1).sum())
+    if mismatches:
+        print(f"⚠️ {mismatches} routes do not reproduce their stored objectives on this layout")
+
+    routes, patterns, objectives, stats = polish_routes(evaluator, route_codes, pattern_codes, moves, max_iterations)
+    keys = {(row.tobytes(), pattern) for row, pattern in zip(route_codes, pattern_codes.tolist())}
+    polished_df = pd.DataFrame({
+        'WalkingTime': objectives[:, 0],
+        'ExposureTime': objectives[:, 1],
+        'IsleOrder': evaluator.codec.decode(routes) if len(routes) else [],
+        'WalkingPattern': decode_patterns(patterns),
+        'Origin': ['original' if (row.tobytes(), pattern) in keys else 'polished'
+                   for row, pattern in zip(routes, patterns.tolist())],
+    }).sort_values(OBJECTIVE_COLUMNS, ignore_index=True)
+
+    reference_point = stored.max(axis=0) if reference_point is None else np.asarray(reference_point, dtype=float)
+    hv_before = qi.hypervolume(stored, reference_point)
+    hv_after = qi.hypervolume(objectives, reference_point)
+    report = {
+        'Routes In': len(solutions),
+        'Front Before': len(pareto_filter(stored)),
+        'Front After': len(polished_df),
+        'Polished Solutions': int((polished_df['Origin'] == 'polished').sum()),
+        'Reference Point': [float(value) for value in reference_point],
+        'HV Before': hv_before,
+        'HV After': hv_after,
+        'HV Gain %': 100 * (hv_after - hv_before) / hv_before if hv_before > 0 else float('nan'),
+        **stats,
+        'Seconds': time.perf_counter() - start,
+    }
+    return polished_df, report
+
+
+# **Main Execution**
+if __name__ == "__main__":
+    import json
+    import os
+    from RouteRenderer import attach_routes
+
+    root_directory = r"C:\Users\Jeryes\github\SuperMarketNavigation\MultiObject\SuperMarketNavigation\bin\Debug\net9.0\Run_20250209_004552"
+    with open(os.path.join(root_directory, "market_layout.json"), 'r') as file:
+        market_layout = json.load(file)
+    pareto = attach_routes(pd.read_csv("all_final_pareto.csv"), root_directory)
+    polished, polish_report = polish_pareto_front(pareto, market_layout)
+    polished.to_csv("polished_pareto.csv", index=False)
+    print("\n📊 **Local Search Report:**")
+    for key, value in polish_report.items():
+        print(f"{key}: {value}")
@@ -0,0 +1,129 @@
+import json
+import hashlib
+import numpy as np
+
+# Market layouts as coordinate lists instead of a dense grid of strings. Two JSON forms load:
+#   dense  - the optimizer's market_layout.json: {"Rows", "Cols", "IsleMatrix": [one label per cell,
+#            row-major]}, with '0' for empty cells, 'x' for foul cells and one-character aisles;
+#   sparse - {"Format": "sparse", "Rows", "Cols", "Aisles": {"<id>": [[row, col], ...], ...},
+#            "Foul": [[row, col], ...]}, where aisle ids may be any string without '->' and an
+#            aisle may cover several cells.
+# Routes walk to an aisle's access cell: the first cell listed for it. For dense grids that is
+# the last cell in row-major order, the cell find_positions has always picked.
+
+EMPTY_CELL = '0'
+FOUL_CELL = 'x'
+SPARSE_FORMAT = 'sparse'
+
+
+class MarketLayout:
+    """A rows x cols layout: aisle id -> (k, 2) array of cells (access cell first), and the foul cells."""
+
+    def __init__(self, rows, cols, aisles, foul=()):
+        self.rows, self.cols = int(rows), int(cols)
+        self.aisles = {str(aisle): np.asarray(cells, dtype=np.int64).reshape(-1, 2) for aisle, cells in aisles.items()}
+        self.foul = np.asarray(foul, dtype=np.int64).reshape(-1, 2)
+        for aisle, cells in self.aisles.items():
+            if len(cells) == 0:
+                raise ValueError(f"Aisle '{aisle}' has no cells")
+            if '->' in aisle or aisle in (EMPTY_CELL, FOUL_CELL):
+                raise ValueError(f"'{aisle}' cannot be used as an aisle id")
+        every = np.vstack([self.foul] + list(self.aisles.values()))
+        if len(every) and ((every < 0).any() or (every[:, 0] >= self.rows).any() or (every[:, 1] >= self.cols).any()):
+            raise ValueError(f"Layout cells must lie inside the {self.rows}x{self.cols} grid")
+        self.symbols = sorted(self.aisles)
+        self.coords = np.array([self.aisles[symbol][0] for symbol in self.symbols], dtype=np.int64).reshape(-1, 2)
+        self._labels = None
+
+    @property
+    def shape(self):
+        return self.rows, self.cols
+
+    @property
+    def positions(self):
+        """Aisle id -> (row, col) of its access cell, as find_positions returns it."""
+        return {symbol: (int(r), int(c)) for symbol, (r, c) in zip(self.symbols, self.coords)}
+
+    # 🛠️ Functions to build a layout from a dense grid or a layout dict
+    @classmethod
+    def from_grid(cls, grid):
+        """Builds the layout of a dense grid (convert_layout_to_grid); every labelled cell becomes an aisle cell."""
+        grid = np.asarray(grid)
+        flat = grid.ravel()
+        labelled = np.flatnonzero((flat != EMPTY_CELL) & (flat != FOUL_CELL))[::-1]  # Last cell first
+        labels = flat[labelled]
+        aisles = {}
+        for label in np.unique(labels):
+            cells = labelled[labels == label]
+            aisles[str(label)] = np.column_stack(np.unravel_index(cells, grid.shape))
+        foul = np.column_stack(np.unravel_index(np.flatnonzero(flat == FOUL_CELL), grid.shape))
+        return cls(grid.shape[0], grid.shape[1], aisles, foul)
+
+    @classmethod
+    def from_dict(cls, layout):
+        """Accepts a dense (IsleMatrix) or sparse (Aisles/Foul) layout dict, or a MarketLayout."""
+        if isinstance(layout, cls):
+            return layout
+        if 'IsleMatrix' in layout:
+            return cls.from_grid(np.array(layout['IsleMatrix']).reshape(layout['Rows'], layout['Cols']))
+        return cls(layout['Rows'], layout['Cols'], layout['Aisles'], layout.get('Foul', ()))
+
+    @classmethod
+    def load(cls, file_path):
+        with open(file_path, 'r') as file:
+            return cls.from_dict(json.load(file))
+
+    # 🛠️ Function to write the layout in the sparse format
+    def to_dict(self):
+        return {'Format': SPARSE_FORMAT, 'Rows': self.rows, 'Cols': self.cols,
+                'Aisles': {aisle: cells.tolist() for aisle, cells in self.aisles.items()},
+                'Foul': self.foul.tolist()}
+
+    def digest(self):
+        """Content hash of the layout, the same for its dense and sparse forms."""
+        canonical = json.dumps(self.to_dict(), sort_keys=True, separators=(',', ':'))
+        return hashlib.blake2b(canonical.encode(), digest_size=8).hexdigest()
+
+    def save(self, file_path):
+        with open(file_path, 'w') as file:
+            json.dump(self.to_dict(), file)
+
+    def foul_mask(self):
+        """Dense (rows, cols) boolean mask of the foul cells."""
+        mask = np.zeros(self.shape, dtype=bool)
+        mask[self.foul[:, 0], self.foul[:, 1]] = True
+        return mask
+
+    def to_grid(self):
+        """Dense grid of cell labels, as convert_layout_to_grid builds it (meant for small layouts)."""
+        width = max([len(symbol) for symbol in self.symbols] + [1])
+        grid = np.full(self.shape, EMPTY_CELL, dtype=f'<U{width}')
+        grid[self.foul[:, 0], self.foul[:, 1]] = FOUL_CELL
+        for aisle, cells in self.aisles.items():
+            grid[cells[:, 0], cells[:, 1]] = aisle
+        return grid
+
+    def __getitem__(self, cell):
+        """Label of one (row, col) cell: an aisle id, FOUL_CELL or EMPTY_CELL, like grid[row, col]."""
+        if self._labels is None:
+            labels = {(int(r), int(c)): FOUL_CELL for r, c in self.foul}
+            labels.update({(int(r), int(c)): aisle for aisle, cells in self.aisles.items() for r, c in cells})
+            self._labels = labels
+        return self._labels.get((int(cell[0]), int(cell[1])), EMPTY_CELL)
+
+# 🛠️ Function to accept a layout in any of its forms
+def as_market_layout(layout):
+    """Returns a MarketLayout for a MarketLayout, a layout dict (dense or sparse) or a dense grid array."""
+    if isinstance(layout, MarketLayout):
+        return layout
+    if isinstance(layout, dict):
+        return MarketLayout.from_dict(layout)
+    return MarketLayout.from_grid(layout)
+
+
+# **Main Execution**
+if __name__ == "__main__":
+    market_layout = MarketLayout.load("market_layout.json")
+    market_layout.save("market_layout_sparse.json")
+    print(f"✅ {market_layout.rows}x{market_layout.cols} layout with {len(market_layout.symbols)} aisles "
+          f"and {len(market_layout.foul)} foul cells saved to market_layout_sparse.json")
@@ -0,0 +1,280 @@
+import os
+import json
+import shutil
+import numpy as np
+import pandas as pd
+from Dominance import nondominated_mask
+from Analyzer import OBJECTIVES, ROUTE_COLUMNS
+
+# Persistent query index over Pareto fronts, for questions such as "lowest ExposureTime with
+# WalkingTime <= 80". It holds the reference front (non-dominated among all solutions) and
+# one front per algorithm, each with its routes, kept sorted by every objective:
+#   budget  - best `target` value among the solutions with `constraint` <= limit: a binary
+#             search over the front sorted by `constraint`, then a prefix-argmin lookup;
+#   knee    - the solution with the smallest sum of normalized objectives (the one furthest
+#             below the line through the extremes on a 2-objective front), found at build time;
+#   nearest - the solution closest to a point (default: the front's ideal point) in weighted
+#             Chebyshev distance, the achievement function of the reference-point method.
+#             On 2-objective fronts the two weighted terms move in opposite directions along
+#             the sorted front, so a binary search finds their crossing; more objectives scan.
+# Every query is O(log n) on a 2-objective front; the *_batch methods answer thousands of
+# queries with vectorized searches. The index is saved as a folder of .npy arrays plus a
+# meta.json and loaded back memory-mapped, like the RunCache entries.
+
+INDEX_VERSION = 1
+REFERENCE_FRONT = 'Reference'
+ARRAYS = ('values', 'order', 'best', 'routes', 'patterns')
+
+
+class ParetoIndex:
+    """Sorted Pareto fronts (reference and per algorithm) with budget, knee and nearest-point queries."""
+
+    def __init__(self, fronts, objectives=OBJECTIVES):
+        """
+        `fronts` maps a front name to a table with IsleOrder, WalkingPattern and the objective columns;
+        each table is reduced to its non-dominated rows (one per route and pattern).
+        """
+        self.objectives = list(objectives)
+        values, routes, patterns, bounds = [], [], [], [0]
+        for table in fronts.values():
+            points = table[self.objectives].to_numpy(dtype=np.float64)
+            table = table[nondominated_mask(points)].drop_duplicates(ROUTE_COLUMNS) if len(points) else table
+            values.append(table[self.objectives].to_numpy(dtype=np.float64))
+            routes.append(table[ROUTE_COLUMNS[0]].to_numpy(dtype=str))
+            patterns.append(table[ROUTE_COLUMNS[1]].to_numpy(dtype=str))
+            bounds.append(bounds[-1] + len(table))
+        self.names = list(fronts)
+        self.bounds = np.array(bounds, dtype=np.int64)
+        self.values = np.vstack(values) if values else np.empty((0, len(self.objectives)))
+        self.routes = np.concatenate(routes) if routes else np.empty(0, dtype=str)
+        self.patterns = np.concatenate(patterns) if patterns else np.empty(0, dtype=str)
+        self.order, self.best = self._sort_fronts()
+        self._summarize()
+
+    # 🛠️ Function to sort every front by every objective
+    def _sort_fronts(self):
+        """
+        order[k]   - row ids sorted by objective k within each front (ties by the other objectives);
+        best[c, t] - along order[c], the row with the smallest objective t so far within its front.
+        """
+        count, objectives = len(self.values), len(self.objectives)
+        segment = np.repeat(np.arange(len(self.names)), np.diff(self.bounds))
+        order = np.empty((objectives, count), dtype=np.int64)
+        best = np.empty((objectives, objectives, count), dtype=np.int64)
+        for k in range(objectives):
+            keys = [self.values[:, j] for j in reversed(range(objectives)) if j != k]
+            order[k] = np.lexsort(keys + [self.values[:, k], segment])
+        position = np.arange(count)
+        for c in range(objectives):
+            for t in range(objectives):
+                target = self.values[order[c], t]
+                running = np.empty(count, dtype=np.int64)
+                for start, end in zip(self.bounds[:-1], self.bounds[1:]):
+                    previous = np.minimum.accumulate(target[start:end])
+                    improved = np.r_[True, target[start + 1:end] < previous[:-1]] if end > start else np.zeros(0, dtype=bool)
+                    running[start:end] = np.maximum.accumulate(np.where(improved, position[start:end], start))
+                best[c, t] = order[c][running]
+        return order, best
+
+    def _summarize(self):
+        """Ideal point, nadir point and knee row of every front."""
+        self.ideal = np.full((len(self.names), len(self.objectives)), np.nan)
+        self.nadir = np.full((len(self.names), len(self.objectives)), np.nan)
+        self.knees = np.full(len(self.names), -1, dtype=np.int64)
+        for f, (start, end) in enumerate(zip(self.bounds[:-1], self.bounds[1:])):
+            if end == start:
+                continue
+            points = self.values[start:end]
+            self.ideal[f], self.nadir[f] = points.min(axis=0), points.max(axis=0)
+            self.knees[f] = start + np.argmin(((points - self.ideal[f]) * self._scale(f)).sum(axis=1))
+
+    def _scale(self, f):
+        """1 / objective range of front f (1 where the range is zero), the default normalization."""
+        spread = self.nadir[f] - self.ideal[f]
+        return 1.0 / np.where(spread > 0, spread, 1.0)
+
+    def _front(self, front):
+        """Index and row bounds of a front (default: the first one, the reference front of from_solutions)."""
+        front = self.names[0] if front is None else front
+        if front not in self.names:
+            raise KeyError(f"Unknown front '{front}', expected one of {self.names}")
+        f = self.names.index(front)
+        return f, int(self.bounds[f]), int(self.bounds[f + 1])
+
+    def _objective(self, objective):
+        if objective not in self.objectives:
+            raise KeyError(f"Unknown objective '{objective}', expected one of {self.objectives}")
+        return self.objectives.index(objective)
+
+    # 🛠️ Function to build the index from the deduplicated solutions
+    @classmethod
+    def from_solutions(cls, solutions, objectives=OBJECTIVES):
+        """Reference front plus one front per algorithm, from SolutionIndex.build_solution_index's solutions."""
+        objectives = list(objectives)
+        candidates = solutions[nondominated_mask(solutions[objectives].values)]
+        fronts = {REFERENCE_FRONT: candidates}
+        found = '|' + solutions['Algorithms'] + '|'
+        for algorithm in sorted({name for names in solutions['Algorithms'].unique() for name in names.split('|')}):
+            fronts[algorithm] = solutions[found.str.contains(f"|{algorithm}|", regex=False)]
+        return cls(fronts, objectives)
+
+    # 🛠️ Function to look up rows as a table
+    def records(self, rows, front=None):
+        """Front, IsleOrder, WalkingPattern and objectives of global row ids (-1 gives an empty row)."""
+        rows = np.asarray(rows, dtype=np.int64)
+        found = rows >= 0
+        safe = np.where(found, rows, 0)
+        table = pd.DataFrame({'Front': self.names[0] if front is None else front,
+                              ROUTE_COLUMNS[0]: np.where(found, self.routes[safe] if len(self.routes) else '', None),
+                              ROUTE_COLUMNS[1]: np.where(found, self.patterns[safe] if len(self.patterns) else '', None)})
+        for k, objective in enumerate(self.objectives):
+            table[objective] = np.where(found, self.values[safe, k] if len(self.values) else np.nan, np.nan)
+        return table
+
+    def _record(self, row, front):
+        """One row as a dict (built from the arrays directly, so single queries stay cheap)."""
+        if row < 0:
+            return None
+        record = {'Front': self.names[0] if front is None else front,
+                  ROUTE_COLUMNS[0]: str(self.routes[row]), ROUTE_COLUMNS[1]: str(self.patterns[row])}
+        record.update(zip(self.objectives, self.values[row].tolist()))
+        return record
+
+    # 🛠️ Functions for "best target under a budget" queries
+    def budget_rows(self, limits, constraint=None, target=None, front=None):
+        """
+        Row ids of the smallest `target` among the solutions with `constraint` <= each limit (-1 if none).
+        `constraint` and `target` default to the first and second objectives (WalkingTime, ExposureTime).
+        """
+        c = 0 if constraint is None else self._objective(constraint)
+        t = 1 if target is None else self._objective(target)
+        _, start, end = self._front(front)
+        limits = np.asarray(limits, dtype=np.float64)
+        ranked = self.values[self.order[c, start:end], c]
+        position = np.searchsorted(ranked, limits, side='right') - 1
+        return np.where(position >= 0, self.best[c, t, start + np.maximum(position, 0)], -1) if end > start \
+            else np.full(limits.shape, -1, dtype=np.int64)
+
+    def budget(self, limit, constraint=None, target=None, front=None):
+        """The solution with the lowest `target` and `constraint` <= limit, as a dict (None if none qualifies)."""
+        return self._record(int(self.budget_rows([limit], constraint, target, front)[0]), front)
+
+    def budget_batch(self, limits, constraint=None, target=None, front=None):
+        """One row per limit: the limit (as 'Max <constraint>') followed by the budget answer's record."""
+        limits = np.asarray(limits, dtype=np.float64)
+        table = self.records(self.budget_rows(limits, constraint, target, front), front)
+        table.insert(0, f"Max {constraint or self.objectives[0]}", limits)
+        return table
+
+    # 🛠️ Function to return the knee of a front
+    def knee(self, front=None):
+        """The solution with the smallest sum of range-normalized objectives, as a dict."""
+        f, _, _ = self._front(front)
+        return self._record(int(self.knees[f]), front)
+
+    # 🛠️ Functions for "closest to a point" queries
+    def nearest_rows(self, points=None, weights=None, front=None):
+        """
+        Row ids minimizing max_k weights[k] * (objective k - point[k]) for each point (rows of an
+        (n, objectives) array; default: the front's ideal point). Weights default to 1 / objective range.
+        """
+        f, start, end = self._front(front)
+        points = np.atleast_2d(self.ideal[f] if points is None else np.asarray(points, dtype=np.float64))
+        weights = self._scale(f) if weights is None else np.asarray(weights, dtype=np.float64)
+        if end == start:
+            return np.full(len(points), -1, dtype=np.int64)
+        if len(self.objectives) != 2:
+            return np.array([start + np.argmin((weights * (self.values[start:end] - point)).max(axis=1)) for point in points])
+
+        # Along the front sorted by the first objective, its term rises while the second's falls
+        rows = self.order[0, start:end]
+        first, second = self.values[rows, 0], self.values[rows, 1]
+        low, high = np.zeros(len(points), dtype=np.int64), np.full(len(points), len(rows), dtype=np.int64)
+        while (low < high).any():
+            middle = (low + high) // 2
+            safe = np.minimum(middle, len(rows) - 1)
+            rising = weights[0] * (first[safe] - points[:, 0]) >= weights[1] * (second[safe] - points[:, 1])
+            active = low < high
+            high = np.where(active & rising, middle, high)
+            low = np.where(active & ~rising, middle + 1, low)
+        candidates = np.stack([np.maximum(low - 1, 0), np.minimum(low, len(rows) - 1)], axis=1)
+        scores = np.maximum(weights[0] * (first[candidates] - points[:, :1]), weights[1] * (second[candidates] - points[:, 1:]))
+        return rows[candidates[np.arange(len(points)), np.argmin(scores, axis=1)]]
+
+    def nearest(self, point=None, weights=None, front=None):
+        """The solution closest to `point` (default: the ideal point) in weighted Chebyshev distance, as a dict."""
+        return self._record(int(self.nearest_rows(point, weights, front)[0]), front)
+
+    def nearest_batch(self, points, weights=None, front=None):
+        """One row per point: the point (as 'Target <objective>' columns) followed by the nearest solution's record."""
+        points = np.atleast_2d(np.asarray(points, dtype=np.float64))
+        table = self.records(self.nearest_rows(points, weights, front), front)
+        for k, objective in reversed(list(enumerate(self.objectives))):
+            table.insert(0, f"Target {objective}", points[:, k])
+        return table
+
+    # 🛠️ Function to list the fronts
+    def summary(self):
+        """One row per front: its size, ideal and nadir points."""
+        table = pd.DataFrame({'Front': self.names, 'Solutions': np.diff(self.bounds)})
+        for k, objective in enumerate(self.objectives):
+            table[f"Min {objective}"] = self.ideal[:, k]
+            table[f"Max {objective}"] = self.nadir[:, k]
+        return table
+
+    # 🛠️ Functions to save and reload the index
+    def save(self, index_dir):
+        """Writes the arrays as .npy files and the rest as meta.json, replacing `index_dir` atomically."""
+        temp_dir = index_dir.rstrip(os.sep) + '.tmp'
+        shutil.rmtree(temp_dir, ignore_errors=True)
+        os.makedirs(temp_dir)
+        for name in ARRAYS:
+            np.save(os.path.join(temp_dir, f"{name}.npy"), getattr(self, name), allow_pickle=False)
+        meta = {'version': INDEX_VERSION, 'objectives': self.objectives, 'names': self.names,
+                'bounds': self.bounds.tolist(), 'knees': self.knees.tolist(),
+                'ideal': self.ideal.tolist(), 'nadir': self.nadir.tolist()}
+        with open(os.path.join(temp_dir, 'meta.json'), 'w') as file:
+            json.dump(meta, file)
+        shutil.rmtree(index_dir, ignore_errors=True)
+        os.replace(temp_dir, index_dir)
+        return index_dir
+
+    @classmethod
+    def load(cls, index_dir, mmap=True):
+        """Reloads a saved index; with `mmap` the arrays are read-only memory maps, so loading costs no copy."""
+        with open(os.path.join(index_dir, 'meta.json'), 'r') as file:
+            meta = json.load(file)
+        if meta.get('version') != INDEX_VERSION:
+            raise ValueError(f"Index version {meta.get('version')} in {index_dir}, expected {INDEX_VERSION}")
+        index = cls.__new__(cls)
+        index.objectives, index.names = meta['objectives'], meta['names']
+        index.bounds, index.knees = np.array(meta['bounds'], dtype=np.int64), np.array(meta['knees'], dtype=np.int64)
+        index.ideal = np.array(meta['ideal'], dtype=np.float64).reshape(len(index.names), -1)
+        index.nadir = np.array(meta['nadir'], dtype=np.float64).reshape(len(index.names), -1)
+        for name in ARRAYS:
+            setattr(index, name, np.load(os.path.join(index_dir, f"{name}.npy"), mmap_mode='r' if mmap else None,
+                                         allow_pickle=False))
+        return index
+
+# 🛠️ Function to build the query index of a run tree
+def build_pareto_index(root_dir, objectives=OBJECTIVES, workers=1, use_cache=False):
+    """Deduplicates the run tree with SolutionIndex and indexes its reference and per-algorithm fronts."""
+    from SolutionIndex import build_solution_index
+
+    solutions, _ = build_solution_index(root_dir, workers=workers, use_cache=use_cache, objectives=objectives)
+    index = ParetoIndex.from_solutions(solutions, objectives)
+    print(f"✅ Indexed {len(index.names)} fronts with {int(index.bounds[-1]):,} Pareto solutions.\n")
+    return index
+
+
+# **Main Execution**
+if __name__ == "__main__":
+    root_directory = r"C:\Users\Jeryes\github\SuperMarketNavigation\MultiObject\SuperMarketNavigation\bin\Debug\net9.0\Run_20250209_004552"
+    pareto_index = build_pareto_index(root_directory)
+    pareto_index.save("pareto_index")
+    print("\n📊 **Fronts:**")
+    print(pareto_index.summary())
+    print("\n🔍 Lowest ExposureTime with WalkingTime <= 80:")
+    print(pareto_index.budget(80))
+    print("\n🔍 Knee of the reference front:")
+    print(pareto_index.knee())
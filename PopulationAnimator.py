@@ -0,0 +1,166 @@
+import os
+import shutil
+import subprocess
+import numpy as np
+from PIL import Image
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from Analyzer import OBJECTIVES, DEFAULT_CHUNKSIZE, read_raw_chunks
+from Dominance import nondominated_mask
+
+# Python counterpart of VisualizeFullPopulation + VideoCreator in the optimizer: streams a
+# raw data CSV one generation at a time and animates the population spread (dominated
+# solutions in gray, the first front in red). The figure is drawn once; every frame only
+# moves the two scatter offsets and the title (blitting on the Agg canvas), and frames go
+# straight to the output, so memory is bounded by one chunk of rows plus one frame.
+#
+# Outputs, chosen by the output path:
+#   *.mp4        - piped to ffmpeg (same encoding as VideoCreator)
+#   *.gif        - piped to ffmpeg when available, otherwise assembled with Pillow
+#                  (which keeps every paletted frame in memory; use `step` for long runs)
+#   a directory  - one population_spread_gen_<generation>.png per frame, as the C# code writes
+
+FRAME_PREFIX = "population_spread_gen_"
+DEFAULT_FPS = 10
+
+
+# 🛠️ Function to stream a raw data file one generation at a time
+def iter_generations(file_path, chunksize=DEFAULT_CHUNKSIZE, use_cache=False, step=1):
+    """
+    Yields (generation, objective array) for every `step`-th generation of a raw data CSV,
+    reading it in chunks of `chunksize` rows (rows are in generation order).
+    """
+    dtypes = {'Generation': 'int64', **{objective: 'float64' for objective in OBJECTIVES}}
+    pending_generation, pending = None, []
+    index = 0
+    for chunk in read_raw_chunks(file_path, ['Generation'] + OBJECTIVES, dtypes, chunksize, use_cache):
+        generations = chunk['Generation'].values
+        values = chunk[OBJECTIVES].values
+        starts = np.flatnonzero(np.r_[True, generations[1:] != generations[:-1]]) if len(generations) else []
+        for start, end in zip(starts, np.r_[starts[1:], len(values)]):
+            generation = int(generations[start])
+            if generation != pending_generation:
+                if pending:
+                    if index % step == 0:
+                        yield pending_generation, np.vstack(pending)
+                    index += 1
+                pending_generation, pending = generation, []
+            pending.append(values[start:end])
+    if pending and index % step == 0:
+        yield pending_generation, np.vstack(pending)
+
+# 🛠️ Function to find fixed axis limits for a whole run
+def objective_bounds(file_path, chunksize=DEFAULT_CHUNKSIZE, use_cache=False, margin=0.05):
+    """Returns ((x min, x max), (y min, y max)) over all rows, padded by `margin` of the range."""
+    low = np.full(len(OBJECTIVES), np.inf)
+    high = np.full(len(OBJECTIVES), -np.inf)
+    for chunk in read_raw_chunks(file_path, OBJECTIVES, 'float64', chunksize, use_cache):
+        if len(chunk):
+            low = np.fmin(low, np.nanmin(chunk[OBJECTIVES].values, axis=0))
+            high = np.fmax(high, np.nanmax(chunk[OBJECTIVES].values, axis=0))
+    pad = np.where(high > low, (high - low) * margin, 1.0)
+    return tuple(zip(low - pad, high + pad))
+
+# 🛠️ Functions writing frames as they are produced
+class _FfmpegSink:
+    def __init__(self, output, width, height, fps):
+        encoding = ["-c:v", "libx264", "-pix_fmt", "yuv420p"] if output.endswith('.mp4') else []
+        self.process = subprocess.Popen(
+            ["ffmpeg", "-y", "-loglevel", "error", "-f", "rawvideo", "-pix_fmt", "rgba", "-s", f"{width}x{height}",
+             "-framerate", str(fps), "-i", "-", "-vf", "pad=ceil(iw/2)*2:ceil(ih/2)*2", *encoding, output],
+            stdin=subprocess.PIPE)
+
+    def write(self, frame, generation):
+        self.process.stdin.write(frame.tobytes())
+
+    def close(self):
+        self.process.stdin.close()
+        if self.process.wait() != 0:
+            raise RuntimeError("ffmpeg failed to encode the animation")
+
+class _GifSink:
+    def __init__(self, output, fps):
+        self.output, self.duration, self.frames = output, 1000 / fps, []
+
+    def write(self, frame, generation):
+        self.frames.append(Image.fromarray(frame[:, :, :3]).quantize(colors=64))
+
+    def close(self):
+        if self.frames:
+            self.frames[0].save(self.output, save_all=True, append_images=self.frames[1:], duration=self.duration, loop=0)
+
+class _PngStackSink:
+    def __init__(self, output):
+        self.output = output
+        os.makedirs(output, exist_ok=True)
+
+    def write(self, frame, generation):
+        Image.fromarray(frame[:, :, :3]).save(os.path.join(self.output, f"{FRAME_PREFIX}{generation}.png"), compress_level=1)
+
+    def close(self):
+        pass
+
+def _frame_sink(output, width, height, fps):
+    extension = os.path.splitext(output)[1].lower()
+    if extension in ('.mp4', '.gif') and shutil.which("ffmpeg"):
+        return _FfmpegSink(output, width, height, fps)
+    if extension == '.mp4':
+        raise RuntimeError("Writing MP4 needs ffmpeg on the PATH; use a .gif file or a frame directory instead")
+    if extension == '.gif':
+        return _GifSink(output, fps)
+    return _PngStackSink(output)
+
+# 🛠️ Function to animate the population of a raw data file
+def animate_population(file_path, output, fps=DEFAULT_FPS, step=1, bounds=None, chunksize=DEFAULT_CHUNKSIZE,
+                       use_cache=False, figsize=(8, 6), dpi=100, title="Population Spread"):
+    """
+    Writes the generation-by-generation population spread of a raw data CSV to `output`
+    (.mp4, .gif or a frame directory) and returns the number of frames written.
+    `bounds` fixes the axis limits ((x min, x max), (y min, y max)); by default they are
+    taken from a first streaming pass over the file.
+    """
+    bounds = objective_bounds(file_path, chunksize, use_cache) if bounds is None else bounds
+
+    fig = Figure(figsize=figsize, dpi=dpi)
+    canvas = FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+    ax.set_xlim(*bounds[0])
+    ax.set_ylim(*bounds[1])
+    ax.set_xlabel("Walking Time")
+    ax.set_ylabel("Exposure Time")
+    ax.grid(True, linestyle='--', linewidth=0.5)
+    empty = np.empty((0, 2))
+    dominated = ax.scatter(empty[:, 0], empty[:, 1], s=12, color='gray', label='Dominated', animated=True)
+    front = ax.scatter(empty[:, 0], empty[:, 1], s=16, color='red', label='Non-dominated', animated=True)
+    ax.legend(loc='upper right')
+    heading = ax.set_title(title, animated=True)
+
+    # Everything but the animated artists is drawn once and restored for every frame
+    canvas.draw()
+    background = canvas.copy_from_bbox(fig.bbox)
+    width, height = canvas.get_width_height()
+    sink = _frame_sink(output, width, height, fps)
+
+    frames = 0
+    try:
+        for generation, points in iter_generations(file_path, chunksize, use_cache, step):
+            mask = nondominated_mask(points)
+            dominated.set_offsets(points[~mask])
+            front.set_offsets(points[mask])
+            heading.set_text(f"{title} - Generation {generation}")
+            canvas.restore_region(background)
+            ax.draw_artist(dominated)
+            ax.draw_artist(front)
+            ax.draw_artist(heading)
+            sink.write(np.asarray(canvas.buffer_rgba()), generation)
+            frames += 1
+    finally:
+        sink.close()
+    return frames
+
+
+# **Main Execution**
+if __name__ == "__main__":
+    raw_data_file = r"C:\Users\Jeryes\github\SuperMarketNavigation\MultiObject\SuperMarketNavigation\bin\Debug\net9.0\Run_20250209_004552\Run1\NSGA2Algorithm\NSGA2Algorithm_raw_data.csv"
+    frame_count = animate_population(raw_data_file, "NSGA2_population.gif")
+    print(f"✅ Animation saved with {frame_count} frames")
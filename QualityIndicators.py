@@ -0,0 +1,280 @@
+from bisect import bisect_left
+import numpy as np
+from Dominance import grouped_pareto_filter, nondominated_mask, pareto_filter
+
+# Upper bound on the number of (front point, reference point) pairs held in memory at once.
+BLOCK_PAIRS = 4_000_000
+# Hypervolume is exact up to this many objectives (2-D sweep, 3-D sweep, slicing above) and
+# estimated by Monte Carlo sampling beyond.
+EXACT_HV_OBJECTIVES = 5
+MC_SAMPLES = 200_000
+
+
+def _as_points(points):
+    points = np.asarray(points, dtype=float)
+    return points.reshape(len(points), -1) if points.ndim != 2 else points
+
+# 🛠️ Functions comparing every front point with every reference point
+def _euclidean_pairs(front, reference):
+    return np.sqrt(((front[:, None, :] - reference[None, :, :]) ** 2).sum(axis=2))
+
+def _igd_plus_pairs(front, reference):
+    return np.sqrt((np.maximum(front[:, None, :] - reference[None, :, :], 0) ** 2).sum(axis=2))
+
+def _epsilon_pairs(front, reference):
+    return (front[:, None, :] - reference[None, :, :]).max(axis=2)
+
+# 🛠️ Function to reduce a pairwise measure to its per-group minimum
+def _group_min(front, starts, reference, pair_values):
+    """
+    For fronts stored contiguously (group g starts at row starts[g]), returns the
+    (groups, reference points) matrix of the minimum of `pair_values` over each group,
+    evaluated in blocks of whole groups to bound memory.
+    """
+    bounds = np.r_[starts, len(front)]
+    block_rows = max(1, BLOCK_PAIRS // max(1, len(reference)))
+    result = np.empty((len(starts), len(reference)))
+    g = 0
+    while g < len(starts):
+        g_end = min(len(starts), max(g + 1, np.searchsorted(bounds, bounds[g] + block_rows, side='right') - 1))
+        values = pair_values(front[bounds[g]:bounds[g_end]], reference)
+        result[g:g_end] = np.minimum.reduceat(values, starts[g:g_end] - bounds[g], axis=0)
+        g = g_end
+    return result
+
+# 🛠️ Function to compute the 99th percentile of every group of values
+def _group_percentile(values, group_index, n_groups, q=99):
+    """np.percentile(..., q) per group (linear interpolation, same rounding as NumPy); NaN for empty groups."""
+    order = np.lexsort((values, group_index))
+    values, group_index = values[order], group_index[order]
+    counts = np.bincount(group_index, minlength=n_groups)
+    starts = np.r_[0, np.cumsum(counts)[:-1]]
+    result = np.full(n_groups, np.nan)
+    has = counts > 0
+    position = (counts[has] - 1) * (q / 100)
+    low = np.floor(position).astype(np.int64)
+    high = np.minimum(low + 1, counts[has] - 1)
+    a, b = values[starts[has] + low], values[starts[has] + high]
+    t = position - low
+    diff = b - a
+    result[has] = np.where(t >= 0.5, b - diff * (1 - t), a + diff * t)
+    return result
+
+# 🛠️ Function to compute the hypervolume of contiguous, lexicographically sorted fronts
+def _group_hypervolume(front, group_index, n_groups, reference_point):
+    if front.shape[1] != 2:
+        bounds = np.r_[0, np.cumsum(np.bincount(group_index, minlength=n_groups))]
+        return np.array([hypervolume(front[start:end], reference_point) for start, end in zip(bounds[:-1], bounds[1:])])
+    inside = np.all(front <= reference_point, axis=1)
+    front, group_index = front[inside], group_index[inside]
+    next_x = np.r_[front[1:, 0], reference_point[0]]
+    last = np.r_[group_index[1:] != group_index[:-1], True]
+    next_x[last] = reference_point[0]
+    boxes = (next_x - front[:, 0]) * (reference_point[1] - front[:, 1])
+    return np.bincount(group_index, weights=boxes, minlength=n_groups)
+
+# 🛠️ Function to compute the Spread of contiguous fronts sorted by the first objective
+def _group_spread(front, group_index, n_groups):
+    """
+    Variance of the gaps between consecutive front points, ignoring gaps at or above
+    the 99th percentile of the front; infinity when no gap is left.
+    """
+    same = group_index[1:] == group_index[:-1]
+    gaps = np.sqrt((np.diff(front, axis=0) ** 2).sum(axis=1))[same]
+    gap_group = group_index[1:][same]
+    threshold = _group_percentile(gaps, gap_group, n_groups)
+    kept = gaps < threshold[gap_group]
+    gaps, gap_group = gaps[kept], gap_group[kept]
+    counts = np.bincount(gap_group, minlength=n_groups)
+    spread = np.full(n_groups, np.inf)
+    has = counts > 0
+    mean = np.bincount(gap_group, weights=gaps, minlength=n_groups)[has] / counts[has]
+    squares = np.bincount(gap_group, weights=(gaps - np.repeat(mean, counts[has])) ** 2, minlength=n_groups)
+    spread[has] = squares[has] / counts[has]
+    return spread
+
+# 🛠️ Function to score many fronts in one call
+def score_fronts(points, groups, reference_point, reference_front):
+    """
+    Reduces each group of `points` to its Pareto front and scores all fronts at once.
+    `groups` holds one integer label per row. Returns (labels, metrics) where metrics maps
+    'Hypervolume', 'IGD', 'IGD+', 'GD', 'Epsilon', 'Spread' and 'Pareto Solutions'
+    to arrays aligned with the sorted unique labels.
+    """
+    front, front_groups = grouped_pareto_filter(points, groups)
+    reference_point = np.asarray(reference_point, dtype=float)
+    reference_front = _as_points(reference_front)
+    labels, group_index = np.unique(front_groups, return_inverse=True)
+    group_index = group_index.ravel()
+    n_groups = len(labels)
+    starts = np.flatnonzero(np.r_[True, group_index[1:] != group_index[:-1]])
+    counts = np.bincount(group_index, minlength=n_groups)
+
+    from scipy.spatial import cKDTree  # SciPy is only loaded once fronts are actually scored
+
+    nearest_reference, _ = cKDTree(reference_front).query(front)
+    metrics = {
+        'Hypervolume': _group_hypervolume(front, group_index, n_groups, reference_point),
+        'IGD': _group_min(front, starts, reference_front, _euclidean_pairs).mean(axis=1),
+        'IGD+': _group_min(front, starts, reference_front, _igd_plus_pairs).mean(axis=1),
+        'GD': np.bincount(group_index, weights=nearest_reference, minlength=n_groups) / counts,
+        'Epsilon': _group_min(front, starts, reference_front, _epsilon_pairs).max(axis=1),
+        'Spread': _group_spread(front, group_index, n_groups),
+        'Pareto Solutions': counts,
+    }
+    return labels, metrics
+
+# 🛠️ Function to compute the 3-D hypervolume by sweeping along the third objective
+def _hypervolume_3d(points, reference_point):
+    """
+    Points (strictly inside the reference box) are added in order of the third objective to
+    a 2-D staircase of the first two objectives (x ascending, y descending); each insertion
+    updates the staircase area by the strip it newly covers, and every slab between two
+    consecutive third-objective values adds area x height. Dominated points leave the
+    staircase unchanged, so the input need not be filtered.
+    """
+    points = points[np.argsort(points[:, 2], kind='stable')]
+    reference_x, reference_y, _ = reference_point.tolist()
+    levels = points[:, 2].tolist() + [float(reference_point[2])]
+    xs, ys = [], []
+    area = volume = 0.0
+    for k, (x, y) in enumerate(points[:, :2].tolist()):
+        i = bisect_left(xs, x)
+        covered = (i > 0 and ys[i - 1] <= y) or (i < len(xs) and xs[i] == x and ys[i] <= y)
+        if not covered:
+            # Walk over the steps the new point dominates, adding the area between them and y
+            end, left, height = i, x, ys[i - 1] if i > 0 else reference_y
+            while end < len(xs) and ys[end] >= y:
+                area += (height - y) * (xs[end] - left)
+                left, height = xs[end], ys[end]
+                end += 1
+            area += (height - y) * ((xs[end] if end < len(xs) else reference_x) - left)
+            xs[i:end], ys[i:end] = [x], [y]
+        volume += area * (levels[k + 1] - levels[k])
+    return volume
+
+# 🛠️ Function to compute the exact hypervolume by slicing (HSO)
+def _exact_hypervolume(points, reference_point):
+    """
+    Hypervolume by slicing objectives (While et al. 2006) for points strictly inside the
+    reference box: sorted by the last objective, the slab between point k and the next one
+    has the (m-1)-objective hypervolume of points 0..k as cross-section, down to the 3-D sweep.
+    """
+    if points.shape[1] == 3:
+        return _hypervolume_3d(points, reference_point)
+    points = points[np.argsort(points[:, -1], kind='stable')]
+    heights = np.diff(np.r_[points[:, -1], reference_point[-1]])
+    return float(sum(height * _exact_hypervolume(points[:k + 1, :-1], reference_point[:-1])
+                     for k, height in enumerate(heights.tolist()) if height > 0))
+
+# 🛠️ Function to estimate the hypervolume by Monte Carlo sampling
+def hypervolume_mc(front, reference_point, samples=MC_SAMPLES, seed=0, z=1.96):
+    """
+    Samples `samples` uniform points in the box between the front's ideal point and
+    `reference_point` and counts those dominated by the front. Returns (estimate, error),
+    where error is `z` standard errors of the estimate (z=1.96: 95% confidence interval).
+    """
+    front = pareto_filter(front)
+    reference_point = np.asarray(reference_point, dtype=float)
+    front = front[np.all(front < reference_point, axis=1)]
+    if len(front) == 0:
+        return 0.0, 0.0
+    lower = front.min(axis=0)
+    box = float(np.prod(reference_point - lower))
+    rng = np.random.default_rng(seed)
+    block = max(1, BLOCK_PAIRS // len(front))
+    hits = 0
+    for start in range(0, samples, block):
+        sample = rng.uniform(lower, reference_point, size=(min(block, samples - start), len(lower)))
+        dominated = np.zeros(len(sample), dtype=bool)
+        for m in range(0, len(front), 64):
+            dominated |= np.all(front[m:m + 64, None, :] <= sample[None, :, :], axis=2).any(axis=0)
+        hits += int(dominated.sum())
+    share = hits / samples
+    return box * share, float(z * box * np.sqrt(share * (1 - share) / samples))
+
+# 🛠️ Function to compute the hypervolume of a single front
+def hypervolume(front, reference_point, samples=MC_SAMPLES, seed=0):
+    """
+    Hypervolume (minimization) dominated by `front` and bounded by `reference_point`: exact
+    up to EXACT_HV_OBJECTIVES objectives, otherwise the Monte Carlo estimate of hypervolume_mc
+    (use that function directly to get its error bound).
+    """
+    front = pareto_filter(front)
+    reference_point = np.asarray(reference_point, dtype=float)
+    if len(front) == 0:
+        return 0.0
+    if front.shape[1] == 2:
+        return float(_group_hypervolume(front, np.zeros(len(front), dtype=np.int64), 1, reference_point)[0])
+    if front.shape[1] > EXACT_HV_OBJECTIVES:
+        return float(hypervolume_mc(front, reference_point, samples, seed)[0])
+    return _exact_hypervolume(front[np.all(front < reference_point, axis=1)], reference_point)
+
+# 🛠️ Function to compute the exclusive hypervolume contribution of every point
+def hv_contributions(front, reference_point):
+    """
+    Returns, for every row of `front`, the hypervolume lost by removing it alone.
+    Dominated rows, duplicated rows and rows outside the reference box contribute 0.
+    """
+    points = _as_points(front)
+    reference_point = np.asarray(reference_point, dtype=float)
+    contributions = np.zeros(len(points))
+    if len(points) == 0:
+        return contributions
+    unique, inverse, counts = np.unique(points, axis=0, return_inverse=True, return_counts=True)
+    inside = np.all(unique <= reference_point, axis=1)
+    keep = nondominated_mask(unique) & inside
+    kept = unique[keep]  # Lexicographic order: first objective ascending, second descending
+    unique_contributions = np.zeros(len(unique))
+    if points.shape[1] == 2:
+        # Box up to the neighbouring front points, minus what the rows it dominates still cover there
+        next_x = np.r_[kept[1:, 0], reference_point[0]]
+        previous_y = np.r_[reference_point[1], kept[:-1, 1]]
+        boxed = unique[inside & ~keep]
+        unique_contributions[keep] = [
+            (corner_x - point[0]) * (corner_y - point[1])
+            - hypervolume(boxed[np.all(boxed >= point, axis=1)], (corner_x, corner_y))
+            for point, corner_x, corner_y in zip(kept, next_x, previous_y)]
+    else:
+        # Own box minus the part all other in-box rows (dominated ones included), limited to that box, still cover
+        boxed = unique[inside]
+        unique_contributions[keep] = [
+            np.prod(reference_point - boxed[k]) - hypervolume(np.maximum(np.delete(boxed, k, axis=0), boxed[k]), reference_point)
+            for k in np.flatnonzero(keep[inside])]
+    unique_contributions[counts > 1] = 0.0
+    return unique_contributions[inverse.ravel()]
+
+# 🛠️ Function to compute IGD (Inverted Generational Distance)
+def igd(front, reference_front):
+    """Mean distance from each reference point to its nearest front point."""
+    from scipy.spatial import cKDTree
+    distances, _ = cKDTree(_as_points(front)).query(_as_points(reference_front))
+    return float(np.mean(distances))
+
+# 🛠️ Function to compute IGD+ (modified distance, Pareto-compliant)
+def igd_plus(front, reference_front):
+    """Mean over reference points z of min over front points a of ||max(a - z, 0)||."""
+    front = _as_points(front)
+    return float(_group_min(front, np.array([0]), _as_points(reference_front), _igd_plus_pairs).mean())
+
+# 🛠️ Function to compute GD (Generational Distance)
+def gd(front, reference_front):
+    """Mean distance from each front point to its nearest reference point."""
+    from scipy.spatial import cKDTree
+    distances, _ = cKDTree(_as_points(reference_front)).query(_as_points(front))
+    return float(np.mean(distances))
+
+# 🛠️ Function to compute the additive epsilon indicator
+def additive_epsilon(front, reference_front):
+    """Smallest amount every front point must be shifted by so the front weakly dominates the reference front."""
+    front = _as_points(front)
+    return float(_group_min(front, np.array([0]), _as_points(reference_front), _epsilon_pairs).max())
+
+# 🛠️ Function to compute Spread
+def spread(front):
+    """Spread of a single front, with its points taken in order of the first objective."""
+    front = _as_points(front)
+    if len(front) == 0:
+        return float('inf')
+    front = front[np.argsort(front[:, 0], kind='stable')]
+    return float(_group_spread(front, np.zeros(len(front), dtype=np.int64), 1)[0])
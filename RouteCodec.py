@@ -0,0 +1,158 @@
+import numpy as np
+import pandas as pd
+from MarketLayout import as_market_layout
+
+# Compact integer form of routes: a population of "A->B->C" IsleOrder strings becomes a
+# 2-D uint8 (or uint16, for more than 255 aisles) array of aisle codes, one row per route,
+# and WalkingPattern becomes a parallel uint8 column of pattern codes.
+
+ROUTE_SEPARATOR = '->'
+PATTERNS = ['V2H', 'H2V', 'ZgZg']  # Same order as Individual.WalkingPatter in the optimizer
+NON_AISLE_CELLS = {'0', 'x'}
+
+
+# 🛠️ Function to view fixed-length routes of one-character symbols as a byte matrix
+def split_char_routes(routes):
+    """
+    Vectorized split of "A->B->C" routes whose symbols are single ASCII characters and
+    which all have the same length. Returns an (n, route length) uint8 array of symbol
+    bytes, or None when the routes do not have that shape.
+    """
+    try:
+        raw = np.array(list(routes), dtype='S')
+    except (UnicodeEncodeError, ValueError, TypeError):
+        return None
+    width = raw.dtype.itemsize
+    if len(raw) == 0 or width % 3 != 1:
+        return None
+    raw = raw.view(np.uint8).reshape(len(raw), width)
+    symbols = raw[:, 0::3]
+    if not ((raw[:, 1::3] == ord('-')).all() and (raw[:, 2::3] == ord('>')).all() and (symbols != 0).all()):
+        return None
+    return symbols
+
+# 🛠️ Function to join a matrix of symbol codes back into "A->B->C" strings
+def join_routes(symbols, codes):
+    """Returns an object array with one route string per row of `codes` (indices into `symbols`)."""
+    symbols = np.asarray(symbols, dtype=object)
+    codes = np.asarray(codes)
+    if codes.shape[1] == 0:
+        return np.full(len(codes), '', dtype=object)
+    if all(len(symbol) == 1 and ord(symbol) < 128 for symbol in symbols):
+        # One-character symbols: assemble the bytes of every route at once
+        raw = np.empty((len(codes), 3 * codes.shape[1] - 2), dtype=np.uint8)
+        raw[:, 0::3] = np.array([ord(symbol) for symbol in symbols], dtype=np.uint8)[codes]
+        raw[:, 1::3] = ord('-')
+        raw[:, 2::3] = ord('>')
+        return raw.view(f'S{raw.shape[1]}').ravel().astype(str).astype(object)
+    routes = symbols[codes[:, 0]]
+    for position in range(1, codes.shape[1]):
+        routes = routes + ROUTE_SEPARATOR + symbols[codes[:, position]]
+    return routes
+
+
+class RouteCodec:
+    """
+    Maps a layout's aisle symbols (including the entrance '<' and the exit '>') to small
+    integers and converts whole populations of routes between string and array form.
+    Routes shorter than the longest one are right-padded with `pad`.
+    """
+
+    def __init__(self, symbols):
+        self.symbols = list(symbols)
+        self.index = {symbol: code for code, symbol in enumerate(self.symbols)}
+        self.dtype = np.uint8 if len(self.symbols) < np.iinfo(np.uint8).max else np.uint16
+        self.pad = np.iinfo(self.dtype).max
+        if len(self.symbols) >= self.pad:
+            raise ValueError(f"Too many aisle symbols ({len(self.symbols)}) for a route codec")
+        self._byte_lookup = None
+        if all(len(symbol) == 1 and ord(symbol) < 256 for symbol in self.symbols):
+            self._byte_lookup = np.full(256, self.pad, dtype=self.dtype)
+            self._byte_lookup[[ord(symbol) for symbol in self.symbols]] = np.arange(len(self.symbols))
+
+    @classmethod
+    def from_grid(cls, grid):
+        """Builds a codec for every aisle symbol of a grid from convert_layout_to_grid."""
+        return cls(sorted(set(np.asarray(grid).ravel().tolist()) - NON_AISLE_CELLS))
+
+    @classmethod
+    def from_layout(cls, layout):
+        """Builds a codec from a layout dict loaded by load_market_layout (dense or sparse) or a MarketLayout."""
+        if isinstance(layout, dict) and 'IsleMatrix' in layout:
+            return cls(sorted(set(layout['IsleMatrix']) - NON_AISLE_CELLS))
+        return cls(as_market_layout(layout).symbols)
+
+    # 🛠️ Function to encode route strings into a code matrix
+    def encode(self, routes):
+        """Encodes an iterable of "A->B->C" strings into an (n, route length) code array."""
+        routes = pd.Series(list(routes), dtype=object)
+        symbol_bytes = split_char_routes(routes) if self._byte_lookup is not None else None
+        if symbol_bytes is not None:
+            codes = self._byte_lookup[symbol_bytes]
+            if (codes == self.pad).any():
+                unknown = sorted({chr(byte) for byte in np.unique(symbol_bytes[codes == self.pad])})
+                raise KeyError(f"Unknown aisle symbols in routes: {unknown}")
+            return codes
+        tokens = routes.str.split(ROUTE_SEPARATOR)
+        lengths = tokens.str.len().values
+        codes = np.full((len(routes), lengths.max() if len(routes) else 0), self.pad, dtype=self.dtype)
+        flat = pd.Series(np.concatenate(tokens.values) if len(routes) else [], dtype=object).map(self.index)
+        if flat.isna().any():
+            unknown = sorted(set(np.concatenate(tokens.values)) - set(self.index))
+            raise KeyError(f"Unknown aisle symbols in routes: {unknown}")
+        codes[np.arange(codes.shape[1]) < lengths[:, None]] = flat.values.astype(self.dtype)
+        return codes
+
+    # 🛠️ Function to decode a code matrix back into route strings
+    def decode(self, codes):
+        """Decodes an (n, route length) code array (or a single code row) into "A->B->C" strings."""
+        codes = np.asarray(codes)
+        if codes.ndim == 1:
+            return self.decode(codes[None, :])[0]
+        padded = codes == self.pad
+        if not padded.any():
+            return join_routes(self.symbols, codes)
+        return np.array([ROUTE_SEPARATOR.join(self.symbols[code] for code in row[row != self.pad]) for row in codes], dtype=object)
+
+    def symbols_of(self, codes):
+        """Returns the list of aisle symbols of a single route given as a code row."""
+        return [self.symbols[code] for code in np.asarray(codes).tolist() if code != self.pad]
+
+    # 🛠️ Function to encode a raw data table's route columns
+    def encode_frame(self, df, route_column='IsleOrder', pattern_column='WalkingPattern'):
+        """Returns (route codes, pattern codes) for the IsleOrder and WalkingPattern columns of a raw data table."""
+        return self.encode(df[route_column]), encode_patterns(df[pattern_column])
+
+    # 🛠️ Function to decode arrays back into raw data columns
+    def decode_frame(self, route_codes, pattern_codes, route_column='IsleOrder', pattern_column='WalkingPattern'):
+        return pd.DataFrame({route_column: self.decode(route_codes), pattern_column: decode_patterns(pattern_codes)})
+
+
+# 🛠️ Function to encode walking pattern names as enum codes
+def encode_patterns(patterns):
+    codes = pd.Categorical(list(patterns), categories=PATTERNS).codes
+    if (codes < 0).any():
+        raise KeyError(f"Unknown walking patterns: {sorted(set(patterns) - set(PATTERNS))}")
+    return codes.astype(np.uint8)
+
+def decode_patterns(codes):
+    return np.asarray(PATTERNS, dtype=object)[np.asarray(codes)]
+
+# 🛠️ Function to accept a route in string, symbol list or code form
+def route_symbols(route, codec=None):
+    """
+    Returns the aisle symbols of a route given as an "A->B->C" string, a sequence of
+    symbols, or a row of codes (which needs the `codec` that encoded it).
+    """
+    if isinstance(route, str):
+        return route.split(ROUTE_SEPARATOR)
+    route = list(route)
+    if route and all(isinstance(code, (int, np.integer)) for code in route):
+        if codec is None:
+            raise ValueError("A RouteCodec is needed to decode an encoded route")
+        return codec.symbols_of(route)
+    return route
+
+def pattern_name(walking_pattern):
+    """Returns the walking pattern name for a name or an enum code."""
+    return walking_pattern if isinstance(walking_pattern, str) else PATTERNS[int(walking_pattern)]
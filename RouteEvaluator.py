@@ -0,0 +1,108 @@
+import numpy as np
+from LayoutIndex import LayoutIndex
+from RouteCodec import encode_patterns
+
+# Batched route scoring on top of LayoutIndex: walking time, foul passes and exposure of
+# whole populations of encoded routes in a few array operations per leg position.
+#
+# Two exposure models are available:
+# 'decay'     - cold-aisle decay of SuperMarketPlotter_v2.generate_walking_path: every step
+#               adds one unit per cold item carried, a step on a foul cell adds FOUL_PENALTY
+#               more, and the step that collects an item adds nothing;
+# 'optimizer' - ObjectiveFunction.EvaluateIndiv: every item starts at its heat sensitivity
+#               (0 cold, -1 otherwise), gains the time and foul penalty of every later leg,
+#               and only positive totals are summed. This is the ExposureTime of the raw data.
+
+COLD_AISLES = {'L', 'M', 'Q', 'T', 'U', 'W', 'X', 'Y'}
+FOUL_PENALTY = 10
+EXPOSURE_MODELS = ('decay', 'optimizer')
+
+
+class RouteEvaluator:
+    """Scores routes on one layout. Routes are code matrices of `index.codec`, right-padded with its pad code."""
+
+    def __init__(self, index, cold_aisles=COLD_AISLES, foul_penalty=FOUL_PENALTY):
+        self.index = index
+        self.codec = index.codec
+        self.foul_penalty = foul_penalty
+        self.cold = np.isin(self.codec.symbols, list(cold_aisles))
+
+    @classmethod
+    def from_layout(cls, layout, zigzag='parity', cold_aisles=COLD_AISLES, foul_penalty=FOUL_PENALTY):
+        """Builds the evaluator from a layout dict loaded by load_market_layout (dense or sparse) or a MarketLayout."""
+        return cls(LayoutIndex.from_layout(layout, zigzag), cold_aisles, foul_penalty)
+
+    # 🛠️ Function to add the entrance and exit to encoded routes
+    def with_entrance_exit(self, route_codes):
+        """Returns the routes with '<' prepended and '>' appended (after the last non-padded entry)."""
+        route_codes = np.asarray(route_codes)
+        lengths = (route_codes != self.codec.pad).sum(axis=1)
+        enclosed = np.full((len(route_codes), route_codes.shape[1] + 2), self.codec.pad, dtype=self.codec.dtype)
+        enclosed[:, 0] = self.codec.index['<']
+        enclosed[:, 1:-1] = route_codes
+        enclosed[np.arange(len(route_codes)), lengths + 1] = self.codec.index['>']
+        return enclosed
+
+    # 🛠️ Function to evaluate a whole population of encoded routes
+    def evaluate(self, route_codes, pattern_codes, model='decay'):
+        """
+        Returns a dict of arrays aligned with the routes: 'WalkingTime' (steps), 'FoulPasses'
+        (foul cells stepped on) and 'ExposureTime' under the chosen exposure model.
+        Routes are walked as given; use with_entrance_exit for routes stored without '<' and '>'.
+        """
+        if model not in EXPOSURE_MODELS:
+            raise ValueError(f"Unknown exposure model '{model}', expected one of {EXPOSURE_MODELS}")
+        route_codes = np.asarray(route_codes)
+        n = len(route_codes)
+        if route_codes.ndim != 2 or route_codes.shape[1] < 2:
+            zeros = np.zeros(n, dtype=np.int64)
+            return {'WalkingTime': zeros, 'FoulPasses': zeros.copy(), 'ExposureTime': zeros.copy()}
+
+        pattern = np.asarray(pattern_codes, dtype=np.intp)[:, None]
+        origin, target = route_codes[:, :-1], route_codes[:, 1:]
+        valid = (origin != self.codec.pad) & (target != self.codec.pad)
+        origin, target = np.where(valid, origin, 0), np.where(valid, target, 0)
+        length = np.where(valid, self.index.leg_length[origin, target, pattern], 0).astype(np.int64)
+        fouls = np.where(valid, self.index.leg_fouls[origin, target, pattern], 0).astype(np.int64)
+        cost = length + self.foul_penalty * fouls
+
+        if model == 'decay':
+            # Items are only collected by stepping onto them, so an empty leg collects nothing
+            collected = self.cold[target] & (length > 0)
+            carried = np.cumsum(collected, axis=1) - collected
+            exposure = (carried * np.where(length > 0, cost - 1, 0)).sum(axis=1)
+        else:
+            # Item k gains the cost of every leg after the one that reached it
+            later_cost = cost.sum(axis=1, keepdims=True) - np.cumsum(cost, axis=1)
+            item_exposure = np.where(self.cold[target], 0, -1) + later_cost
+            exposure = np.where(valid & (item_exposure > 0), item_exposure, 0).sum(axis=1)
+
+        return {'WalkingTime': length.sum(axis=1), 'FoulPasses': fouls.sum(axis=1), 'ExposureTime': exposure}
+
+    # 🛠️ Function to evaluate the routes of a raw data table
+    def evaluate_frame(self, df, model='decay', entrance_exit=True):
+        """
+        Evaluates the IsleOrder/WalkingPattern columns of a raw data table. The optimizer stores
+        routes without the entrance and exit, so they are added unless `entrance_exit` is False.
+        """
+        route_codes = self.codec.encode(df['IsleOrder'])
+        if entrance_exit:
+            route_codes = self.with_entrance_exit(route_codes)
+        return self.evaluate(route_codes, encode_patterns(df['WalkingPattern']), model)
+
+    # 🛠️ Function to re-validate the objectives stored in a raw data table
+    def validate_frame(self, df):
+        """
+        Re-scores every row with the optimizer's model and returns a boolean mask of rows whose
+        WalkingTime and ExposureTime match. Build the evaluator with zigzag='balance' from the
+        market_layout.json of the run the table came from.
+        """
+        scores = self.evaluate_frame(df, model='optimizer')
+        return (scores['WalkingTime'] == df['WalkingTime'].values) & (scores['ExposureTime'] == df['ExposureTime'].values)
+
+
+# 🛠️ Function to evaluate route strings in one call
+def evaluate_routes(layout, routes, walking_patterns, model='decay', zigzag='parity', cold_aisles=COLD_AISLES):
+    """Convenience wrapper: scores "A->B->C" routes (used as given) on a layout dict."""
+    evaluator = RouteEvaluator.from_layout(layout, zigzag, cold_aisles)
+    return evaluator.evaluate(evaluator.codec.encode(routes), encode_patterns(walking_patterns), model)
@@ -0,0 +1,208 @@
+import os
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from PIL import Image
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import PolyCollection
+from SuperMarketPlotter import generate_walking_path, load_market_layout, convert_layout_to_grid, GRID_LINE_LIMIT, LABEL_LIMIT
+from MarketLayout import as_market_layout
+from RouteCodec import PATTERNS, pattern_name
+from RouteEvaluator import COLD_AISLES
+
+# Headless batch rendering of walking paths (same drawing as plot_walking_pattern).
+# Figures are created without pyplot on the Agg canvas. Each worker draws the layout
+# (walls as one image, aisle labels, grid) once; for every route only the path collection
+# is swapped in. Raster frames restore a saved background and blend in a pre-rendered
+# label layer; SVG frames save the whole figure.
+
+ENTRANCE_EXIT = {'<': 'green', '>': 'red'}
+DEFAULT_FIGSIZE = (4, 4)
+DEFAULT_DPI = 100
+
+
+# 🛠️ Function to draw the static layer of a layout
+def _layout_figure(layout, figsize=DEFAULT_FIGSIZE, dpi=DEFAULT_DPI):
+    """
+    Returns (figure, axes) with walls, aisle labels and grid lines drawn. Like plot_walking_pattern,
+    large layouts get no grid lines, and no aisle labels beyond LABEL_LIMIT aisles (the layer is shared).
+    """
+    fig = Figure(figsize=figsize, dpi=dpi)
+    ax = fig.add_subplot()
+    rows, cols = layout.shape
+    if max(rows, cols) <= GRID_LINE_LIMIT:
+        ax.set_xticks(range(cols))
+        ax.set_yticks(range(rows))
+        ax.grid(True, linestyle='--', linewidth=0.5)
+    else:
+        ax.set_xticks([])
+        ax.set_yticks([])
+    ax.set_xticklabels([])
+    ax.set_yticklabels([])
+
+    # All walls as a single RGBA image instead of one Rectangle each
+    walls = np.zeros((rows, cols, 4), dtype=np.uint8)
+    walls[layout.foul_mask()] = (0, 0, 0, 255)
+    ax.imshow(walls, extent=(0, cols, rows, 0), interpolation='nearest', zorder=0)
+
+    fontsize = 12 * figsize[0] / 8  # plot_walking_pattern uses 12pt on an 8-inch figure
+    labelled = layout.positions if len(layout.symbols) <= LABEL_LIMIT else {}
+    for aisle, (r, c) in labelled.items():
+        color = 'gray' if aisle not in COLD_AISLES else 'blue'
+        color = ENTRANCE_EXIT.get(aisle, color)
+        ax.text(c + 0.5, r + 0.5, aisle, ha='center', va='center', fontsize=fontsize, color='white',
+                bbox=dict(facecolor=color, edgecolor='black'), zorder=3)
+    ax.set_xlim(0, cols)
+    ax.set_ylim(rows, 0)
+    return fig, ax
+
+# 🛠️ Function to turn a route into path segments
+def path_segments(positions, route, walking_pattern):
+    """
+    Returns ((k, 2, 2) segment array in plot coordinates, revisited mask) for the path
+    generate_walking_path walks; a segment leaving a cell visited more than once is revisited.
+    """
+    path_coords, visit_counts = generate_walking_path(positions, route, walking_pattern)
+    cells = np.array(path_coords, dtype=float)[:, ::-1] + 0.5  # (row, col) -> (x, y) cell centres
+    segments = np.stack([cells[:-1], cells[1:]], axis=1)
+    revisited = np.array([visit_counts.get(cell, 1) > 1 for cell in path_coords[:-1]], dtype=bool)
+    return segments, revisited
+
+# 🛠️ Function to build the path artist of one route
+def _path_artist(segments, revisited, linewidth, head_length=0.2, head_width=0.2):
+    """
+    One PolyCollection for the whole path: every step is a single polygon tracing the shaft
+    and an arrow head at the step end, solid on first visits and dashed on revisits.
+    """
+    start, end = segments[:, 0], segments[:, 1]
+    step = end - start
+    length = np.hypot(step[:, 0], step[:, 1])[:, None]
+    unit = np.divide(step, length, out=np.zeros_like(step), where=length > 0)
+    side = unit[:, ::-1] * (-1, 1) * (head_width / 2)
+    base = end - unit * head_length
+    arrows = np.stack([start, base, base + side, end, base - side, base], axis=1)
+    return PolyCollection(arrows, closed=True, facecolors='red', edgecolors='red', linewidths=linewidth, zorder=2,
+                          linestyles=['--' if again else '-' for again in revisited])
+
+# 🛠️ Function to pre-render the static raster layers of a layout figure
+def _raster_layers(fig, ax, canvas):
+    """
+    Returns (backgrounds, labels): one saved background (walls, grid, title) per walking
+    pattern, and the aisle labels alone as a transparent RGBA image to lay over each frame,
+    so a frame only costs drawing the path collection.
+    """
+    title = ax.set_title("")
+    for text in ax.texts:
+        text.set_visible(False)
+    backgrounds = {}
+    for walking_pattern in PATTERNS:
+        title.set_text(f"Supermarket Walking Path ({walking_pattern})")
+        canvas.draw()
+        backgrounds[walking_pattern] = canvas.copy_from_bbox(fig.bbox)
+
+    hidden = [fig.patch, ax.patch, title, *ax.images, *ax.spines.values(), ax.xaxis, ax.yaxis]
+    for artist in hidden:
+        artist.set_visible(False)
+    for text in ax.texts:
+        text.set_visible(True)
+    canvas.draw()
+    labels = np.array(canvas.buffer_rgba())
+    for artist in hidden:
+        artist.set_visible(True)
+    return backgrounds, labels
+
+# 🛠️ Function to render a chunk of routes with one figure (process pool task)
+def render_chunk(task):
+    grid, jobs, figsize, dpi = task
+    layout = as_market_layout(grid)
+    fig, ax = _layout_figure(layout, figsize, dpi)
+    canvas = FigureCanvasAgg(fig)
+    positions = layout.positions
+    linewidth = max(0.5, figsize[0] / 8)  # 1pt on plot_walking_pattern's 8-inch figure
+    raster = any(not output_file.endswith('.svg') for output_file, _, _ in jobs)
+    if raster:
+        backgrounds, labels = _raster_layers(fig, ax, canvas)
+        label_pixels = np.nonzero(labels[:, :, 3])  # Blend only where labels are drawn
+        label_alpha = labels[label_pixels][:, 3:] / 255.0
+        label_rgb = labels[label_pixels][:, :3] * label_alpha
+    title = ax.set_title("")
+    written = []
+    for output_file, route, walking_pattern in jobs:
+        walking_pattern = pattern_name(walking_pattern)
+        segments, revisited = path_segments(positions, route, walking_pattern)
+        path = ax.add_collection(_path_artist(segments, revisited, linewidth), autolim=False)
+        if output_file.endswith('.svg'):
+            # Vector output: swap the path into the full figure and save it
+            title.set_text(f"Supermarket Walking Path ({walking_pattern})")
+            fig.savefig(output_file)
+        else:
+            # Raster output: restore the background, draw the path, lay the labels over it
+            canvas.restore_region(backgrounds[walking_pattern])
+            ax.draw_artist(path)
+            frame = np.array(canvas.buffer_rgba())[:, :, :3]
+            frame[label_pixels] = frame[label_pixels] * (1 - label_alpha) + label_rgb
+            Image.fromarray(frame).save(output_file, compress_level=1)
+        path.remove()
+        written.append(output_file)
+    return written
+
+# 🛠️ Function to render many routes across a process pool
+def render_routes(grid, routes, walking_patterns, output_dir, names=None, fmt='png',
+                  workers=None, figsize=DEFAULT_FIGSIZE, dpi=DEFAULT_DPI, chunk_size=64):
+    """
+    Renders one `fmt` ('png' or 'svg') file per route into `output_dir` and returns the file
+    paths in input order. Files are named after `names` (default route_00000, ...).
+    workers=1 renders in-process; otherwise chunks of `chunk_size` routes go to a process pool
+    (None = all cores), each chunk reusing one figure.
+    """
+    routes, walking_patterns = list(routes), list(walking_patterns)
+    names = [f"route_{i:05d}" for i in range(len(routes))] if names is None else list(names)
+    os.makedirs(output_dir, exist_ok=True)
+    jobs = [(os.path.join(output_dir, f"{name}.{fmt}"), route, pattern)
+            for name, route, pattern in zip(names, routes, walking_patterns)]
+    tasks = [(grid, jobs[i:i + chunk_size], figsize, dpi) for i in range(0, len(jobs), chunk_size)]
+    if workers == 1:
+        results = [render_chunk(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(render_chunk, tasks))
+    return [output_file for chunk in results for output_file in chunk]
+
+# 🛠️ Function to look up the routes of Pareto solutions in the raw data
+def attach_routes(pareto_df, root_dir):
+    """
+    Adds IsleOrder and WalkingPattern to a table of Run/Algorithm/WalkingTime/ExposureTime rows
+    (such as all_final_pareto.csv) from the raw data of `root_dir`, taking the latest
+    generation's route when several routes share the objectives.
+    """
+    from Analyzer import OBJECTIVES, find_all_csv_files
+
+    tagged = []
+    for run, algorithm, file_path in find_all_csv_files(root_dir):
+        wanted = pareto_df[(pareto_df['Run'] == run) & (pareto_df['Algorithm'] == algorithm)]
+        if wanted.empty:
+            continue
+        raw = pd.read_csv(file_path, usecols=OBJECTIVES + ['IsleOrder', 'WalkingPattern'])
+        raw[OBJECTIVES] = raw[OBJECTIVES].astype(float)
+        raw = raw.drop_duplicates(OBJECTIVES, keep='last')
+        tagged.append(wanted.astype({objective: float for objective in OBJECTIVES}).merge(raw, on=OBJECTIVES, how='left'))
+    return pd.concat(tagged, ignore_index=True) if tagged else pareto_df.assign(IsleOrder=None, WalkingPattern=None)
+
+# 🛠️ Function to render every Pareto solution of an analysis
+def render_pareto_routes(pareto_file, root_dir, layout_file, output_dir, fmt='png', workers=None,
+                         figsize=DEFAULT_FIGSIZE, dpi=DEFAULT_DPI):
+    """Renders the route of every row of all_final_pareto.csv, named <Run>_<Algorithm>_<row>."""
+    solutions = attach_routes(pd.read_csv(pareto_file), root_dir).dropna(subset=['IsleOrder'])
+    grid = convert_layout_to_grid(load_market_layout(layout_file))
+    names = [f"{run}_{algorithm}_{i:04d}" for i, (run, algorithm) in enumerate(zip(solutions['Run'], solutions['Algorithm']))]
+    return render_routes(grid, solutions['IsleOrder'], solutions['WalkingPattern'], output_dir,
+                         names=names, fmt=fmt, workers=workers, figsize=figsize, dpi=dpi)
+
+
+# **Main Execution**
+if __name__ == "__main__":
+    root_directory = r"C:\Users\Jeryes\github\SuperMarketNavigation\MultiObject\SuperMarketNavigation\bin\Debug\net9.0\Run_20250209_004552"
+    files = render_pareto_routes("all_final_pareto.csv", root_directory,
+                                 os.path.join(root_directory, "market_layout.json"), "route_thumbnails")
+    print(f"✅ Rendered {len(files)} route plots to route_thumbnails")
@@ -0,0 +1,311 @@
+import json
+import time
+import asyncio
+from collections import OrderedDict, deque
+import numpy as np
+from MarketLayout import MarketLayout, as_market_layout
+from RouteCodec import ROUTE_SEPARATOR, encode_patterns
+from RouteEvaluator import RouteEvaluator, COLD_AISLES, EXPOSURE_MODELS
+
+# Local HTTP/JSON route-evaluation service. Layouts are parsed once and kept warm as
+# RouteEvaluators (the batch form of SuperMarketPlotter_v2's walking-pattern and cold-decay
+# walk), keyed by MarketLayout.digest(). Results go into an LRU cache keyed by
+# (layout hash, route, pattern); the routes a request misses are queued, and one batcher task
+# scores everything queued at that moment in a single evaluate() call, so concurrent
+# requests share batches without waiting on a timer. Endpoints:
+#   POST /evaluate {"routes": ["A->B->C", ...], "patterns": ["ZgZg", ...] or "pattern": "ZgZg",
+#                   "layout": <hash or layout dict, default: the first loaded layout>}
+#        -> {"layout", "WalkingTime": [...], "FoulPasses": [...], "ExposureTime": [...], "CacheHits"}
+#   POST /layouts {"layout": {...}}  -> {"layout": <hash>, "aisles": n}
+#   GET  /layouts, /metrics (p50/p99 latency, cache hits, batch sizes), /health
+# Routes without the entrance '<' are walked from '<' to '>' like the optimizer's stored routes.
+# Only the standard library serves HTTP (HTTP/1.1 with keep-alive, JSON bodies).
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+DEFAULT_CACHE_SIZE = 100_000
+MAX_BATCH_ROUTES = 50_000  # Routes scored by one evaluate() call at most
+LATENCY_WINDOW = 10_000  # Recent /evaluate requests kept for the latency percentiles
+RESULT_FIELDS = ('WalkingTime', 'FoulPasses', 'ExposureTime')
+REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed', 500: 'Internal Server Error'}
+
+
+class LRUCache:
+    """Least-recently-used mapping with a size limit and hit/miss counters."""
+
+    def __init__(self, maxsize=DEFAULT_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        value = self.entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {'hits': self.hits, 'misses': self.misses, 'hit_rate': self.hits / lookups if lookups else 0.0,
+                'size': len(self.entries), 'maxsize': self.maxsize}
+
+
+class HTTPError(Exception):
+    """An error answered with its status code and a JSON {"error": message} body."""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+# 🛠️ Function to check that a request field is a list of strings
+def string_list(value, name):
+    """Returns `value`, or raises HTTPError 400 unless it is a JSON list of strings."""
+    if not isinstance(value, list):
+        raise HTTPError(400, f"'{name}' must be a list of strings, got {type(value).__name__}")
+    for item in value:
+        if not isinstance(item, str):
+            raise HTTPError(400, f"'{name}' must be a list of strings, got an item of type {type(item).__name__}")
+    return value
+
+
+class RouteService:
+    """Warm layouts, the result cache, the batcher and the HTTP handlers."""
+
+    def __init__(self, cache_size=DEFAULT_CACHE_SIZE, zigzag='parity', model='decay', cold_aisles=COLD_AISLES,
+                 max_batch=MAX_BATCH_ROUTES):
+        if model not in EXPOSURE_MODELS:
+            raise ValueError(f"Unknown exposure model '{model}', expected one of {EXPOSURE_MODELS}")
+        self.zigzag, self.model, self.cold_aisles = zigzag, model, cold_aisles
+        self.max_batch = max_batch
+        self.evaluators = {}  # Layout hash -> RouteEvaluator
+        self.default_layout = None
+        self.cache = LRUCache(cache_size)
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+        self.counters = {'requests': 0, 'errors': 0, 'routes': 0, 'batches': 0, 'batched_routes': 0}
+        self.started = time.time()
+        self.queue = None
+
+    # 🛠️ Function to parse a layout once and keep it warm
+    def add_layout(self, layout):
+        """Registers a layout (dict, grid or MarketLayout) and returns its hash; known layouts are not rebuilt."""
+        layout = as_market_layout(layout)
+        key = layout.digest()
+        if key not in self.evaluators:
+            self.evaluators[key] = RouteEvaluator.from_layout(layout, self.zigzag, self.cold_aisles)
+        self.default_layout = self.default_layout or key
+        return key
+
+    def add_layout_file(self, file_path):
+        return self.add_layout(MarketLayout.load(file_path))
+
+    def _evaluator(self, layout):
+        if isinstance(layout, dict):
+            try:
+                layout = self.add_layout(layout)
+            except (KeyError, TypeError, ValueError) as error:
+                raise HTTPError(400, f"Invalid layout: {error}")
+        key = self.default_layout if layout is None else layout
+        if key not in self.evaluators:
+            raise HTTPError(404, f"Unknown layout '{key}'; POST it to /layouts first")
+        return key, self.evaluators[key]
+
+    # 🛠️ Function to score routes through the cache and the batcher
+    async def evaluate(self, routes, patterns, layout=None):
+        """Returns (layout hash, {field: list per route}, cache hits) for route strings and pattern names."""
+        key, evaluator = self._evaluator(layout)
+        if len(routes) != len(patterns):
+            raise HTTPError(400, f"Got {len(routes)} routes but {len(patterns)} patterns")
+        results = [self.cache.get((key, route, pattern)) for route, pattern in zip(routes, patterns)]
+        hits = sum(result is not None for result in results)
+        # Each distinct missed (route, pattern) is scored once
+        missing = {}
+        for i, result in enumerate(results):
+            if result is None:
+                missing.setdefault((routes[i], patterns[i]), []).append(i)
+        if missing:
+            pairs = list(missing)
+            try:
+                walked = [route if route.startswith('<') else f"<{ROUTE_SEPARATOR}{route}{ROUTE_SEPARATOR}>" for route, _ in pairs]
+                route_codes = evaluator.codec.encode(walked)
+                pattern_codes = encode_patterns([pattern for _, pattern in pairs])
+            except (KeyError, AttributeError) as error:
+                raise HTTPError(400, f"Cannot encode routes: {error}")
+            future = asyncio.get_running_loop().create_future()
+            await self.queue.put((evaluator, route_codes, pattern_codes, future))
+            scores = await future
+            for pair, score in zip(pairs, scores):
+                self.cache.put((key,) + pair, score)
+                for i in missing[pair]:
+                    results[i] = score
+        self.counters['routes'] += len(routes)
+        columns = {field: [result[k] for result in results] for k, field in enumerate(RESULT_FIELDS)}
+        return key, columns, hits
+
+    # 🛠️ Function to score everything queued in shared evaluate() calls
+    async def _batcher(self):
+        while True:
+            jobs = [await self.queue.get()]
+            size = len(jobs[0][1])
+            while not self.queue.empty() and size < self.max_batch:
+                jobs.append(self.queue.get_nowait())
+                size += len(jobs[-1][1])
+            for evaluator in {id(job[0]): job[0] for job in jobs}.values():
+                group = [job for job in jobs if job[0] is evaluator]
+                width = max(job[1].shape[1] for job in group)
+                route_codes = np.full((sum(len(job[1]) for job in group), width), evaluator.codec.pad, dtype=evaluator.codec.dtype)
+                row = 0
+                for job in group:
+                    route_codes[row:row + len(job[1]), :job[1].shape[1]] = job[1]
+                    row += len(job[1])
+                try:
+                    # Scored in a worker thread so the loop keeps reading requests into the next batch
+                    scores = await asyncio.get_running_loop().run_in_executor(
+                        None, evaluator.evaluate, route_codes, np.concatenate([job[2] for job in group]), self.model)
+                    rows = np.column_stack([scores[field] for field in RESULT_FIELDS]).tolist()
+                except Exception as error:  # Fail the waiting requests, keep the batcher alive
+                    for job in group:
+                        if not job[3].done():
+                            job[3].set_exception(error)
+                    continue
+                self.counters['batches'] += 1
+                self.counters['batched_routes'] += len(rows)
+                row = 0
+                for job in group:
+                    if not job[3].done():  # Requests whose connection dropped are cancelled
+                        job[3].set_result([tuple(score) for score in rows[row:row + len(job[1])]])
+                    row += len(job[1])
+
+    # 🛠️ Function to report latency, cache and batch metrics
+    def metrics(self):
+        latencies = np.array(self.latencies) * 1e3
+        percentiles = np.percentile(latencies, [50, 90, 99]) if len(latencies) else [0.0, 0.0, 0.0]
+        batches = self.counters['batches']
+        return {'uptime_s': time.time() - self.started, 'requests': self.counters['requests'],
+                'errors': self.counters['errors'], 'routes': self.counters['routes'],
+                'latency_ms': {'p50': float(percentiles[0]), 'p90': float(percentiles[1]), 'p99': float(percentiles[2]),
+                               'mean': float(latencies.mean()) if len(latencies) else 0.0, 'window': len(latencies)},
+                'cache': self.cache.stats(),
+                'batches': {'count': batches, 'mean_routes': self.counters['batched_routes'] / batches if batches else 0.0},
+                'layouts': len(self.evaluators)}
+
+    # 🛠️ Function to route one request to its handler
+    async def dispatch(self, method, path, body):
+        """Returns (status, JSON-serializable payload)."""
+        handlers = {('GET', '/health'): lambda _: {'status': 'ok'},
+                    ('GET', '/metrics'): lambda _: self.metrics(),
+                    ('GET', '/layouts'): lambda _: {'layouts': list(self.evaluators), 'default': self.default_layout}}
+        path = path.split('?', 1)[0]
+        try:
+            if (method, path) in handlers:
+                return 200, handlers[(method, path)](body)
+            if path not in ('/evaluate', '/layouts', '/health', '/metrics'):
+                raise HTTPError(404, f"No endpoint {path}")
+            if method != 'POST':
+                raise HTTPError(405, f"{method} is not supported on {path}")
+            try:
+                request = json.loads(body or b'{}')
+            except ValueError as error:
+                raise HTTPError(400, f"Invalid JSON body: {error}")
+            if not isinstance(request, dict):
+                raise HTTPError(400, f"The JSON body must be an object, got {type(request).__name__}")
+            if path == '/layouts':
+                try:
+                    key = self.add_layout(request['layout'])
+                except (KeyError, TypeError, ValueError) as error:
+                    raise HTTPError(400, f"Invalid layout: {error}")
+                return 200, {'layout': key, 'aisles': len(self.evaluators[key].codec.symbols)}
+
+            start = time.perf_counter()
+            routes = string_list(request.get('routes', []), 'routes')
+            if 'patterns' in request:
+                patterns = string_list(request['patterns'], 'patterns')
+            elif isinstance(request.get('pattern'), str):
+                patterns = [request['pattern']] * len(routes)
+            else:
+                raise HTTPError(400, "Give the walking patterns as 'patterns' (a list) or one 'pattern' string")
+            layout = request.get('layout')
+            if layout is not None and not isinstance(layout, (str, dict)):
+                raise HTTPError(400, f"'layout' must be a layout hash or a layout object, got {type(layout).__name__}")
+            key, columns, hits = await self.evaluate(routes, patterns, layout)
+            self.latencies.append(time.perf_counter() - start)
+            return 200, {'layout': key, **columns, 'CacheHits': hits}
+        except HTTPError as error:
+            self.counters['errors'] += 1
+            return error.status, {'error': str(error)}
+        except Exception as error:
+            self.counters['errors'] += 1
+            return 500, {'error': f"{type(error).__name__}: {error}"}
+
+    # 🛠️ Function to serve one keep-alive connection
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                parts = request_line.decode('latin-1').split()
+                body = await reader.readexactly(int(headers.get('content-length', 0) or 0))
+                self.counters['requests'] += 1
+                if len(parts) != 3:
+                    status, payload = 400, {'error': "Malformed request line"}
+                else:
+                    status, payload = await self.dispatch(parts[0].upper(), parts[1], body)
+                data = json.dumps(payload).encode()
+                keep_alive = headers.get('connection', '').lower() != 'close' and len(parts) == 3
+                writer.write(f"HTTP/1.1 {status} {REASONS[status]}\r\nContent-Type: application/json\r\n"
+                             f"Content-Length: {len(data)}\r\nConnection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+                             .encode('latin-1') + data)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    # 🛠️ Function to run the service until cancelled
+    async def serve(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        self.queue = asyncio.Queue()
+        batcher = asyncio.create_task(self._batcher())
+        server = await asyncio.start_server(self.handle_connection, host, port)
+        print(f"✅ Serving {len(self.evaluators)} layout(s) on http://{host}:{port} (cache {self.cache.maxsize:,} results)")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            batcher.cancel()
+
+# 🛠️ Function to start the service from the command line or a script
+def run_service(layout_files, host=DEFAULT_HOST, port=DEFAULT_PORT, cache_size=DEFAULT_CACHE_SIZE, zigzag='parity', model='decay'):
+    """Loads the layouts (the first is the default) and serves until interrupted."""
+    service = RouteService(cache_size, zigzag, model)
+    for file_path in layout_files:
+        print(f"🔍 Loaded {file_path} as layout {service.add_layout_file(file_path)}")
+    try:
+        asyncio.run(service.serve(host, port))
+    except KeyboardInterrupt:
+        print("\n📊 **Final Metrics:**")
+        print(json.dumps(service.metrics(), indent=2))
+
+
+# **Main Execution**
+if __name__ == "__main__":
+    run_service(["market_layout.json"])
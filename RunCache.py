@@ -0,0 +1,278 @@
+import hashlib
+import json
+import os
+import shutil
+import numpy as np
+import pandas as pd
+from RouteCodec import ROUTE_SEPARATOR, join_routes, split_char_routes
+
+# Columnar cache for the optimizer's *_raw_data.csv files.
+# Every CSV gets a sibling folder `.cache/<file name>/` holding one raw binary column per
+# field (read back as read-only np.memmap, i.e. without copying) plus a meta.json that
+# records the source fingerprint. Routes are stored as uint16 symbol codes with one length
+# per row, walking patterns as uint8 codes.
+
+CACHE_VERSION = 1
+CACHE_FOLDER = ".cache"
+NUMERIC_COLUMNS = {'Generation': 'int32', 'WalkingTime': 'float64', 'ExposureTime': 'float64'}
+# Objectives are stored as float64; columns whose values were all whole numbers are read back as int64.
+ROUTE_COLUMN = 'IsleOrder'
+PATTERN_COLUMN = 'WalkingPattern'
+DEFAULT_CHUNKSIZE = 100_000
+
+
+def cache_dir_for(csv_path):
+    """Returns the cache folder of a raw data CSV."""
+    folder, name = os.path.split(os.path.abspath(csv_path))
+    return os.path.join(folder, CACHE_FOLDER, name)
+
+# 🛠️ Function to hash a file's content
+def file_digest(file_path, block_size=1 << 20):
+    digest = hashlib.blake2b(digest_size=16)
+    with open(file_path, 'rb') as file:
+        for block in iter(lambda: file.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def _read_meta(cache_dir):
+    try:
+        with open(os.path.join(cache_dir, 'meta.json'), 'r') as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return None
+
+def _write_meta(cache_dir, meta):
+    temp_path = os.path.join(cache_dir, 'meta.json.tmp')
+    with open(temp_path, 'w') as file:
+        json.dump(meta, file)
+    os.replace(temp_path, os.path.join(cache_dir, 'meta.json'))
+
+# 🛠️ Function to fingerprint a file by size, mtime and content hash
+def file_fingerprint(file_path):
+    stat = os.stat(file_path)
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'blake2b': file_digest(file_path)}
+
+# 🛠️ Function to check a file against a stored fingerprint
+def file_unchanged(file_path, fingerprint):
+    """
+    A file is unchanged if its size and mtime match the fingerprint. If only the mtime
+    differs (e.g. the file was copied or touched), the content hash decides, and a match
+    refreshes fingerprint['mtime_ns'] in place so the next check is cheap again.
+    """
+    stat = os.stat(file_path)
+    if stat.st_size != fingerprint['size']:
+        return False
+    if stat.st_mtime_ns == fingerprint['mtime_ns']:
+        return True
+    if file_digest(file_path) != fingerprint['blake2b']:
+        return False
+    fingerprint['mtime_ns'] = stat.st_mtime_ns
+    return True
+
+# 🛠️ Function to check whether a cache entry still matches its CSV
+def is_cache_valid(csv_path, meta=None):
+    """Checks the entry's stored fingerprint with file_unchanged, persisting a refreshed mtime."""
+    cache_dir = cache_dir_for(csv_path)
+    meta = _read_meta(cache_dir) if meta is None else meta
+    if meta is None or meta.get('version') != CACHE_VERSION:
+        return False
+    mtime_ns = meta['source']['mtime_ns']
+    if not file_unchanged(csv_path, meta['source']):
+        return False
+    if meta['source']['mtime_ns'] != mtime_ns:
+        _write_meta(cache_dir, meta)
+    return True
+
+# 🛠️ Function to encode fixed-length routes of one-character symbols without splitting strings
+def _encode_char_routes(routes, symbol_index):
+    """Vectorized fast path of _encode_routes for the optimizer's "A->B->C" routes; None if it does not apply."""
+    symbol_bytes = split_char_routes(routes)
+    if symbol_bytes is None:
+        return None
+    lookup = np.zeros(256, dtype=np.uint16)
+    for byte in np.unique(symbol_bytes):
+        lookup[byte] = symbol_index.setdefault(chr(byte), len(symbol_index))
+    return lookup[symbol_bytes].ravel(), np.full(len(symbol_bytes), symbol_bytes.shape[1], dtype=np.uint16)
+
+# 🛠️ Function to encode route strings as symbol codes
+def _encode_routes(routes, symbol_index):
+    """
+    Splits "A->B->C" strings into uint16 codes, growing `symbol_index` (symbol -> code)
+    with unseen symbols. Returns (flat codes, per-row lengths).
+    """
+    encoded = _encode_char_routes(routes, symbol_index)
+    if encoded is not None:
+        return encoded
+    tokens = routes.fillna('').str.split(ROUTE_SEPARATOR)
+    lengths = tokens.str.len().values.astype(np.uint16)
+    flat = pd.Series(np.concatenate(tokens.values) if len(tokens) else np.array([], dtype=object))
+    for symbol in pd.unique(flat):
+        symbol_index.setdefault(symbol, len(symbol_index))
+    if len(symbol_index) > np.iinfo(np.uint16).max:
+        raise ValueError("Too many distinct route symbols for the uint16 route encoding")
+    return flat.map(symbol_index).values.astype(np.uint16), lengths
+
+# 🛠️ Function to convert one raw data CSV into the columnar cache
+def build_cache(csv_path, chunksize=DEFAULT_CHUNKSIZE):
+    """
+    Streams the CSV in chunks into binary column files, so memory stays bounded by the
+    chunk size, then atomically replaces any previous cache entry. Returns the cache folder.
+    """
+    cache_dir = cache_dir_for(csv_path)
+    temp_dir = cache_dir + '.tmp'
+    shutil.rmtree(temp_dir, ignore_errors=True)
+    os.makedirs(temp_dir)
+    source = file_fingerprint(csv_path)
+
+    header = pd.read_csv(csv_path, nrows=0).columns
+    numeric = {column: dtype for column, dtype in NUMERIC_COLUMNS.items() if column in header}
+    symbol_index, pattern_index = {}, {}
+    columns, rows = {}, 0
+    files = {}
+    try:
+        for column, dtype in numeric.items():
+            files[column] = open(os.path.join(temp_dir, f'{column}.bin'), 'wb')
+            columns[column] = {'file': f'{column}.bin', 'dtype': dtype, 'integral': True}
+        if ROUTE_COLUMN in header:
+            files['codes'] = open(os.path.join(temp_dir, f'{ROUTE_COLUMN}.codes.bin'), 'wb')
+            files['lengths'] = open(os.path.join(temp_dir, f'{ROUTE_COLUMN}.lengths.bin'), 'wb')
+        if PATTERN_COLUMN in header:
+            files[PATTERN_COLUMN] = open(os.path.join(temp_dir, f'{PATTERN_COLUMN}.bin'), 'wb')
+
+        dtypes = {column: str for column in (ROUTE_COLUMN, PATTERN_COLUMN) if column in header}
+        for chunk in pd.read_csv(csv_path, chunksize=chunksize, dtype=dtypes, keep_default_na=False):
+            rows += len(chunk)
+            for column, dtype in numeric.items():
+                values = pd.to_numeric(chunk[column], errors='coerce').values.astype(dtype)
+                columns[column]['integral'] &= bool(np.all(np.mod(values, 1) == 0))
+                files[column].write(values.tobytes())
+            if ROUTE_COLUMN in header:
+                codes, lengths = _encode_routes(chunk[ROUTE_COLUMN], symbol_index)
+                files['codes'].write(codes.tobytes())
+                files['lengths'].write(lengths.tobytes())
+            if PATTERN_COLUMN in header:
+                for pattern in pd.unique(chunk[PATTERN_COLUMN]):
+                    pattern_index.setdefault(pattern, len(pattern_index))
+                files[PATTERN_COLUMN].write(chunk[PATTERN_COLUMN].map(pattern_index).values.astype(np.uint8).tobytes())
+    finally:
+        for file in files.values():
+            file.close()
+
+    meta = {
+        'version': CACHE_VERSION,
+        'source': source,
+        'rows': rows,
+        'header': [column for column in header if column in numeric or column in (ROUTE_COLUMN, PATTERN_COLUMN)],
+        'columns': columns,
+        'symbols': list(symbol_index),
+        'patterns': list(pattern_index),
+    }
+    _write_meta(temp_dir, meta)
+    shutil.rmtree(cache_dir, ignore_errors=True)
+    os.replace(temp_dir, cache_dir)
+    return cache_dir
+
+# 🛠️ Function to make sure a CSV has an up-to-date cache entry
+def ensure_cache(csv_path, chunksize=DEFAULT_CHUNKSIZE):
+    """Builds the cache entry if it is missing or stale; returns its meta data."""
+    cache_dir = cache_dir_for(csv_path)
+    if not is_cache_valid(csv_path):
+        build_cache(csv_path, chunksize)
+    return _read_meta(cache_dir)
+
+def _memmap(cache_dir, file_name, dtype, length):
+    if length == 0:
+        return np.empty(0, dtype=dtype)
+    return np.memmap(os.path.join(cache_dir, file_name), dtype=dtype, mode='r', shape=(length,))
+
+# 🛠️ Function to load cached columns without copying
+def load_columns(csv_path, columns=None):
+    """
+    Returns a dict of read-only memory-mapped arrays for the requested columns
+    (default: all). IsleOrder comes back as a (codes, lengths, symbols) tuple and
+    WalkingPattern as a (codes, patterns) tuple; use decode_routes/decode_patterns for strings.
+    """
+    meta = ensure_cache(csv_path)
+    cache_dir = cache_dir_for(csv_path)
+    columns = meta['header'] if columns is None else columns
+    rows = meta['rows']
+    data = {}
+    for column in columns:
+        if column in meta['columns']:
+            data[column] = _memmap(cache_dir, meta['columns'][column]['file'], meta['columns'][column]['dtype'], rows)
+        elif column == ROUTE_COLUMN:
+            lengths = _memmap(cache_dir, f'{ROUTE_COLUMN}.lengths.bin', np.uint16, rows)
+            codes = _memmap(cache_dir, f'{ROUTE_COLUMN}.codes.bin', np.uint16, int(lengths.sum(dtype=np.int64)))
+            data[column] = (codes, lengths, meta['symbols'])
+        elif column == PATTERN_COLUMN:
+            data[column] = (_memmap(cache_dir, f'{PATTERN_COLUMN}.bin', np.uint8, rows), meta['patterns'])
+        else:
+            raise KeyError(f"Column '{column}' is not in {csv_path}")
+    return data
+
+# 🛠️ Function to measure the cached bytes behind some columns
+def cached_bytes(csv_path, columns):
+    """Size on disk of the cache files that load_columns maps for `columns`."""
+    meta = ensure_cache(csv_path)
+    cache_dir = cache_dir_for(csv_path)
+    files = []
+    for column in columns:
+        if column in meta['columns']:
+            files.append(meta['columns'][column]['file'])
+        elif column == ROUTE_COLUMN:
+            files += [f'{ROUTE_COLUMN}.lengths.bin', f'{ROUTE_COLUMN}.codes.bin']
+        elif column == PATTERN_COLUMN:
+            files.append(f'{PATTERN_COLUMN}.bin')
+    return sum(os.path.getsize(path) for path in (os.path.join(cache_dir, name) for name in files) if os.path.exists(path))
+
+# 🛠️ Function to turn cached route codes back into "A->B->C" strings
+def decode_routes(codes, lengths, symbols):
+    symbols = np.asarray(symbols, dtype=object)
+    lengths = np.asarray(lengths, dtype=np.int64)
+    if len(lengths) == 0:
+        return np.empty(0, dtype=object)
+    if (lengths == lengths[0]).all():  # Fixed-length routes
+        return join_routes(symbols, np.asarray(codes).reshape(len(lengths), lengths[0]))
+    offsets = np.r_[0, np.cumsum(lengths)]
+    tokens = symbols[np.asarray(codes)]
+    return np.array([ROUTE_SEPARATOR.join(tokens[start:end]) for start, end in zip(offsets[:-1], offsets[1:])], dtype=object)
+
+def decode_patterns(codes, patterns):
+    return np.asarray(patterns, dtype=object)[np.asarray(codes)]
+
+# 🛠️ Function to read cached data as DataFrame chunks
+def read_chunks(csv_path, columns, chunksize=DEFAULT_CHUNKSIZE):
+    """
+    Cache-backed stand-in for pd.read_csv(csv_path, usecols=columns, chunksize=chunksize):
+    yields DataFrames of at most `chunksize` rows (all rows at once if chunksize is None),
+    with routes and patterns decoded back to strings and whole-number columns as int64.
+    """
+    data = load_columns(csv_path, columns)
+    meta = _read_meta(cache_dir_for(csv_path))
+    rows = meta['rows']
+    integral = {column: spec['integral'] for column, spec in meta['columns'].items()}
+    route_offsets = None
+    if ROUTE_COLUMN in data:
+        route_offsets = np.r_[0, np.cumsum(data[ROUTE_COLUMN][1], dtype=np.int64)]
+    step = rows if chunksize is None else chunksize
+    for start in range(0, rows, max(step, 1)):
+        end = min(rows, start + step)
+        chunk = {}
+        for column in columns:
+            if column == ROUTE_COLUMN:
+                codes, lengths, symbols = data[column]
+                chunk[column] = decode_routes(codes[route_offsets[start]:route_offsets[end]], lengths[start:end], symbols)
+            elif column == PATTERN_COLUMN:
+                chunk[column] = decode_patterns(data[column][0][start:end], data[column][1])
+            else:
+                chunk[column] = np.asarray(data[column][start:end])
+                if integral.get(column):
+                    chunk[column] = chunk[column].astype(np.int64)
+        yield pd.DataFrame(chunk, columns=columns, index=pd.RangeIndex(start, end))
+
+# 🛠️ Function to read a whole raw data file through the cache
+def load_frame(csv_path, columns=None):
+    """Cache-backed stand-in for pd.read_csv(csv_path, usecols=columns)."""
+    if columns is None:
+        columns = ensure_cache(csv_path)['header']
+    return next(read_chunks(csv_path, columns, chunksize=None), pd.DataFrame(columns=columns))
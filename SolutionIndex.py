@@ -0,0 +1,171 @@
+import numpy as np
+import pandas as pd
+from functools import partial
+from Dominance import grouped_pareto_filter, nondominated_mask
+import Analyzer
+from Analyzer import OBJECTIVES, DECAY_OBJECTIVE, ROUTE_COLUMNS, DEFAULT_CHUNKSIZE
+
+# Deduplication index of the raw data: the optimizers write the same (IsleOrder,
+# WalkingPattern) solution again in every generation it survives, in every run that finds
+# it. Each file is streamed once and every row is reduced to a 64-bit hash of its route
+# and pattern; the index keeps every unique solution once, with:
+#   solutions   - one row per unique solution: route, objectives, first/last generation,
+#                 generations present, copies, and the runs & algorithms that found it;
+#   occurrences - one row per solution & (run, algorithm): its first/last generation,
+#                 generations present and copies in that file.
+# Fronts and metrics are then computed on the unique solutions (see analyze_index), and
+# the occurrences give the survival of elite solutions (see survival_statistics).
+# Hashes are 64-bit, so a collision is only likely beyond billions of unique solutions.
+
+FILE_COLUMNS = ['Run', 'Algorithm']
+
+
+# 🛠️ Function to hash the solutions of a chunk
+def solution_keys(chunk):
+    """One uint64 hash per row of the IsleOrder/WalkingPattern pair."""
+    return pd.util.hash_pandas_object(chunk[ROUTE_COLUMNS], index=False).values
+
+# 🛠️ Function to index the unique solutions of one raw data file
+def index_file(file_path, chunksize=DEFAULT_CHUNKSIZE, use_cache=False, objectives=OBJECTIVES):
+    """
+    Streams one raw data file and returns one row per unique solution: Key, IsleOrder,
+    WalkingPattern, the stored objectives, First/Last Generation, Generations (present in) and Copies.
+    """
+    stored = [objective for objective in objectives if objective != DECAY_OBJECTIVE]
+    dtypes = {'Generation': 'int64', **{column: object for column in ROUTE_COLUMNS}, **{objective: 'float64' for objective in stored}}
+    pairs, representatives = [], []
+    for chunk in Analyzer.read_raw_chunks(file_path, list(dtypes), dtypes, chunksize, use_cache):
+        keys = solution_keys(chunk)
+        pairs.append(pd.DataFrame({'Key': keys, 'Generation': chunk['Generation'].values}).value_counts(sort=False))
+        first = ~pd.Series(keys).duplicated().values
+        representatives.append(chunk.loc[first, ROUTE_COLUMNS + stored].assign(Key=keys[first]))
+
+    columns = ['Key'] + ROUTE_COLUMNS + stored + ['First Generation', 'Last Generation', 'Generations', 'Copies']
+    if not pairs:
+        return pd.DataFrame(columns=columns)
+    # A solution can span two chunks within one generation, so (key, generation) pairs are summed first
+    counts = pd.concat(pairs).groupby(level=['Key', 'Generation'], sort=False).sum().rename('Copies').reset_index()
+    presence = counts.groupby('Key', sort=False).agg(**{'First Generation': ('Generation', 'min'),
+                                                       'Last Generation': ('Generation', 'max'),
+                                                       'Generations': ('Generation', 'size'),
+                                                       'Copies': ('Copies', 'sum')})
+    unique = pd.concat(representatives, ignore_index=True).drop_duplicates('Key')
+    return unique.join(presence, on='Key')[columns].reset_index(drop=True)
+
+# 🛠️ Function to build the deduplication index of a run tree
+def build_solution_index(root_dir, chunksize=DEFAULT_CHUNKSIZE, workers=1, use_cache=False, objectives=OBJECTIVES):
+    """
+    Returns (solutions, occurrences) for every raw data file of the run tree (see the module notes).
+    Solution ids follow first discovery; DECAY_OBJECTIVE is evaluated once per unique solution.
+    """
+    objectives = list(objectives)
+    stored = [objective for objective in objectives if objective != DECAY_OBJECTIVE]
+    csv_files = Analyzer.find_all_csv_files(root_dir)
+    print(f"🔍 Found {len(csv_files)} CSV files. Indexing unique solutions...\n")
+    tables = Analyzer.parallel_map(partial(index_file, chunksize=chunksize, use_cache=use_cache, objectives=objectives),
+                                   [file_path for _, _, file_path in csv_files], workers, "Indexing Solutions")
+    for (run, algorithm, _), table in zip(csv_files, tables):
+        table.insert(0, 'Algorithm', algorithm)
+        table.insert(0, 'Run', run)
+    indexed = pd.concat(tables, ignore_index=True)
+    indexed.insert(0, 'Solution', pd.factorize(indexed['Key'])[0])
+
+    occurrences = indexed[['Solution'] + FILE_COLUMNS + ['First Generation', 'Last Generation', 'Generations', 'Copies']]
+    grouped = indexed.groupby('Solution', sort=True)
+    solutions = grouped[['Key'] + ROUTE_COLUMNS + stored].first()
+    solutions['First Generation'] = grouped['First Generation'].min()
+    solutions['Last Generation'] = grouped['Last Generation'].max()
+    solutions['Generations'] = grouped['Generations'].sum()
+    solutions['Copies'] = grouped['Copies'].sum()
+    solutions['Runs'] = grouped['Run'].nunique()
+    # Algorithm sets as bit masks (one bit per algorithm), named once per distinct set
+    codes, algorithms = pd.factorize(indexed['Algorithm'])
+    found = pd.DataFrame({'Solution': indexed['Solution'], 'Bit': np.left_shift(1, codes)}).drop_duplicates()
+    masks = found.groupby('Solution', sort=True)['Bit'].sum()
+    names = {mask: '|'.join(algorithms[bit] for bit in range(len(algorithms)) if mask >> bit & 1) for mask in masks.unique()}
+    solutions['Algorithms'] = masks.map(names)
+    solutions = solutions.reset_index()
+    if DECAY_OBJECTIVE in objectives and csv_files:
+        evaluator = Analyzer._decay_evaluator(Analyzer.find_layout_file(csv_files[0][2]))
+        solutions[DECAY_OBJECTIVE] = evaluator.evaluate_frame(solutions, model='decay')['ExposureTime'].astype('float64')
+
+    rows = int(solutions['Copies'].sum())
+    print(f"✅ Indexed {rows:,} rows as {len(solutions):,} unique solutions ({rows / max(len(solutions), 1):.1f} copies each).\n")
+    return solutions, occurrences.reset_index(drop=True)
+
+def _file_points(solutions, occurrences, objectives):
+    """Objective array of every occurrence, with one integer label per (run, algorithm) in first-seen order."""
+    points = solutions[list(objectives)].values[occurrences['Solution'].values]
+    labels, files = pd.factorize(pd.MultiIndex.from_frame(occurrences[FILE_COLUMNS]))
+    return points, labels, files
+
+# 🛠️ Function to compute the analysis tables from the index
+def analyze_index(solutions, occurrences, objectives=OBJECTIVES, reference_point=None, workers=1):
+    """
+    Same result as Analyzer.analyze_runs (performance_df, pareto_df, all_final_pareto_df),
+    computed from the unique solutions of every file instead of re-reading the raw data.
+    """
+    objectives = list(objectives)
+    points, labels, files = _file_points(solutions, occurrences, objectives)
+    front_points, front_labels = grouped_pareto_filter(points, labels)
+    bounds = np.searchsorted(front_labels, np.arange(len(files) + 1))
+    fronts = [front_points[bounds[i]:bounds[i + 1]] for i in range(len(files))]
+    maxima = pd.DataFrame(points).groupby(labels, sort=True).max().values
+
+    global_reference_point = Analyzer.resolve_reference_point(maxima, objectives, reference_point)
+    print(f"✅ Using Global Reference Point for HV: {global_reference_point}\n")
+    reference_pareto = Analyzer.compute_reference_pareto(pd.DataFrame(np.vstack(fronts), columns=objectives), objectives)
+    print(f"✅ Reference Pareto Front computed with {len(reference_pareto)} solutions.\n")
+    scorer = partial(Analyzer.score_front, reference_point=global_reference_point, reference_pareto=reference_pareto,
+                     objectives=objectives)
+    metrics = Analyzer.parallel_map(scorer, [pd.DataFrame(front, columns=objectives) for front in fronts], workers, "Computing Metrics")
+    return Analyzer.collect_results([(run, algorithm, None) for run, algorithm in files], fronts, metrics, objectives)
+
+# 🛠️ Function to select the Pareto-optimal unique solutions
+def solution_front(solutions, objectives=OBJECTIVES):
+    """Returns the unique solutions (with their routes) that no other solution dominates."""
+    return solutions[nondominated_mask(solutions[list(objectives)].values)].sort_values(list(objectives), ignore_index=True)
+
+# 🛠️ Function to measure how long solutions survive in their population
+def survival_statistics(solutions, occurrences, objectives=OBJECTIVES):
+    """
+    Per algorithm, for the elite solutions (non-dominated among all solutions their run found)
+    and for all solutions: how many there are per run, their mean/median/max lifespan
+    (last - first generation + 1), their persistence (share of that span they were present)
+    and how many were still in the final generation.
+    """
+    points, labels, _ = _file_points(solutions, occurrences, objectives)
+    elite = np.zeros(len(occurrences), dtype=bool)
+    order = np.argsort(labels, kind='stable')
+    bounds = np.searchsorted(labels[order], np.arange(labels.max() + 2)) if len(labels) else [0]
+    for start, end in zip(bounds[:-1], bounds[1:]):
+        elite[order[start:end]] = nondominated_mask(points[order[start:end]])
+
+    lifespans = occurrences.assign(
+        Lifespan=occurrences['Last Generation'] - occurrences['First Generation'] + 1,
+        Final=occurrences.groupby(FILE_COLUMNS, sort=False)['Last Generation'].transform('max'))
+    lifespans['Persistence'] = lifespans['Generations'] / lifespans['Lifespan']
+    lifespans['Survived'] = lifespans['Last Generation'] == lifespans['Final']
+
+    rows = []
+    for group, subset in [('Elite', lifespans[elite]), ('All', lifespans)]:
+        for algorithm, table in subset.groupby('Algorithm', sort=False):
+            rows.append({'Algorithm': algorithm, 'Solutions': group,
+                         'Per Run': len(table) / table['Run'].nunique(),
+                         'Mean Lifespan': table['Lifespan'].mean(),
+                         'Median Lifespan': table['Lifespan'].median(),
+                         'Max Lifespan': int(table['Lifespan'].max()),
+                         'Mean Persistence': table['Persistence'].mean(),
+                         'Mean First Generation': table['First Generation'].mean(),
+                         'Survived To End %': 100 * table['Survived'].mean()})
+    return pd.DataFrame(rows)
+
+
+# **Main Execution**
+if __name__ == "__main__":
+    root_directory = r"C:\Users\Jeryes\github\SuperMarketNavigation\MultiObject\SuperMarketNavigation\bin\Debug\net9.0\Run_20250209_004552"
+    solutions_df, occurrences_df = build_solution_index(root_directory)
+    solutions_df.to_csv("solution_index.csv", index=False)
+    occurrences_df.to_csv("solution_occurrences.csv", index=False)
+    print("\n📊 **Elite Solution Survival:**")
+    print(survival_statistics(solutions_df, occurrences_df))
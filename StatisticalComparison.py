@@ -0,0 +1,203 @@
+import warnings
+from itertools import combinations
+import numpy as np
+import pandas as pd
+
+# Statistical comparison of algorithms over repeated runs, from performance_results.csv
+# (one row per run & algorithm) or a per-generation metrics table (analyze_trajectories):
+#   - bootstrap confidence intervals of every algorithm's mean, and of the mean difference
+#     of every algorithm pair, with all resamples drawn at once as a count matrix;
+#   - Wilcoxon signed-rank tests when every algorithm ran on the same runs (paired),
+#     Mann-Whitney U tests otherwise, with multiple-comparison correction per metric;
+#   - rank statistics: mean rank per algorithm (with a Friedman or Kruskal-Wallis test)
+#     and the Vargha-Delaney A12 effect size of every pair.
+
+ID_COLUMNS = ['Run', 'Algorithm', 'Generation']
+MAXIMIZED_METRICS = {'Hypervolume', 'Pareto Solutions'}  # Every other metric is better when lower
+CORRECTIONS = ('holm', 'bonferroni', 'fdr_bh', None)
+DEFAULT_RESAMPLES = 10_000
+
+
+# 🛠️ Function to load a metrics table for comparison
+def load_metrics(source, generation=None):
+    """
+    Reads performance_results.csv (or takes a DataFrame). A per-generation table is reduced
+    to one row per run & algorithm: the given `generation`, or the last one of every run.
+    """
+    df = pd.read_csv(source) if isinstance(source, str) else source.copy()
+    if 'Generation' in df.columns:
+        if generation is None:
+            df = df.loc[df.groupby(['Run', 'Algorithm'], sort=False)['Generation'].idxmax()]
+        else:
+            df = df[df['Generation'] == generation]
+        df = df.drop(columns='Generation')
+    return df.reset_index(drop=True)
+
+def metric_columns(df):
+    """Returns the numeric metric columns of a metrics table."""
+    return [column for column in df.columns if column not in ID_COLUMNS and pd.api.types.is_numeric_dtype(df[column])]
+
+# 🛠️ Function to adjust p-values for multiple comparisons
+def adjust_pvalues(p_values, method='holm'):
+    """Holm, Bonferroni or Benjamini-Hochberg (fdr_bh) adjusted p-values; NaNs are left out of the family."""
+    p = np.asarray(p_values, dtype=float)
+    if method not in CORRECTIONS:
+        raise ValueError(f"Unknown correction '{method}', expected one of {CORRECTIONS}")
+    adjusted = p.copy()
+    valid = np.flatnonzero(~np.isnan(p))
+    m = len(valid)
+    if method is None or m == 0:
+        return adjusted
+    if method == 'bonferroni':
+        adjusted[valid] = np.minimum(p[valid] * m, 1.0)
+        return adjusted
+    order = valid[np.argsort(p[valid], kind='stable')]
+    if method == 'holm':
+        steps = np.maximum.accumulate(p[order] * (m - np.arange(m)))
+    else:
+        steps = np.minimum.accumulate((p[order] * m / np.arange(1, m + 1))[::-1])[::-1]
+    adjusted[order] = np.minimum(steps, 1.0)
+    return adjusted
+
+# 🛠️ Function to draw bootstrap resamples as counts
+def bootstrap_counts(n, n_resamples, rng):
+    """Returns an (n_resamples, n) matrix: how often each of the n observations is drawn in each resample."""
+    draws = rng.integers(0, n, size=(n_resamples, n)) + np.arange(n_resamples)[:, None] * n
+    return np.bincount(draws.ravel(), minlength=n_resamples * n).reshape(n_resamples, n)
+
+# 🛠️ Function to compute bootstrap means of every column at once
+def bootstrap_means(values, counts):
+    """
+    Means of the (n, metrics) `values` under every resample of `counts` (one matrix product).
+    Non-finite values are left out of each resample's mean.
+    """
+    finite = np.isfinite(values)
+    totals = counts @ np.where(finite, values, 0.0)
+    sizes = counts @ finite.astype(float)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return totals / sizes
+
+def _interval(samples, confidence):
+    tail = (1 - confidence) / 2 * 100
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)  # All-NaN columns give NaN bounds
+        return np.nanpercentile(samples, [tail, 100 - tail], axis=0)
+
+# 🛠️ Function to compute the Vargha-Delaney A12 effect size
+def a12(a, b):
+    """P(a > b) + 0.5 P(a == b) per column of the (na, metrics) and (nb, metrics) arrays."""
+    greater = (a[:, None, :] > b[None, :, :]).mean(axis=(0, 1))
+    equal = (a[:, None, :] == b[None, :, :]).mean(axis=(0, 1))
+    return greater + 0.5 * equal
+
+# 🛠️ Function to compare every algorithm pair on every metric
+def compare_algorithms(df, metrics=None, n_resamples=DEFAULT_RESAMPLES, confidence=0.95, correction='holm',
+                       paired=None, seed=0):
+    """
+    Compares the algorithms of a metrics table (one row per run & algorithm).
+    Returns (summary, pairwise):
+      summary  - one row per algorithm & metric: Runs, Mean, Median, bootstrap CI of the mean,
+                 Mean Rank (1 = best) and the omnibus rank test of the metric;
+      pairwise - one row per metric & algorithm pair: the Wilcoxon (paired) or Mann-Whitney
+                 test with corrected p-values, A12 (probability that A is better), and the
+                 mean difference A - B with its bootstrap CI.
+    `paired` defaults to True when every algorithm has exactly the same runs; paired
+    resamples then draw runs jointly for all algorithms.
+    """
+    from scipy import stats  # SciPy is only loaded when a comparison actually runs
+
+    metrics = metric_columns(df) if metrics is None else list(metrics)
+    algorithms = list(pd.unique(df['Algorithm']))
+    runs = {algorithm: df.loc[df['Algorithm'] == algorithm, 'Run'].tolist() for algorithm in algorithms}
+    if paired is None:
+        paired = all(sorted(runs[algorithm]) == sorted(runs[algorithms[0]]) for algorithm in algorithms) and \
+                 all(len(set(r)) == len(r) for r in runs.values())
+    if paired:
+        table = df.pivot(index='Run', columns='Algorithm', values=metrics)
+        values = {algorithm: table.xs(algorithm, axis=1, level='Algorithm')[metrics].values.astype(float) for algorithm in algorithms}
+    else:
+        values = {algorithm: df.loc[df['Algorithm'] == algorithm, metrics].values.astype(float) for algorithm in algorithms}
+    better_high = np.array([metric in MAXIMIZED_METRICS for metric in metrics])
+
+    # **Bootstrap means: one count matrix per algorithm, or one shared matrix for paired runs**
+    rng = np.random.default_rng(seed)
+    shared = bootstrap_counts(len(next(iter(values.values()))), n_resamples, rng) if paired else None
+    boot = {algorithm: bootstrap_means(data, shared if paired else bootstrap_counts(len(data), n_resamples, rng))
+            for algorithm, data in values.items()}
+
+    # **Ranks: within every run when paired, over all pooled values otherwise**
+    oriented = {algorithm: np.where(better_high, -data, data) for algorithm, data in values.items()}
+    if paired:
+        stacked = np.stack([oriented[algorithm] for algorithm in algorithms], axis=1)  # (runs, algorithms, metrics)
+        ranks = stats.rankdata(stacked, axis=1, nan_policy='omit')
+        mean_ranks = {algorithm: np.nanmean(ranks[:, i], axis=0) for i, algorithm in enumerate(algorithms)}
+    else:
+        pooled = np.vstack([oriented[algorithm] for algorithm in algorithms])
+        ranks = stats.rankdata(pooled, axis=0, nan_policy='omit')
+        bounds = np.cumsum([0] + [len(oriented[algorithm]) for algorithm in algorithms])
+        mean_ranks = {algorithm: np.nanmean(ranks[bounds[i]:bounds[i + 1]], axis=0) for i, algorithm in enumerate(algorithms)}
+
+    omnibus_name, omnibus_p = None, np.full(len(metrics), np.nan)
+    if len(algorithms) >= 3:
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)
+            if paired:
+                omnibus_name = 'Friedman'
+                omnibus_p = np.array([stats.friedmanchisquare(*[values[a][:, m] for a in algorithms]).pvalue
+                                      for m in range(len(metrics))])
+            else:
+                omnibus_name = 'Kruskal-Wallis'
+                omnibus_p = np.array([stats.kruskal(*[values[a][:, m] for a in algorithms], nan_policy='omit').pvalue
+                                      for m in range(len(metrics))])
+
+    summary_rows = []
+    for algorithm in algorithms:
+        low, high = _interval(boot[algorithm], confidence)
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)
+            data = np.where(np.isfinite(values[algorithm]), values[algorithm], np.nan)
+            means, medians = np.nanmean(data, axis=0), np.nanmedian(data, axis=0)
+        for m, metric in enumerate(metrics):
+            summary_rows.append({'Algorithm': algorithm, 'Metric': metric, 'Runs': int(np.isfinite(data[:, m]).sum()),
+                                 'Mean': means[m], 'Median': medians[m], 'CI Low': low[m], 'CI High': high[m],
+                                 'Mean Rank': mean_ranks[algorithm][m], 'Omnibus Test': omnibus_name,
+                                 'Omnibus p-value': omnibus_p[m]})
+
+    # **Pairwise tests, effect sizes and difference intervals, vectorized over metrics**
+    pair_rows = []
+    for a, b in combinations(algorithms, 2):
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)
+            if paired:
+                test = 'Wilcoxon'
+                result = stats.wilcoxon(values[a], values[b], axis=0, nan_policy='omit')
+            else:
+                test = 'Mann-Whitney U'
+                result = stats.mannwhitneyu(values[a], values[b], axis=0, nan_policy='omit')
+        better = np.where(better_high, a12(values[a], values[b]), a12(-values[a], -values[b]))
+        low, high = _interval(boot[a] - boot[b], confidence)
+        difference = np.nanmean(boot[a] - boot[b], axis=0)
+        for m, metric in enumerate(metrics):
+            pair_rows.append({'Metric': metric, 'Algorithm A': a, 'Algorithm B': b, 'Test': test,
+                              'Statistic': float(np.atleast_1d(result.statistic)[m]),
+                              'p-value': float(np.atleast_1d(result.pvalue)[m]),
+                              'A12': better[m], 'Mean Difference': difference[m], 'Diff CI Low': low[m], 'Diff CI High': high[m]})
+
+    summary = pd.DataFrame(summary_rows)
+    pairwise = pd.DataFrame(pair_rows)
+    if len(pairwise):
+        pairwise['p-adjusted'] = pairwise.groupby('Metric', sort=False)['p-value'].transform(
+            lambda p: adjust_pvalues(p.values, correction))
+        pairwise['Significant'] = pairwise['p-adjusted'] < 1 - confidence
+    return summary, pairwise
+
+
+# **Main Execution**
+if __name__ == "__main__":
+    metrics_df = load_metrics("performance_results.csv")
+    summary_df, pairwise_df = compare_algorithms(metrics_df)
+    pd.set_option('display.width', 200)
+    print("\n📊 **Per-Algorithm Summary:**")
+    print(summary_df)
+    print("\n📊 **Pairwise Comparisons:**")
+    print(pairwise_df)
@@ -0,0 +1,415 @@
+import argparse
+import os
+import sys
+
+# Single command-line entry point for the analysis tools:
+#   python SuperMarketCLI.py analyze <run tree> [--workers N] [--cache] [--incremental]
+#                                   [--trace stages.jsonl] [--profile-summary] [--profile-dir prof/]
+#                                   [--objectives WalkingTime ExposureTime ColdDecay] [--reference-point ColdDecay=5000]
+#   python SuperMarketCLI.py merge <run tree> [-o merged_raw_data.csv.gz] [--format csv-partitioned]
+#                                 [--algorithms NSGA2Algorithm] [--last-generations 10] [--pareto-only]
+#   python SuperMarketCLI.py index <run tree> [--output-dir .] [--analyze]
+#   python SuperMarketCLI.py query pareto_index/ [--build <run tree>] [--budget 80 90] [--knee] [--nearest]
+#   python SuperMarketCLI.py plot-route "<route>" <pattern> [--output route.png]
+#   python SuperMarketCLI.py decay "<route>" <pattern> [--output decay.png]
+#   python SuperMarketCLI.py render all_final_pareto.csv <run tree> [--output-dir route_thumbnails]
+#   python SuperMarketCLI.py animate <raw data CSV> <population.mp4 | .gif | frame directory>
+#   python SuperMarketCLI.py heatmap <run tree> [--pareto all_final_pareto.csv] [--by Algorithm Generation] [--plot-dir heatmaps/]
+#   python SuperMarketCLI.py compare performance_results.csv [--resamples 10000] [--plot-dir charts/]
+#   python SuperMarketCLI.py polish all_final_pareto.csv <run tree> [-o polished_pareto.csv] [--report polish_report.json]
+#   python SuperMarketCLI.py serve [--layout market_layout.json] [--port 8765] [--cache-size 100000]
+# Only argparse is imported up front; each subcommand imports what it needs when it runs,
+# so `analyze` and `merge` never load matplotlib.
+
+
+# 🛠️ Function to select a non-interactive backend before pyplot is imported
+def use_file_backend(output_file):
+    if output_file:
+        import matplotlib
+        matplotlib.use('Agg')
+
+# 🛠️ Function to parse an OBJECTIVE=VALUE reference point entry
+def parse_reference_value(text):
+    objective, separator, value = text.partition('=')
+    if not separator:
+        raise argparse.ArgumentTypeError(f"Expected OBJECTIVE=VALUE, got '{text}'")
+    return objective, float(value)
+
+# 🛠️ Subcommand: compute performance metrics of a run tree
+def run_analyze(args):
+    import Analyzer
+    import Instrumentation
+
+    sinks = []
+    if args.trace:
+        sinks.append(Instrumentation.JsonLinesSink(args.trace))
+    if args.profile_dir:
+        sinks.append(Instrumentation.CProfileSink(args.profile_dir, args.profile_stages))
+    if args.profile_summary:
+        sinks.append(Instrumentation.SummarySink())
+
+    objectives = args.objectives or Analyzer.OBJECTIVES
+    reference_point = dict(parse_reference_value(value) for value in args.reference_point or [])
+    with Instrumentation.instrumented(*sinks):
+        if args.incremental:
+            performance_df, pareto_df, all_final_pareto_df = Analyzer.analyze_runs_incremental(
+                args.root_dir, args.state_file, workers=args.workers, use_cache=args.cache,
+                objectives=objectives, reference_point=reference_point or None)
+        else:
+            performance_df, pareto_df, all_final_pareto_df = Analyzer.analyze_runs(
+                args.root_dir, workers=args.workers, use_cache=args.cache,
+                objectives=objectives, reference_point=reference_point or None)
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    performance_df.to_csv(os.path.join(args.output_dir, "performance_results.csv"), index=False)
+    pareto_df.to_csv(os.path.join(args.output_dir, "pareto_results.csv"), index=False)
+    all_final_pareto_df.to_csv(os.path.join(args.output_dir, "all_final_pareto.csv"), index=False)
+
+    print("\n📊 **Performance Metrics Table:**")
+    print(performance_df)
+
+# 🛠️ Subcommand: stream the raw data of a run tree into one CSV or a partitioned directory
+def run_merge(args):
+    import pandas as pd
+    import CSV_Combiner
+
+    summary = CSV_Combiner.merge_all_runs(args.root_dir, args.output, workers=args.workers, use_cache=args.cache,
+                                          chunksize=args.chunksize, output_format=args.format,
+                                          compression=args.compression, algorithms=args.algorithms,
+                                          last_generations=args.last_generations, pareto_only=args.pareto_only)
+    if args.format == 'csv':
+        print("\n📊 **Merged Data Sample:**")
+        print(pd.read_csv(args.output, nrows=5, compression=summary['Compression']))
+
+# 🛠️ Subcommand: index the unique solutions of a run tree and their survival
+def run_index(args):
+    import Analyzer
+    import SolutionIndex
+
+    objectives = args.objectives or Analyzer.OBJECTIVES
+    solutions, occurrences = SolutionIndex.build_solution_index(args.root_dir, workers=args.workers, use_cache=args.cache,
+                                                                objectives=objectives)
+    survival = SolutionIndex.survival_statistics(solutions, occurrences, objectives)
+    os.makedirs(args.output_dir, exist_ok=True)
+    solutions.to_csv(os.path.join(args.output_dir, "solution_index.csv"), index=False)
+    occurrences.to_csv(os.path.join(args.output_dir, "solution_occurrences.csv"), index=False)
+    survival.to_csv(os.path.join(args.output_dir, "survival_statistics.csv"), index=False)
+    if args.analyze:
+        for name, table in zip(["performance_results.csv", "pareto_results.csv", "all_final_pareto.csv"],
+                               SolutionIndex.analyze_index(solutions, occurrences, objectives, workers=args.workers)):
+            table.to_csv(os.path.join(args.output_dir, name), index=False)
+
+    print("\n📊 **Elite Solution Survival:**")
+    print(survival)
+
+# 🛠️ Subcommand: answer budget, knee and nearest-to-ideal queries from a Pareto index
+def run_query(args):
+    import pandas as pd
+    import Analyzer
+    import ParetoIndex
+
+    if args.build:
+        index = ParetoIndex.build_pareto_index(args.build, args.objectives or Analyzer.OBJECTIVES, args.workers, args.cache)
+        index.save(args.index_dir)
+        print(f"✅ Pareto index saved to {args.index_dir}")
+    else:
+        index = ParetoIndex.ParetoIndex.load(args.index_dir)
+    print("\n📊 **Fronts:**")
+    print(index.summary().to_string(index=False))
+
+    budgets = list(args.budget or [])
+    if args.budget_file:
+        budgets += pd.read_csv(args.budget_file).iloc[:, 0].tolist()
+    if budgets:
+        answers = index.budget_batch(budgets, args.constraint, args.target, args.front)
+        if args.output:
+            answers.to_csv(args.output, index=False)
+            print(f"✅ {len(answers)} budget answers saved to {args.output}")
+        else:
+            print("\n🔍 **Budget Queries:**")
+            print(answers.to_string(index=False))
+    if args.knee:
+        print(f"\n🔍 Knee: {index.knee(args.front)}")
+    if args.nearest:
+        print(f"\n🔍 Nearest to ideal: {index.nearest(front=args.front)}")
+
+# 🛠️ Subcommand: draw a route on the layout
+def run_plot_route(args):
+    use_file_backend(args.output)
+    import SuperMarketPlotter
+
+    grid = SuperMarketPlotter.convert_layout_to_grid(SuperMarketPlotter.load_market_layout(args.layout))
+    SuperMarketPlotter.plot_walking_pattern(grid, args.route, args.pattern, output_file=args.output)
+    if args.output:
+        print(f"✅ Route plot saved to {args.output}")
+
+# 🛠️ Subcommand: plot the cold-food decay of a route
+def run_decay(args):
+    use_file_backend(args.output)
+    import SuperMarketPlotter_v2
+
+    grid = SuperMarketPlotter_v2.convert_layout_to_grid(SuperMarketPlotter_v2.load_market_layout(args.layout))
+    positions = SuperMarketPlotter_v2.find_positions(grid)
+    path_coords, time_steps, collected_items, collected_cold_items, foul_passes, decay_over_time = \
+        SuperMarketPlotter_v2.generate_walking_path(positions, args.route, args.pattern,
+                                                    SuperMarketPlotter_v2.COLD_AISLES, layout_grid=grid)
+    print(f"🚶 Steps: {len(time_steps)}, foul passes: {len(foul_passes)}, accumulated decay: {decay_over_time[-1][1]}")
+    SuperMarketPlotter_v2.plot_movement(time_steps, list(range(len(time_steps))), [d[1] for d in decay_over_time],
+                                        collected_items, collected_cold_items, foul_passes, output_file=args.output)
+    if args.output:
+        print(f"✅ Decay plot saved to {args.output}")
+
+# 🛠️ Subcommand: render the route of every Pareto solution to image files
+def run_render(args):
+    import RouteRenderer
+
+    layout_file = args.layout or os.path.join(args.root_dir, "market_layout.json")
+    files = RouteRenderer.render_pareto_routes(args.pareto_file, args.root_dir, layout_file, args.output_dir,
+                                               fmt=args.format, workers=args.workers,
+                                               figsize=(args.size, args.size), dpi=args.dpi)
+    print(f"✅ Rendered {len(files)} route plots to {args.output_dir}")
+
+# 🛠️ Subcommand: animate the population of a raw data file generation by generation
+def run_animate(args):
+    import PopulationAnimator
+
+    frames = PopulationAnimator.animate_population(args.raw_data_file, args.output, fps=args.fps, step=args.step,
+                                                   use_cache=args.cache)
+    print(f"✅ Wrote {frames} frames to {args.output}")
+
+# 🛠️ Subcommand: compare algorithms statistically over their runs
+def run_compare(args):
+    import pandas as pd
+    import StatisticalComparison
+
+    df = StatisticalComparison.load_metrics(args.metrics_file, args.generation)
+    summary, pairwise = StatisticalComparison.compare_algorithms(
+        df, args.metrics, n_resamples=args.resamples, confidence=args.confidence,
+        correction=None if args.correction == 'none' else args.correction, seed=args.seed)
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    summary.to_csv(os.path.join(args.output_dir, "comparison_summary.csv"), index=False)
+    pairwise.to_csv(os.path.join(args.output_dir, "comparison_pairwise.csv"), index=False)
+    with pd.option_context('display.width', 200, 'display.max_columns', 20):
+        print("\n📊 **Per-Algorithm Summary:**")
+        print(summary[['Algorithm', 'Metric', 'Mean', 'CI Low', 'CI High', 'Mean Rank']])
+        print("\n📊 **Pairwise Comparisons:**")
+        print(pairwise[['Metric', 'Algorithm A', 'Algorithm B', 'Test', 'p-adjusted', 'Significant', 'A12']])
+
+    if args.plot_dir:
+        use_file_backend(args.plot_dir)
+        import plotter_t1
+
+        plotter_t1.plot_comparison(summary, summary['Metric'].unique(), output_dir=args.plot_dir)
+        print(f"✅ Bar charts saved to {args.plot_dir}")
+
+# 🛠️ Subcommand: aggregate store traffic over populations or Pareto sets
+def run_heatmap(args):
+    import json
+    import pandas as pd
+    import TrafficHeatmap
+
+    layout_file = args.layout or os.path.join(args.root_dir, "market_layout.json")
+    with open(layout_file, 'r') as file:
+        layout = json.load(file)
+    if args.pareto:
+        from RouteRenderer import attach_routes
+
+        heatmap = TrafficHeatmap.TrafficHeatmap(layout, args.by or ['Algorithm'], args.zigzag)
+        heatmap.add_frame(attach_routes(pd.read_csv(args.pareto), args.root_dir))
+    else:
+        heatmap = TrafficHeatmap.heatmaps_from_runs(args.root_dir, layout, args.by or TrafficHeatmap.DEFAULT_GROUPS,
+                                                    use_cache=args.cache, zigzag=args.zigzag)
+    heatmap.to_frame().to_csv(args.output, index=False)
+    print(f"✅ Traffic of {heatmap.routes.sum():,} routes in {len(heatmap.keys)} groups saved to {args.output}")
+
+    if args.plot_dir:
+        use_file_backend(args.plot_dir)
+        os.makedirs(args.plot_dir, exist_ok=True)
+        for layer, foul_only, title in [('visits', False, "Traffic"), ('cold', False, "Cold Load Traffic"),
+                                        ('visits', True, "Foul Exposure")]:
+            keys, grids = heatmap.grids(layer, foul_only)
+            for key, grid in zip(keys, grids):
+                name = '_'.join(str(part) for part in (key if isinstance(key, tuple) else (key,)))
+                TrafficHeatmap.plot_heatmap(grid, heatmap.index.layout, f"{title} - {name}",
+                                            os.path.join(args.plot_dir, f"{title.lower().replace(' ', '_')}_{name}.png"))
+        print(f"✅ Heatmaps saved to {args.plot_dir}")
+
+# 🛠️ Subcommand: polish the Pareto routes with batched local search
+def run_polish(args):
+    import json
+    import pandas as pd
+    import LocalSearch
+    from RouteRenderer import attach_routes
+
+    layout_file = args.layout or os.path.join(args.root_dir, "market_layout.json")
+    with open(layout_file, 'r') as file:
+        layout = json.load(file)
+    solutions = attach_routes(pd.read_csv(args.pareto_file), args.root_dir)
+    polished_df, report = LocalSearch.polish_pareto_front(solutions, layout, moves=tuple(args.moves),
+                                                          max_iterations=args.iterations)
+    polished_df.to_csv(args.output, index=False)
+    with open(args.report, 'w') as file:
+        json.dump(report, file, indent=2)
+
+    print("\n📊 **Local Search Report:**")
+    for key, value in report.items():
+        print(f"{key}: {value}")
+    print(f"✅ Polished front saved to {args.output}, report to {args.report}")
+
+# 🛠️ Subcommand: serve route evaluations over local HTTP/JSON
+def run_serve(args):
+    from RouteService import run_service
+
+    run_service(args.layout, args.host, args.port, args.cache_size, args.zigzag, args.model)
+
+# 🛠️ Function to build the argument parser
+def build_parser():
+    parser = argparse.ArgumentParser(prog="SuperMarketCLI", description="Supermarket navigation analysis tools")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    analyze = subparsers.add_parser("analyze", help="Compute HV/IGD/Spread and Pareto fronts of a run tree")
+    analyze.add_argument("root_dir", help="Run folder containing Run1, Run2, ...")
+    analyze.add_argument("--output-dir", default=".", help="Where the result CSVs are written")
+    analyze.add_argument("--workers", type=int, default=1, help="Worker processes (0 = all cores)")
+    analyze.add_argument("--cache", action="store_true", help="Read raw data through the columnar run cache")
+    analyze.add_argument("--incremental", action="store_true", help="Only re-read raw data files that changed")
+    analyze.add_argument("--state-file", default="analysis_state.json", help="State file used with --incremental")
+    analyze.add_argument("--objectives", nargs="+", help="Objective columns (default: WalkingTime ExposureTime; "
+                                                         "ColdDecay is derived from the routes)")
+    analyze.add_argument("--reference-point", nargs="+", metavar="OBJECTIVE=VALUE",
+                         help="Fix the HV reference point of these objectives (default: observed maximum)")
+    analyze.add_argument("--trace", help="Write one JSON record per pipeline stage to this file")
+    analyze.add_argument("--profile-summary", action="store_true", help="Print a per-stage time/rows/memory table")
+    analyze.add_argument("--profile-dir", help="Write a cProfile .prof file per stage into this directory")
+    analyze.add_argument("--profile-stages", nargs="+", help="Only cProfile these stages (e.g. read_fronts metrics)")
+    analyze.set_defaults(handler=run_analyze)
+
+    merge = subparsers.add_parser("merge", help="Stream all raw data files of a run tree into one CSV")
+    merge.add_argument("root_dir", help="Run folder containing Run1, Run2, ...")
+    merge.add_argument("-o", "--output", default="merged_raw_data.csv",
+                       help="Merged CSV file (.gz/.bz2/.xz compresses it), or directory for partitioned formats")
+    merge.add_argument("--format", choices=["csv", "csv-partitioned", "parquet"], default="csv",
+                       help="One CSV, or Run=/Algorithm= partitions of CSV or Parquet parts")
+    merge.add_argument("--compression", default="infer", help="gzip, bz2 or xz (Parquet: snappy, gzip, zstd, ...)")
+    merge.add_argument("--algorithms", nargs="+", help="Only merge these algorithm folders")
+    merge.add_argument("--last-generations", type=int, help="Only keep the last N generations of every file")
+    merge.add_argument("--pareto-only", action="store_true", help="Only keep every file's Pareto-optimal rows")
+    merge.add_argument("--chunksize", type=int, default=100_000, help="Rows read and written at a time")
+    merge.add_argument("--workers", type=int, default=1, help="Worker processes (0 = all cores)")
+    merge.add_argument("--cache", action="store_true", help="Read raw data through the columnar run cache")
+    merge.set_defaults(handler=run_merge)
+
+    index = subparsers.add_parser("index", help="Deduplicate the solutions of a run tree and measure their survival")
+    index.add_argument("root_dir", help="Run folder containing Run1, Run2, ...")
+    index.add_argument("--output-dir", default=".", help="Where solution_index.csv, solution_occurrences.csv "
+                                                         "and survival_statistics.csv are written")
+    index.add_argument("--analyze", action="store_true", help="Also write the analyze result CSVs, computed from the index")
+    index.add_argument("--objectives", nargs="+", help="Objective columns (default: WalkingTime ExposureTime)")
+    index.add_argument("--workers", type=int, default=1, help="Worker processes (0 = all cores)")
+    index.add_argument("--cache", action="store_true", help="Read raw data through the columnar run cache")
+    index.set_defaults(handler=run_index)
+
+    query = subparsers.add_parser("query", help="Answer budget, knee and nearest-to-ideal queries from a saved Pareto index")
+    query.add_argument("index_dir", help="Pareto index folder")
+    query.add_argument("--build", metavar="ROOT_DIR", help="Build the index from this run tree and save it first")
+    query.add_argument("--front", help="Front to query: Reference (default) or an algorithm name")
+    query.add_argument("--budget", type=float, nargs="+", help="Lowest --target with --constraint <= each value")
+    query.add_argument("--budget-file", help="CSV whose first column holds more budgets, answered in one batch")
+    query.add_argument("--constraint", help="Budgeted objective (default: the first objective, WalkingTime)")
+    query.add_argument("--target", help="Minimized objective (default: the second objective, ExposureTime)")
+    query.add_argument("--knee", action="store_true", help="Print the knee solution of the front")
+    query.add_argument("--nearest", action="store_true", help="Print the solution nearest to the front's ideal point")
+    query.add_argument("-o", "--output", help="Save the budget answers to this CSV instead of printing them")
+    query.add_argument("--objectives", nargs="+", help="Objective columns indexed with --build (default: WalkingTime ExposureTime)")
+    query.add_argument("--workers", type=int, default=1, help="Worker processes for --build (0 = all cores)")
+    query.add_argument("--cache", action="store_true", help="Read raw data through the columnar run cache with --build")
+    query.set_defaults(handler=run_query)
+
+    for name, handler, help_text in [("plot-route", run_plot_route, "Draw a route on the market layout"),
+                                     ("decay", run_decay, "Plot steps, events and cold-food decay of a route")]:
+        command = subparsers.add_parser(name, help=help_text)
+        command.add_argument("route", help='Aisle order, e.g. "<->A->B->>"')
+        command.add_argument("pattern", choices=["V2H", "H2V", "ZgZg"], help="Walking pattern")
+        command.add_argument("--layout", default="market_layout.json", help="Market layout JSON")
+        command.add_argument("--output", help="Save the figure to this file instead of showing it")
+        command.set_defaults(handler=handler)
+
+    render = subparsers.add_parser("render", help="Render the route of every Pareto solution to PNG/SVG files")
+    render.add_argument("pareto_file", help="all_final_pareto.csv written by analyze")
+    render.add_argument("root_dir", help="Run folder the Pareto solutions came from")
+    render.add_argument("--layout", help="Market layout JSON (default: <root_dir>/market_layout.json)")
+    render.add_argument("--output-dir", default="route_thumbnails", help="Where the images are written")
+    render.add_argument("--format", choices=["png", "svg"], default="png")
+    render.add_argument("--size", type=float, default=4, help="Figure size in inches")
+    render.add_argument("--dpi", type=int, default=100)
+    render.add_argument("--workers", type=int, default=0, help="Worker processes (0 = all cores)")
+    render.set_defaults(handler=run_render)
+
+    animate = subparsers.add_parser("animate", help="Animate the population spread of a raw data CSV")
+    animate.add_argument("raw_data_file", help="<Algorithm>_raw_data.csv of one run")
+    animate.add_argument("output", help="MP4 or GIF file, or a directory for a PNG frame stack")
+    animate.add_argument("--fps", type=int, default=10)
+    animate.add_argument("--step", type=int, default=1, help="Animate every n-th generation")
+    animate.add_argument("--cache", action="store_true", help="Read raw data through the columnar run cache")
+    animate.set_defaults(handler=run_animate)
+
+    compare = subparsers.add_parser("compare", help="Bootstrap CIs, rank tests and effect sizes for every algorithm pair")
+    compare.add_argument("metrics_file", help="performance_results.csv, or a per-generation metrics CSV")
+    compare.add_argument("--metrics", nargs="+", help="Metric columns to compare (default: all)")
+    compare.add_argument("--generation", type=int, help="Generation to compare in a per-generation table (default: last)")
+    compare.add_argument("--resamples", type=int, default=10_000, help="Bootstrap resamples")
+    compare.add_argument("--confidence", type=float, default=0.95)
+    compare.add_argument("--correction", choices=["holm", "bonferroni", "fdr_bh", "none"], default="holm")
+    compare.add_argument("--seed", type=int, default=0)
+    compare.add_argument("--output-dir", default=".", help="Where comparison_summary.csv and comparison_pairwise.csv go")
+    compare.add_argument("--plot-dir", help="Save one bar chart per metric into this directory")
+    compare.set_defaults(handler=run_compare)
+
+    heatmap = subparsers.add_parser("heatmap", help="Aggregate aisle traffic and foul exposure over populations or Pareto sets")
+    heatmap.add_argument("root_dir", help="Run folder containing Run1, Run2, ...")
+    heatmap.add_argument("--pareto", help="Aggregate this Pareto table (e.g. all_final_pareto.csv) instead of the populations")
+    heatmap.add_argument("--by", nargs="+", help="Group columns (default: Algorithm Generation; Algorithm with --pareto)")
+    heatmap.add_argument("--layout", help="Market layout JSON (default: <root_dir>/market_layout.json)")
+    heatmap.add_argument("--zigzag", choices=["parity", "balance"], default="parity",
+                         help="ZgZg stepping rule: the plotters' (parity) or the optimizer's (balance)")
+    heatmap.add_argument("-o", "--output", default="traffic_heatmaps.csv", help="Per-group, per-cell counts")
+    heatmap.add_argument("--plot-dir", help="Save traffic, cold-load and foul-exposure heatmaps of every group here")
+    heatmap.add_argument("--cache", action="store_true", help="Read raw data through the columnar run cache")
+    heatmap.set_defaults(handler=run_heatmap)
+
+    polish = subparsers.add_parser("polish", help="Improve the Pareto routes with 2-opt, or-opt and pattern-flip local search")
+    polish.add_argument("pareto_file", help="all_final_pareto.csv written by analyze")
+    polish.add_argument("root_dir", help="Run folder the Pareto solutions came from")
+    polish.add_argument("--layout", help="Market layout JSON (default: <root_dir>/market_layout.json)")
+    polish.add_argument("-o", "--output", default="polished_pareto.csv", help="Improved front CSV")
+    polish.add_argument("--report", default="polish_report.json", help="Before/after hypervolume report")
+    polish.add_argument("--moves", nargs="+", choices=["2opt", "oropt", "pattern"], default=["2opt", "oropt", "pattern"])
+    polish.add_argument("--iterations", type=int, default=100, help="Maximum local search iterations")
+    polish.set_defaults(handler=run_polish)
+
+    serve = subparsers.add_parser("serve", help="Evaluate submitted routes over HTTP/JSON with warm layouts and a result cache")
+    serve.add_argument("--layout", nargs="+", default=["market_layout.json"],
+                       help="Market layout JSONs kept warm (the first is the default layout)")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8765)
+    serve.add_argument("--cache-size", type=int, default=100_000, help="Route results kept in the LRU cache")
+    serve.add_argument("--zigzag", choices=["parity", "balance"], default="parity",
+                       help="ZgZg stepping rule: the plotters' (parity) or the optimizer's (balance)")
+    serve.add_argument("--model", choices=["decay", "optimizer"], default="decay",
+                       help="Exposure model: SuperMarketPlotter_v2's cold decay or the optimizer's")
+    serve.set_defaults(handler=run_serve)
+    return parser
+
+# 🛠️ Function to run the CLI
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if getattr(args, "workers", 1) == 0:
+        args.workers = None  # parallel_map uses all cores for None
+    args.handler(args)
+    return 0
+
+
+# **Main Execution**
+if __name__ == "__main__":
+    sys.exit(main())
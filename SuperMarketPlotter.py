@@ -2,6 +2,12 @@ import json
 import matplotlib.pyplot as plt
 import numpy as np
 import matplotlib.patches as mpatches
+from RouteCodec import route_symbols, pattern_name
+from MarketLayout import MarketLayout, as_market_layout
+from RouteEvaluator import COLD_AISLES
+
+GRID_LINE_LIMIT = 50  # Layouts wider or taller than this are drawn without cell grid lines
+LABEL_LIMIT = 100  # Layouts with more aisles only label the aisles of the plotted route
 
 def load_market_layout(file_path):
     """Loads the supermarket layout from a JSON file."""
@@ -10,24 +16,29 @@ def load_market_layout(file_path):
     return layout
 
 def convert_layout_to_grid(layout):
-    """Converts the layout JSON into a 2D grid."""
+    """
+    Converts the layout JSON into a 2D grid. Sparse layouts (see MarketLayout) are returned as a
+    MarketLayout, which indexes like the grid without allocating rows x cols labels.
+    """
+    if 'IsleMatrix' not in layout:
+        return MarketLayout.from_dict(layout)
     rows, cols = layout['Rows'], layout['Cols']
     isle_matrix = layout['IsleMatrix']
     grid = np.array(isle_matrix).reshape(rows, cols)
     return grid
 
 def find_positions(grid):
-    """Finds positions of all aisles in the grid."""
-    positions = {}
-    for r in range(grid.shape[0]):
-        for c in range(grid.shape[1]):
-            if grid[r, c] not in ['x', '0']:  # Exclude walls and empty spaces
-                positions[grid[r, c]] = (r, c)
-    return positions
+    """Finds positions of all aisles (their access cells) in a grid or MarketLayout."""
+    return as_market_layout(grid).positions
 
-def generate_walking_path(positions, route, walking_pattern):
-    """Generates a step-by-step path following H2V, V2H, or ZgZg pattern."""
-    path = route.split('->')
+def generate_walking_path(positions, route, walking_pattern, codec=None):
+    """
+    Generates a step-by-step path following H2V, V2H, or ZgZg pattern.
+    The route may be an "A->B->C" string, a list of aisles or a RouteCodec code row (pass its codec);
+    the walking pattern may be a name or a RouteCodec pattern code.
+    """
+    path = route_symbols(route, codec)
+    walking_pattern = pattern_name(walking_pattern)
     path_coords = []
     visit_counts = {}
     
@@ -72,31 +83,42 @@ def generate_walking_path(positions, route, walking_pattern):
     
     return path_coords, visit_counts
 
-def plot_walking_pattern(grid, route, walking_pattern):
-    """Plots the walking path on the supermarket layout with different aisle types."""
-    positions = find_positions(grid)
-    cold_aisles = {'L', 'M', 'Q', 'T', 'U', 'W', 'X', 'Y'}
+def plot_walking_pattern(grid, route, walking_pattern, codec=None, output_file=None):
+    """
+    Plots the walking path on the supermarket layout (a grid or MarketLayout) with different aisle types.
+    Large layouts skip the cell grid lines and only label the aisles of the route.
+    Shows the figure, or saves it to `output_file` when one is given.
+    """
+    layout = as_market_layout(grid)
+    positions = layout.positions
+    walking_pattern = pattern_name(walking_pattern)
     entrance_exit = {'<': 'green', '>': 'red'}
+    rows, cols = layout.shape
     
     fig, ax = plt.subplots(figsize=(8, 8))
-    ax.set_xticks(range(grid.shape[1]))
-    ax.set_yticks(range(grid.shape[0]))
+    if max(rows, cols) <= GRID_LINE_LIMIT:
+        ax.set_xticks(range(cols))
+        ax.set_yticks(range(rows))
+        ax.grid(True, linestyle='--', linewidth=0.5)
+    else:
+        ax.set_xticks([])
+        ax.set_yticks([])
     ax.set_xticklabels([])
     ax.set_yticklabels([])
-    ax.grid(True, linestyle='--', linewidth=0.5)
     
-    # Draw walls
-    for r in range(grid.shape[0]):
-        for c in range(grid.shape[1]):
-            if grid[r, c] == 'x':
-                ax.add_patch(plt.Rectangle((c, r), 1, 1, color='black'))
+    # Draw walls as a single image rather than one Rectangle per cell
+    walls = np.zeros((rows, cols, 4), dtype=np.uint8)
+    walls[layout.foul_mask()] = (0, 0, 0, 255)
+    ax.imshow(walls, extent=(0, cols, 0, rows), origin='lower', aspect='auto', interpolation='nearest', zorder=0)
     
     # Generate and plot walking path
-    path_coords, visit_counts = generate_walking_path(positions, route, walking_pattern)
+    path_coords, visit_counts = generate_walking_path(positions, route, walking_pattern, codec)
     
-    # Plot aisles and entrance/exit
+    # Plot aisles and entrance/exit (only those on the route for layouts with many aisles)
+    if len(positions) > LABEL_LIMIT:
+        positions = {aisle: positions[aisle] for aisle in set(route_symbols(route, codec)) | set(entrance_exit) if aisle in positions}
     for aisle, (r, c) in positions.items():
-        color = 'gray' if aisle not in cold_aisles else 'blue'
+        color = 'gray' if aisle not in COLD_AISLES else 'blue'
         if aisle in entrance_exit:
             color = entrance_exit[aisle]
         ax.text(c + 0.5, r + 0.5, aisle, ha='center', va='center', fontsize=12, color='white', bbox=dict(facecolor=color, edgecolor='black'))
@@ -108,16 +130,23 @@ def plot_walking_pattern(grid, route, walking_pattern):
         linestyle = '-' if visits == 1 else '--'
         ax.arrow(c1 + 0.5, r1 + 0.5, c2 - c1, r2 - r1, head_width=0.2, head_length=0.2, fc='red', ec='red', linestyle=linestyle)
     
-    plt.gca().invert_yaxis()
+    ax.set_xlim(0, cols)
+    ax.set_ylim(rows, 0)
     plt.title(f"Supermarket Walking Path ({walking_pattern})")
-    plt.show()
+    if output_file:
+        fig.savefig(output_file)
+        plt.close(fig)
+    else:
+        plt.show()
 
-# Load the market layout
-layout_file = "market_layout.json"
-layout_data = load_market_layout(layout_file)
-grid = convert_layout_to_grid(layout_data)
+# **Main Execution**
+if __name__ == "__main__":
+    # Load the market layout
+    layout_file = "market_layout.json"
+    layout_data = load_market_layout(layout_file)
+    grid = convert_layout_to_grid(layout_data)
 
-# Example input route with walking pattern
-example_route = "C->L->U->K->F->A->P->E->X->Q->B->R->I->D->V->M->N->J->T->W->H->Y->Z->S->G->O"
-example_pattern = "ZgZg"
-plot_walking_pattern(grid, example_route, example_pattern)
\ No newline at end of file
+    # Example input route with walking pattern
+    example_route = "C->L->U->K->F->A->P->E->X->Q->B->R->I->D->V->M->N->J->T->W->H->Y->Z->S->G->O"
+    example_pattern = "ZgZg"
+    plot_walking_pattern(grid, example_route, example_pattern)
@@ -2,6 +2,9 @@ import json
 import matplotlib.pyplot as plt
 import numpy as np
 import matplotlib.patches as mpatches
+from RouteCodec import route_symbols, pattern_name
+from MarketLayout import MarketLayout, as_market_layout
+from RouteEvaluator import COLD_AISLES
 
 def load_market_layout(file_path):
     """Loads the supermarket layout from a JSON file."""
@@ -10,24 +13,36 @@ def load_market_layout(file_path):
     return layout
 
 def convert_layout_to_grid(layout):
-    """Converts the layout JSON into a 2D grid."""
+    """
+    Converts the layout JSON into a 2D grid. Sparse layouts (see MarketLayout) are returned as a
+    MarketLayout, which indexes like the grid without allocating rows x cols labels.
+    """
+    if 'IsleMatrix' not in layout:
+        return MarketLayout.from_dict(layout)
     rows, cols = layout['Rows'], layout['Cols']
     isle_matrix = layout['IsleMatrix']
     grid = np.array(isle_matrix).reshape(rows, cols)
     return grid
 
 def find_positions(grid):
-    """Finds positions of all aisles in the grid."""
-    positions = {}
-    for r in range(grid.shape[0]):
-        for c in range(grid.shape[1]):
-            if grid[r, c] not in ['0']:  # Exclude empty spaces
-                positions[grid[r, c]] = (r, c)
+    """Finds positions of all aisles (their access cells) in a grid or MarketLayout, plus the last 'x' cell."""
+    layout = as_market_layout(grid)
+    positions = layout.positions
+    if len(layout.foul):
+        last = layout.foul[np.argmax(layout.foul[:, 0] * layout.cols + layout.foul[:, 1])]
+        positions['x'] = (int(last[0]), int(last[1]))
     return positions
 
-def generate_walking_path(positions, route, walking_pattern, cold_aisles):
-    """Generates a step-by-step path following H2V, V2H, or ZgZg pattern with proper decay modeling."""
-    path = route.split('->')
+def generate_walking_path(positions, route, walking_pattern, cold_aisles, layout_grid, codec=None):
+    """
+    Generates a step-by-step path following H2V, V2H, or ZgZg pattern with proper decay modeling.
+    The route may be an "A->B->C" string, a list of aisles or a RouteCodec code row (pass its codec);
+    the walking pattern may be a name or a RouteCodec pattern code.
+    `layout_grid` is the grid (or MarketLayout) that `positions` were found in.
+    """
+    cells = layout_grid
+    path = route_symbols(route, codec)
+    walking_pattern = pattern_name(walking_pattern)
     path_coords = []
     step_numbers = []
     collected_items = []
@@ -76,13 +91,13 @@ def generate_walking_path(positions, route, walking_pattern, cold_aisles):
                         current_pos = (current_pos[0], current_pos[1] + (1 if current_pos[1] < end[1] else -1))
             
             # Update cold items count and decay
-            if grid[current_pos] == path[i+1]:  # Ensure it's the next intended aisle in the route
-                if grid[current_pos] in cold_aisles:
+            if current_pos == end:  # Arrived at the next aisle's access cell (other cells of it are walked past)
+                if path[i+1] in cold_aisles:
                     collected_cold_items.append((step, accumulated_time))
                     current_cold_items += 1  # Increase active decaying items
                 else:
                     collected_items.append((step, accumulated_time))
-            elif grid[current_pos] == 'x':  # Preserve foul aisle logic
+            elif cells[current_pos] == 'x':  # Preserve foul aisle logic
                 foul_passes.append((step, accumulated_time))
                 accumulated_decay += 11 * current_cold_items  # Add foul aisle penalty
             else:
@@ -101,8 +116,11 @@ def generate_walking_path(positions, route, walking_pattern, cold_aisles):
     
     return path_coords, step_numbers, collected_items, collected_cold_items, foul_passes, decay_over_time
 
-def plot_movement(time_steps, accumulated_time, accumulated_decay, collected_items, collected_cold_items, foul_passes):
-    """Plots two movement plots: Accumulated Steps + Event Timeline, and Cold Food Decay."""
+def plot_movement(time_steps, accumulated_time, accumulated_decay, collected_items, collected_cold_items, foul_passes, output_file=None):
+    """
+    Plots two movement plots: Accumulated Steps + Event Timeline, and Cold Food Decay.
+    Shows the figure, or saves it to `output_file` when one is given.
+    """
     fig, axs = plt.subplots(2, 1, figsize=(10, 9))
     
     # Ensure time_steps and accumulated_decay have the same length
@@ -133,23 +151,29 @@ def plot_movement(time_steps, accumulated_time, accumulated_decay, collected_ite
     axs[1].grid(True)
     
     plt.tight_layout()
-    plt.show()
+    if output_file:
+        fig.savefig(output_file)
+        plt.close(fig)
+    else:
+        plt.show()
 
-# Load the market layout
-layout_file = "market_layout.json"
-layout_data = load_market_layout(layout_file)
-grid = convert_layout_to_grid(layout_data)
+# **Main Execution**
+if __name__ == "__main__":
+    # Load the market layout
+    layout_file = "market_layout.json"
+    layout_data = load_market_layout(layout_file)
+    grid = convert_layout_to_grid(layout_data)
 
-# Define cold aisles
-cold_aisles = {'L', 'M', 'Q', 'T', 'U', 'W', 'X', 'Y'}
+    # Define cold aisles
+    cold_aisles = COLD_AISLES
 
-# Example input route with walking pattern
-#example_route = "<->M->L->W->R->Z->C->U->G->F->V->P->S->A->D->T->B->Q->I->X->H->J->K->E->O->N->Y->>" #PW
-example_route = "<->P->W->Q->E->T->A->H->F->Y->M->B->V->K->R->L->C->D->U->I->N->Z->O->X->G->S->J->>" #PB
-#example_pattern = "ZgZg" #PW
-example_pattern = "V2H" #PB
-positions = find_positions(grid)
-path_coords, time_steps, collected_items, collected_cold_items, foul_passes, decay_over_time = generate_walking_path(positions, example_route, example_pattern, cold_aisles)
-print(len(foul_passes))
-# Plot the movement analysis
-plot_movement(time_steps, list(range(len(time_steps))), [d[1] for d in decay_over_time], collected_items, collected_cold_items, foul_passes)
+    # Example input route with walking pattern
+    #example_route = "<->M->L->W->R->Z->C->U->G->F->V->P->S->A->D->T->B->Q->I->X->H->J->K->E->O->N->Y->>" #PW
+    example_route = "<->P->W->Q->E->T->A->H->F->Y->M->B->V->K->R->L->C->D->U->I->N->Z->O->X->G->S->J->>" #PB
+    #example_pattern = "ZgZg" #PW
+    example_pattern = "V2H" #PB
+    positions = find_positions(grid)
+    path_coords, time_steps, collected_items, collected_cold_items, foul_passes, decay_over_time = generate_walking_path(positions, example_route, example_pattern, cold_aisles, layout_grid=grid)
+    print(len(foul_passes))
+    # Plot the movement analysis
+    plot_movement(time_steps, list(range(len(time_steps))), [d[1] for d in decay_over_time], collected_items, collected_cold_items, foul_passes)
@@ -0,0 +1,200 @@
+import numpy as np
+import pandas as pd
+from RouteCodec import PATTERNS
+from RouteEvaluator import RouteEvaluator, COLD_AISLES
+from MarketLayout import as_market_layout
+import Analyzer
+
+# Store-level traffic heatmaps over whole populations or Pareto sets. Instead of walking
+# routes cell by cell, every route is cut into legs (origin, target, pattern) and each
+# leg is counted once per group with np.bincount. Only the legs that occur are kept (as
+# sorted group-leg ids with their counts), and LayoutIndex.walk_legs expands just those
+# into cells when the grids are built, so large stores with many aisles stay cheap.
+# Two layers are kept per group:
+#   'visits' - steps that end on each cell (plus the entrance cell of every route),
+#   'cold'   - the same steps weighted by the cold items carried, as in the decay model
+#              of SuperMarketPlotter_v2 (items count from the leg after their aisle).
+# Foul-exposure grids are these layers restricted to the foul ('x') cells.
+
+LAYERS = ('visits', 'cold')
+DEFAULT_GROUPS = ('Algorithm', 'Generation')
+DENSE_LEG_IDS = 1 << 24  # Batches with fewer group-leg ids than this are counted with a dense bincount
+EXPAND_CELLS = 1 << 22  # Leg cells expanded per scatter-add when building the grids
+LABEL_LIMIT = 100  # Layouts with more aisles are plotted without aisle labels
+
+
+class TrafficHeatmap:
+    """Accumulates per-group leg counts of route populations on one layout."""
+
+    def __init__(self, layout, by=DEFAULT_GROUPS, zigzag='parity', cold_aisles=COLD_AISLES):
+        self.evaluator = RouteEvaluator.from_layout(layout, zigzag, cold_aisles)
+        self.index = self.evaluator.index
+        self.codec = self.evaluator.codec
+        self.by = list(by)
+        self.shape = self.index.shape
+        self.legs = len(self.codec.symbols) ** 2 * len(PATTERNS)
+        self.keys = {}  # Group key -> group row
+        self.leg_ids = np.zeros(0, dtype=np.int64)  # Sorted group row * legs + leg
+        self.counts = np.zeros((len(LAYERS), 0))  # Visits and cold load of every leg id
+        self.starts = np.zeros((0, len(self.codec.symbols)))
+        self.routes = np.zeros(0, dtype=np.int64)
+
+    def _rows(self, keys):
+        """Maps group keys to rows of the count arrays, growing them for new groups."""
+        labels, uniques = pd.factorize(keys)
+        rows = np.array([self.keys.setdefault(key, len(self.keys)) for key in uniques], dtype=np.int64)
+        grow = len(self.keys) - len(self.routes)
+        if grow:
+            self.starts = np.vstack([self.starts, np.zeros((grow, self.starts.shape[1]))])
+            self.routes = np.r_[self.routes, np.zeros(grow, dtype=np.int64)]
+        return rows[labels]
+
+    # 🛠️ Function to count the legs of a batch of encoded routes
+    def add(self, route_codes, pattern_codes, keys):
+        """
+        Adds routes given as codec code rows (including '<' and '>', see
+        RouteEvaluator.with_entrance_exit), their pattern codes and one group key per route.
+        """
+        route_codes = np.asarray(route_codes)
+        pattern = np.asarray(pattern_codes, dtype=np.intp)[:, None]
+        rows = self._rows(keys)
+        groups = len(self.keys)
+        self.routes += np.bincount(rows, minlength=groups)
+        self.starts += np.bincount(rows * self.starts.shape[1] + route_codes[:, 0],
+                                   minlength=groups * self.starts.shape[1]).reshape(groups, -1)
+        if route_codes.shape[1] < 2:
+            return
+
+        origin, target = route_codes[:, :-1], route_codes[:, 1:]
+        valid = (origin != self.codec.pad) & (target != self.codec.pad)
+        origin, target = np.where(valid, origin, 0), np.where(valid, target, 0)
+        n = len(self.codec.symbols)
+        legs = (origin.astype(np.int64) * n + target) * len(PATTERNS) + pattern
+        collected = self.evaluator.cold[target] & (self.index.leg_length[origin, target, pattern] > 0)
+        carried = np.cumsum(collected, axis=1) - collected
+
+        ids = (rows[:, None] * self.legs + legs)[valid]
+        self._accumulate(ids, carried[valid], groups)
+
+    def _accumulate(self, ids, carried, groups):
+        """Adds one batch of group-leg ids (one per leg walked) to the sparse counts."""
+        if groups * self.legs <= DENSE_LEG_IDS:
+            visits = np.bincount(ids, minlength=groups * self.legs)
+            unique = np.flatnonzero(visits)
+            counts = np.vstack([visits[unique], np.bincount(ids, weights=carried, minlength=groups * self.legs)[unique]])
+        else:
+            unique, inverse = np.unique(ids, return_inverse=True)
+            counts = np.vstack([np.bincount(inverse), np.bincount(inverse, weights=carried)])
+        merged, inverse = np.unique(np.r_[self.leg_ids, unique], return_inverse=True)
+        self.counts = np.vstack([np.bincount(inverse, weights=np.r_[old, new], minlength=len(merged))
+                                 for old, new in zip(self.counts, counts)])
+        self.leg_ids = merged
+
+    # 🛠️ Function to add a table of routes
+    def add_frame(self, df, route_column='IsleOrder', pattern_column='WalkingPattern'):
+        """Adds the routes of a DataFrame (aisles only, as in the raw data), grouped by its `by` columns."""
+        if len(df) == 0:
+            return
+        aisle_codes, pattern_codes = self.codec.encode_frame(df, route_column, pattern_column)
+        keys = pd.MultiIndex.from_frame(df[self.by]) if self.by else np.zeros(len(df), dtype=np.int64)
+        self.add(self.evaluator.with_entrance_exit(aisle_codes), pattern_codes, keys)
+
+    # 🛠️ Function to turn the leg counts into cell grids
+    def grids(self, layer='visits', foul_only=False):
+        """Returns (group keys, (groups, rows, cols) array) of the chosen layer, in first-seen group order."""
+        if layer not in LAYERS:
+            raise ValueError(f"Unknown layer '{layer}', expected one of {LAYERS}")
+        area = self.shape[0] * self.shape[1]
+        values = np.zeros(len(self.keys) * area)
+        # Walk every distinct leg once, then scatter each group-leg count over its cells
+        used, position = np.unique(self.leg_ids % self.legs, return_inverse=True)
+        n, patterns = len(self.codec.symbols), len(PATTERNS)
+        paths = self.index.walk_legs(used // patterns // n, used // patterns % n, used % patterns)
+        offsets = (self.leg_ids // self.legs) * area
+        weights = self.counts[LAYERS.index(layer)]
+        block = max(1, EXPAND_CELLS // max(1, paths.shape[1]))
+        for start in range(0, len(self.leg_ids), block):
+            cells = paths[position[start:start + block]]
+            walked = cells >= 0
+            values += np.bincount((cells + offsets[start:start + block, None])[walked],
+                                  weights=np.broadcast_to(weights[start:start + block, None], cells.shape)[walked],
+                                  minlength=len(values))
+        values = values.reshape(len(self.keys), area)
+        if layer == 'visits':
+            entrances = self.index.coords[:, 0].astype(np.int64) * self.shape[1] + self.index.coords[:, 1]
+            np.add.at(values.T, entrances, self.starts.T)
+        if foul_only:
+            values = values * self.index.foul.ravel()
+        return list(self.keys), values.reshape(len(self.keys), *self.shape)
+
+    # 🛠️ Function to export the grids as a long table
+    def to_frame(self):
+        """One row per group and visited cell: the group columns, Routes, Row, Col, Cell, Visits, Cold Load and Foul."""
+        keys, visits = self.grids('visits')
+        _, cold = self.grids('cold')
+        group, row, col = np.nonzero(visits)
+        frame = pd.DataFrame([keys[g] if isinstance(keys[g], tuple) else (keys[g],) for g in group],
+                             columns=self.by or ['Group'])
+        frame['Routes'] = self.routes[group]
+        frame['Row'], frame['Col'] = row, col
+        frame['Cell'] = np.array(self.codec.symbols + ['x', '0'], dtype=object)[self.index.cells[row, col]]
+        frame['Visits'] = visits[group, row, col]
+        frame['Cold Load'] = cold[group, row, col]
+        frame['Foul'] = self.index.foul[row, col]
+        return frame
+
+# 🛠️ Function to aggregate the populations of a run tree
+def heatmaps_from_runs(root_dir, layout, by=DEFAULT_GROUPS, chunksize=Analyzer.DEFAULT_CHUNKSIZE, use_cache=False,
+                       zigzag='parity'):
+    """Streams every raw data file of the run tree (tagged with Run/Algorithm) into a TrafficHeatmap."""
+    from tqdm import tqdm
+
+    heatmap = TrafficHeatmap(layout, by, zigzag)
+    columns = ['Generation'] + Analyzer.ROUTE_COLUMNS
+    dtypes = {'Generation': 'int64', **{column: object for column in Analyzer.ROUTE_COLUMNS}}
+    for run, algorithm, file_path in tqdm(Analyzer.find_all_csv_files(root_dir), desc="Aggregating Traffic", unit="file"):
+        for chunk in Analyzer.read_raw_chunks(file_path, columns, dtypes, chunksize, use_cache):
+            heatmap.add_frame(chunk.assign(Run=run, Algorithm=algorithm))
+    return heatmap
+
+# 🛠️ Function to draw one heatmap on the layout
+def plot_heatmap(values, layout, title, output_file=None):
+    """
+    Draws a (rows, cols) count grid over the layout (a MarketLayout, layout dict or grid),
+    hatching foul cells and labelling aisles on layouts of up to LABEL_LIMIT aisles.
+    Saves it to `output_file` if given.
+    """
+    import matplotlib.pyplot as plt
+
+    layout = as_market_layout(layout)
+    fig, ax = plt.subplots(figsize=(8, 8))
+    image = ax.imshow(np.ma.masked_equal(values, 0), cmap='inferno', interpolation='nearest')
+    foul = np.zeros(layout.shape + (4,))
+    foul[layout.foul_mask()] = (0.5, 0.5, 0.5, 0.35)
+    ax.imshow(foul, interpolation='nearest')
+    if len(layout.symbols) <= LABEL_LIMIT:
+        for aisle, (r, c) in layout.positions.items():
+            ax.text(c, r, aisle, ha='center', va='center', fontsize=9, color='cyan')
+    fig.colorbar(image, ax=ax, shrink=0.8)
+    ax.set_xticks([])
+    ax.set_yticks([])
+    ax.set_title(title)
+    if output_file:
+        fig.savefig(output_file, bbox_inches='tight')
+        plt.close(fig)
+    else:
+        plt.show()
+
+
+# **Main Execution**
+if __name__ == "__main__":
+    import json
+
+    root_directory = r"C:\Users\Jeryes\github\SuperMarketNavigation\MultiObject\SuperMarketNavigation\bin\Debug\net9.0\Run_20250209_004552"
+    with open(Analyzer.find_layout_file(Analyzer.find_all_csv_files(root_directory)[0][2]), 'r') as file:
+        market_layout = json.load(file)
+    traffic = heatmaps_from_runs(root_directory, market_layout, by=['Algorithm'])
+    traffic.to_frame().to_csv("traffic_heatmaps.csv", index=False)
+    group_keys, cold_grids = traffic.grids('cold')
+    for key, cold_grid in zip(group_keys, cold_grids):
+        plot_heatmap(cold_grid, traffic.index.layout, f"Cold Load Traffic - {key[0]}")
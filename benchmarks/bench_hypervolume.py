@@ -0,0 +1,67 @@
+import os
+import io
+import sys
+import time
+import argparse
+import tempfile
+import contextlib
+import numpy as np
+
+os.environ.setdefault('TQDM_DISABLE', '1')  # Keep progress bars out of the timings
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import Analyzer
+import QualityIndicators as qi
+from synthetic import generate_run_tree
+
+# Accuracy check and benchmark of the N-objective hypervolume: the exact sweep/slicing
+# against the Monte Carlo estimate (which must agree within its error bound) on random
+# fronts of 2 to 6 objectives, then a 3-objective (WalkingTime, ExposureTime, ColdDecay)
+# analysis of a run tree compared with the usual 2-objective one.
+#
+#   python benchmarks/bench_hypervolume.py --root-dir <Run_... folder>
+
+FRONT_SIZES = {2: 2000, 3: 1000, 4: 200, 5: 60, 6: 40}
+
+
+# 🛠️ Function to draw a random non-dominated front on the unit sphere
+def random_front(objectives, size, seed=0):
+    points = np.random.default_rng(seed).random((size, objectives))
+    return points / np.linalg.norm(points, axis=1, keepdims=True)
+
+# 🛠️ Function to time a callable once, keeping its result
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+# **Main Execution**
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="N-objective hypervolume accuracy check and benchmark")
+    parser.add_argument("--root-dir", help="Run tree to analyze (default: a synthetic one)")
+    parser.add_argument("--samples", type=int, default=qi.MC_SAMPLES, help="Monte Carlo samples")
+    args = parser.parse_args()
+
+    failures = 0
+    for objectives, size in FRONT_SIZES.items():
+        front = random_front(objectives, size, seed=objectives)
+        reference_point = np.full(objectives, 1.1)
+        estimate, error = qi.hypervolume_mc(front, reference_point, args.samples)
+        if objectives <= qi.EXACT_HV_OBJECTIVES:
+            exact, seconds = timed(lambda: qi.hypervolume(front, reference_point))
+            agrees = abs(exact - estimate) <= error
+            failures += not agrees
+            print(f"{'✅' if agrees else '❌'} {objectives} objectives, {size:5d} points: exact {exact:.6f} in {seconds:.3f}s, "
+                  f"Monte Carlo {estimate:.6f} ± {error:.6f}")
+        else:
+            _, seconds = timed(lambda: qi.hypervolume_mc(front, reference_point, args.samples))
+            print(f"🎲 {objectives} objectives, {size:5d} points: Monte Carlo {estimate:.6f} ± {error:.6f} in {seconds:.3f}s")
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        root_dir = args.root_dir or generate_run_tree(work_dir, runs=4, algorithms=3, generations=40, population=250)
+        for objectives in (Analyzer.OBJECTIVES, Analyzer.OBJECTIVES + [Analyzer.DECAY_OBJECTIVE]):
+            with contextlib.redirect_stdout(io.StringIO()):
+                (performance_df, _, _), seconds = timed(lambda: Analyzer.analyze_runs(root_dir, objectives=objectives))
+            print(f"⏱️ analyze_runs with {len(objectives)} objectives: {seconds:.2f}s "
+                  f"({len(performance_df)} files, mean HV {performance_df['Hypervolume'].mean():.4g})")
+    sys.exit(1 if failures else 0)
@@ -0,0 +1,91 @@
+import os
+import sys
+import time
+import argparse
+import tempfile
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import matplotlib
+matplotlib.use('Agg')
+
+import SuperMarketPlotter
+import RouteRenderer
+from MarketLayout import MarketLayout
+from RouteEvaluator import RouteEvaluator
+from synthetic import random_sparse_layout
+
+# Scaling benchmark of the sparse layout path: path generation and plotting should grow
+# with the number of steps a route walks, not with the area of the grid.
+#   - area sweep:  one fixed route (in a WINDOW x WINDOW corner) on ever larger grids that
+#                  also hold `--fillers` other aisles, so only the area changes;
+#   - length sweep: routes of growing length on one large layout, reported per step.
+# Layouts use multi-character aisle ids with several cells each (see MarketLayout).
+#
+#   python benchmarks/bench_layout_scaling.py --max-side 1600 --fillers 1000
+
+WINDOW = 60
+ROUTE_AISLES = 30
+
+
+# 🛠️ Function to build a layout with a fixed route corner and filler aisles elsewhere
+def corner_layout(rows, cols, fillers, seed=0):
+    """Route aisles R0000... (with '<' and '>') in the top-left WINDOW square, fillers F0000... below it."""
+    corner = MarketLayout.from_dict(random_sparse_layout(WINDOW, WINDOW, ROUTE_AISLES, prefix='R', seed=seed))
+    rest = MarketLayout.from_dict(random_sparse_layout(rows - WINDOW, cols, fillers, prefix='F', entrance_exit=False,
+                                                       seed=seed + 1))
+    aisles = dict(corner.aisles)
+    aisles.update({aisle: cells + (WINDOW, 0) for aisle, cells in rest.aisles.items()})
+    return MarketLayout(rows, cols, aisles, np.vstack([corner.foul, rest.foul + (WINDOW, 0)]))
+
+# 🛠️ Function to draw a random route over some aisles of a layout
+def random_route(layout, length, prefix, seed=0):
+    aisles = [aisle for aisle in layout.symbols if aisle.startswith(prefix)]
+    picked = np.random.default_rng(seed).choice(len(aisles), length, replace=False)
+    return ['<'] + [aisles[i] for i in picked] + ['>']
+
+# 🛠️ Function to time the path, plot and evaluation of one route
+def time_route(layout, route, output_dir):
+    """Returns (steps, seconds of find_positions + generate_walking_path, of plot_walking_pattern, of render_routes)."""
+    start = time.perf_counter()
+    path_coords, _ = SuperMarketPlotter.generate_walking_path(SuperMarketPlotter.find_positions(layout), route, 'ZgZg')
+    walk = time.perf_counter() - start
+    start = time.perf_counter()
+    SuperMarketPlotter.plot_walking_pattern(layout, route, 'ZgZg', output_file=os.path.join(output_dir, "route.png"))
+    plot = time.perf_counter() - start
+    start = time.perf_counter()
+    RouteRenderer.render_routes(layout, ['->'.join(route)], ['ZgZg'], output_dir, workers=1)
+    render = time.perf_counter() - start
+    return len(path_coords) - 1, walk, plot, render
+
+
+# **Main Execution**
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Path generation and plotting scaling on large sparse layouts")
+    parser.add_argument("--max-side", type=int, default=1600, help="Rows of the largest grid (cols = 1.5 x rows)")
+    parser.add_argument("--fillers", type=int, default=1000, help="Aisles besides the route aisles")
+    parser.add_argument("--lengths", type=int, nargs='+', default=[8, 16, 32, 64, 128])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        print(f"📏 Fixed {ROUTE_AISLES}-aisle route, {args.fillers} filler aisles, growing grid:")
+        side = 2 * WINDOW
+        while side <= args.max_side:
+            layout = corner_layout(side, side * 3 // 2, args.fillers)
+            steps, walk, plot, render = time_route(layout, random_route(layout, ROUTE_AISLES, 'R'), work_dir)
+            print(f"⏱️ {layout.rows:5d}x{layout.cols:<5d} ({layout.rows * layout.cols:>9,} cells, {len(layout.foul):>7,} foul): "
+                  f"{steps} steps, path {walk * 1e3:7.2f}ms, plot {plot:.2f}s, render {render:.2f}s")
+            side *= 2
+
+        rows, cols = 200, 300
+        layout = MarketLayout.from_dict(random_sparse_layout(rows, cols, 2 * args.fillers, seed=1))
+        print(f"\n📏 Growing routes on a {rows}x{cols} layout with {len(layout.symbols):,} aisles:")
+        for length in args.lengths:
+            steps, walk, plot, render = time_route(layout, random_route(layout, length, 'A', seed=length), work_dir)
+            print(f"⏱️ {length:4d} aisles, {steps:6,} steps: path {walk * 1e3:7.2f}ms ({walk / steps * 1e6:.2f}µs/step), "
+                  f"plot {plot:.2f}s ({plot / steps * 1e3:.3f}ms/step), render {render:.2f}s")
+
+        start = time.perf_counter()
+        evaluator = RouteEvaluator.from_layout(layout)
+        print(f"\n⏱️ LayoutIndex of {len(layout.symbols):,} aisles "
+              f"({evaluator.index.leg_length.size:,} legs) built in {time.perf_counter() - start:.2f}s")
@@ -0,0 +1,76 @@
+import os
+import io
+import sys
+import time
+import argparse
+import tempfile
+import contextlib
+import numpy as np
+
+os.environ.setdefault('TQDM_DISABLE', '1')  # Keep progress bars out of the timings
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import Analyzer
+import SolutionIndex
+from ParetoIndex import ParetoIndex
+from synthetic import generate_run_tree
+
+# Parity check and benchmark of ParetoIndex budget queries against the way they were answered
+# before: pareto_front over the solution table, then a scan of the front's rows per query.
+# Also times the batch API, nearest-to-ideal queries and reloading the saved index.
+#
+#   python benchmarks/bench_pareto_query.py --root-dir <Run_... folder> --queries 10000
+
+
+# 🛠️ Function to answer one budget query by re-running pareto_front and scanning rows
+def scan_budget(solutions, limit):
+    front = Analyzer.pareto_front(solutions)
+    feasible = front[front['WalkingTime'] <= limit]
+    return feasible['ExposureTime'].min() if len(feasible) else np.nan
+
+# 🛠️ Function to time a callable once, keeping its result
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+# **Main Execution**
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="ParetoIndex parity check and benchmark")
+    parser.add_argument("--root-dir", help="Run tree to index (default: a synthetic one)")
+    parser.add_argument("--queries", type=int, default=10_000, help="Budget queries answered by the index")
+    parser.add_argument("--scan-queries", type=int, default=50, help="Budget queries answered by scanning")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        root_dir = args.root_dir or generate_run_tree(work_dir, runs=4, algorithms=3, generations=40, population=250)
+        with contextlib.redirect_stdout(io.StringIO()):
+            solutions, _ = SolutionIndex.build_solution_index(root_dir)
+        index, seconds = timed(lambda: ParetoIndex.from_solutions(solutions))
+        print(f"⏱️ Indexed {len(index.names)} fronts ({int(index.bounds[-1]):,} solutions) "
+              f"from {len(solutions):,} unique solutions in {seconds:.3f}s")
+
+        rng = np.random.default_rng(0)
+        low, high = solutions['WalkingTime'].min(), solutions['WalkingTime'].max()
+        limits = rng.uniform(low - 1, high, args.queries)
+        scanned, scan_seconds = timed(lambda: [scan_budget(solutions, limit) for limit in limits[:args.scan_queries]])
+        answers, batch_seconds = timed(lambda: index.budget_batch(limits))
+        matches = int(np.sum(np.isclose(answers['ExposureTime'].values[:args.scan_queries], scanned, equal_nan=True)))
+        print(f"🔍 Parity with pareto_front + scan: {matches}/{len(scanned)} budget queries match")
+        print(f"⏱️ pareto_front + scan: {scan_seconds / len(scanned) * 1e3:.2f}ms per query")
+        print(f"⏱️ budget_batch: {batch_seconds / len(limits) * 1e6:.2f}µs per query ({len(limits):,} queries)")
+        _, single_seconds = timed(lambda: [index.budget(limit) for limit in limits[:1000]])
+        print(f"⏱️ budget (one at a time): {single_seconds / 1000 * 1e6:.1f}µs per query")
+
+        points = np.column_stack([rng.uniform(low, high, args.queries),
+                                  rng.uniform(solutions['ExposureTime'].min(), solutions['ExposureTime'].max(), args.queries)])
+        _, seconds = timed(lambda: index.nearest_batch(points))
+        print(f"⏱️ nearest_batch: {seconds / len(points) * 1e6:.2f}µs per query ({len(points):,} queries)")
+
+        index_dir = os.path.join(work_dir, "pareto_index")
+        _, save_seconds = timed(lambda: index.save(index_dir))
+        reloaded, load_seconds = timed(lambda: ParetoIndex.load(index_dir))
+        same = reloaded.budget_batch(limits).equals(answers)
+        print(f"{'✅' if same else '❌'} Saved in {save_seconds * 1e3:.1f}ms, reloaded in {load_seconds * 1e3:.1f}ms "
+              f"with {'identical' if same else 'different'} answers")
+    sys.exit(0 if matches == len(scanned) and same else 1)
@@ -0,0 +1,107 @@
+import os
+import sys
+import json
+import time
+import argparse
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import matplotlib
+matplotlib.use('Agg')  # The plotter is only used for its per-step walk
+
+import SuperMarketPlotter_v2 as plotter_v2
+from MarketLayout import MarketLayout
+from RouteCodec import PATTERNS
+from RouteEvaluator import RouteEvaluator, COLD_AISLES
+from synthetic import random_sparse_layout
+
+# Parity check and throughput benchmark of RouteEvaluator against the per-step
+# generate_walking_path of SuperMarketPlotter_v2 (and, given raw data, against the
+# objectives the optimizer stored). tests/test_route_evaluator.py runs the same parity
+# check under pytest.
+
+
+# 🛠️ Function to draw random routes over the aisles of a layout
+def random_routes(evaluator, count, seed=0):
+    rng = np.random.default_rng(seed)
+    aisles = np.array([evaluator.codec.index[s] for s in evaluator.codec.symbols if s not in ('<', '>')])
+    routes = rng.permuted(np.tile(aisles, (count, 1)), axis=1).astype(evaluator.codec.dtype)
+    return evaluator.with_entrance_exit(routes), rng.integers(0, len(PATTERNS), count).astype(np.uint8)
+
+# 🛠️ Function to compare the batch evaluator with the per-step walk
+def check_parity(evaluator, grid, route_codes, pattern_codes, cold_aisles=COLD_AISLES):
+    """Returns the number of routes whose walking time, foul passes or decay differ."""
+    scores = evaluator.evaluate(route_codes, pattern_codes, model='decay')
+    positions = plotter_v2.find_positions(grid)
+    mismatches = 0
+    for i, (route, pattern) in enumerate(zip(route_codes, pattern_codes)):
+        _, step_numbers, _, _, foul_passes, decay_over_time = plotter_v2.generate_walking_path(
+            positions, route, pattern, cold_aisles, codec=evaluator.codec, layout_grid=grid)
+        walking_time = len(step_numbers) - 2  # Entrance and exit are added without walking
+        expected = (walking_time, len(foul_passes), decay_over_time[-1][1])
+        actual = (scores['WalkingTime'][i], scores['FoulPasses'][i], scores['ExposureTime'][i])
+        if expected != tuple(int(value) for value in actual):
+            mismatches += 1
+    return mismatches
+
+# 🛠️ Function to build a sparse layout whose aisles span several cells, a third of them cold
+def multi_cell_layout(rows=60, cols=90, aisles=300, cells_per_aisle=3, seed=0):
+    """Returns (MarketLayout, cold aisle set); routes walk past cells of their target aisles."""
+    layout = MarketLayout.from_dict(random_sparse_layout(rows, cols, aisles, cells_per_aisle, seed=seed))
+    return layout, {aisle for aisle in layout.symbols[::3] if aisle not in ('<', '>')}
+
+# 🛠️ Function to time a callable over a few repeats
+def best_time(func, repeats=5):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+# **Main Execution**
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="RouteEvaluator parity check and benchmark")
+    parser.add_argument("--layout", default="market_layout.json")
+    parser.add_argument("--parity-routes", type=int, default=2000)
+    parser.add_argument("--sparse-routes", type=int, default=300, help="Parity routes on a multi-cell sparse layout")
+    parser.add_argument("--routes", type=int, default=500_000)
+    parser.add_argument("--raw-data", help="Optimizer raw data CSV to re-validate (with --run-layout)")
+    parser.add_argument("--run-layout", help="market_layout.json of the run the raw data came from")
+    args = parser.parse_args()
+
+    layout = plotter_v2.load_market_layout(args.layout)
+    grid = plotter_v2.convert_layout_to_grid(layout)
+    evaluator = RouteEvaluator.from_layout(layout)
+
+    route_codes, pattern_codes = random_routes(evaluator, args.parity_routes, seed=1)
+    mismatches = check_parity(evaluator, grid, route_codes, pattern_codes)
+    print(f"🔍 Parity with generate_walking_path: {args.parity_routes - mismatches}/{args.parity_routes} routes match")
+    sparse_layout, sparse_cold = multi_cell_layout()
+    sparse_evaluator = RouteEvaluator.from_layout(sparse_layout, cold_aisles=sparse_cold)
+    sparse_mismatches = check_parity(sparse_evaluator, sparse_layout, *random_routes(sparse_evaluator, args.sparse_routes, seed=3),
+                                     cold_aisles=sparse_cold)
+    print(f"🔍 Parity on a {sparse_layout.rows}x{sparse_layout.cols} layout of {len(sparse_layout.symbols) - 2} "
+          f"multi-cell aisles: {args.sparse_routes - sparse_mismatches}/{args.sparse_routes} routes match")
+    mismatches += sparse_mismatches
+
+    start = time.perf_counter()
+    for route, pattern in zip(route_codes, pattern_codes):
+        plotter_v2.generate_walking_path(plotter_v2.find_positions(grid), route, pattern, COLD_AISLES,
+                                         codec=evaluator.codec, layout_grid=grid)
+    per_step_rate = len(route_codes) / (time.perf_counter() - start)
+
+    route_codes, pattern_codes = random_routes(evaluator, args.routes, seed=2)
+    batch_time = best_time(lambda: evaluator.evaluate(route_codes, pattern_codes))
+    print(f"⏱️ Per-step walk: {per_step_rate:,.0f} routes/s")
+    print(f"⏱️ Batch evaluator: {args.routes / batch_time:,.0f} routes/s ({args.routes:,} routes in {batch_time:.3f}s)")
+
+    if args.raw_data and args.run_layout:
+        with open(args.run_layout, 'r') as file:
+            optimizer = RouteEvaluator.from_layout(json.load(file), zigzag='balance')
+        df = pd.read_csv(args.raw_data)
+        matches = optimizer.validate_frame(df)
+        print(f"✅ Raw data re-validation: {matches.sum()}/{len(df)} rows match the stored objectives")
+    sys.exit(1 if mismatches else 0)
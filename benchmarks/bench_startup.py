@@ -0,0 +1,63 @@
+import os
+import sys
+import time
+import tempfile
+import subprocess
+import numpy as np
+import pandas as pd
+
+# Startup-time benchmark of SuperMarketCLI: times `--help` and an `analyze` run on a tiny
+# run tree, and lists which heavy libraries each one imported (via python -X importtime).
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CLI = os.path.join(REPO_DIR, "SuperMarketCLI.py")
+HEAVY_MODULES = ['matplotlib', 'scipy', 'pandas', 'tqdm']
+
+
+# 🛠️ Function to write a one-file run tree
+def write_tiny_run_tree(root_dir, rows=200, seed=0):
+    rng = np.random.default_rng(seed)
+    algo_dir = os.path.join(root_dir, "Run1", "NSGA2Algorithm")
+    os.makedirs(algo_dir)
+    pd.DataFrame({
+        'Generation': np.repeat(np.arange(rows // 20), 20),
+        'WalkingTime': rng.integers(100, 200, rows),
+        'ExposureTime': rng.integers(1000, 6000, rows),
+        'IsleOrder': 'A->B->C',
+        'WalkingPattern': 'V2H',
+    }).to_csv(os.path.join(algo_dir, "NSGA2Algorithm_raw_data.csv"), index=False)
+
+# 🛠️ Function to run the CLI once and report its wall time and imported top-level packages
+def profile_command(arguments, cwd):
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, "-X", "importtime", CLI] + arguments, cwd=cwd,
+                            capture_output=True, text=True)
+    elapsed = time.perf_counter() - start
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr[-2000:])
+    imported = set()
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            imported.add(line.rsplit("|", 1)[1].strip().split(".")[0])
+    return elapsed, imported
+
+
+# **Main Execution**
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as temp_dir:
+        root_dir = os.path.join(temp_dir, "runs")
+        write_tiny_run_tree(root_dir)
+        commands = {
+            "--help": ["--help"],
+            "analyze": ["analyze", root_dir, "--output-dir", temp_dir],
+            "merge": ["merge", root_dir, "-o", os.path.join(temp_dir, "merged.csv")],
+        }
+        failed = False
+        for name, arguments in commands.items():
+            elapsed, imported = profile_command(arguments, temp_dir)
+            heavy = [module for module in HEAVY_MODULES if module in imported]
+            print(f"⏱️ {name:8s} {elapsed:6.3f}s  heavy imports: {', '.join(heavy) or 'none'}")
+            failed |= name != "--help" and 'matplotlib' in imported
+            failed |= name == "--help" and bool(heavy)
+    print("❌ A command imported more than it needs" if failed else "✅ analyze/merge start without matplotlib")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,200 @@
+import os
+import io
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+import tracemalloc
+import contextlib
+from datetime import datetime
+
+os.environ.setdefault('TQDM_DISABLE', '1')  # Keep progress bars out of the timings
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import numpy as np
+import pandas as pd
+
+import Analyzer
+import CSV_Combiner
+import LocalSearch
+import ParetoIndex
+import QualityIndicators as qi
+import SolutionIndex
+import SuperMarketPlotter
+import SuperMarketPlotter_v2
+import TrafficHeatmap
+from RouteEvaluator import RouteEvaluator, COLD_AISLES
+from synthetic import generate_run_tree
+
+# Benchmark suite: times and memory-profiles the analysis pipeline and the path simulators
+# on synthetic run trees of increasing size, writes the results as JSON and compares them
+# with a baseline results file.
+#
+#   python benchmarks/bench_suite.py --sizes small medium --output results.json
+#   python benchmarks/bench_suite.py --baseline results.json --tolerance 0.25
+
+SIZES = {
+    'small': dict(runs=2, algorithms=2, generations=20, population=100, rows=12, cols=12),
+    'medium': dict(runs=4, algorithms=3, generations=40, population=250, rows=24, cols=24),
+    'large': dict(runs=10, algorithms=5, generations=80, population=500, rows=48, cols=48),
+}
+WALK_ROUTES = 200  # Routes walked step by step by the plotters per size
+POLISH_ROUTES = 200  # Routes polished by three local search iterations per size
+BUDGET_QUERIES = 10_000  # Budget queries answered by the Pareto index per size
+MIN_BATCH_SECONDS = 0.05
+
+
+# 🛠️ Function to time a callable and measure its peak traced memory
+def measure(func, repeats=3):
+    """
+    Returns {'seconds': best time per call, 'mean_seconds', 'repeats', 'number', 'peak_mb'}.
+    Fast calls are looped `number` times per repeat (at least MIN_BATCH_SECONDS per batch)
+    so short timings stay stable. Timings run without tracing; the peak (Python and NumPy
+    allocations, via tracemalloc) comes from one extra traced call.
+    """
+    def run_batch(number):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        return time.perf_counter() - start
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        number = 1
+        elapsed = run_batch(number)
+        while elapsed < MIN_BATCH_SECONDS and number < 10_000:
+            number *= 10
+            elapsed = run_batch(number)
+        timings = [elapsed / number] + [run_batch(number) / number for _ in range(repeats - 1)]
+        tracemalloc.start()
+        try:
+            func()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    return {'seconds': min(timings), 'mean_seconds': float(np.mean(timings)), 'repeats': repeats, 'number': number,
+            'peak_mb': peak / 2**20}
+
+# 🛠️ Function to run every benchmark on one synthetic run tree
+def benchmark_size(size_name, size, work_dir, repeats):
+    root_dir = generate_run_tree(work_dir, seed=0, name=f"Run_{size_name}", **size)
+    rows = size['runs'] * size['algorithms'] * size['generations'] * size['population']
+    merged_file = os.path.join(work_dir, f"merged_{size_name}.csv")
+    with open(os.path.join(root_dir, "market_layout.json"), 'r') as file:
+        layout = json.load(file)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        _, _, all_final_pareto_df = Analyzer.analyze_runs(root_dir)
+        solutions, occurrences = SolutionIndex.build_solution_index(root_dir)
+    reference_pareto = Analyzer.compute_reference_pareto(all_final_pareto_df)
+    first_file = Analyzer.find_all_csv_files(root_dir)[0][2]
+    population = pd.read_csv(first_file)
+    points = population[Analyzer.OBJECTIVES]
+    reference_point = points.max().values
+    front = Analyzer.pareto_front(population)
+    routes = population.head(WALK_ROUTES)
+
+    grid = SuperMarketPlotter.convert_layout_to_grid(layout)
+    positions_v1 = SuperMarketPlotter.find_positions(grid)
+    positions_v2 = SuperMarketPlotter_v2.find_positions(grid)
+    evaluator = RouteEvaluator.from_layout(layout)
+    aisle_codes, pattern_codes = evaluator.codec.encode_frame(population)
+    route_codes = evaluator.with_entrance_exit(aisle_codes)
+    pareto_index = ParetoIndex.ParetoIndex.from_solutions(solutions)
+    budgets = np.linspace(solutions['WalkingTime'].min(), solutions['WalkingTime'].max(), BUDGET_QUERIES)
+
+    benchmarks = {
+        'analyze_runs': lambda: Analyzer.analyze_runs(root_dir),
+        'merge_all_runs': lambda: CSV_Combiner.merge_all_runs(root_dir, merged_file),
+        'build_solution_index': lambda: SolutionIndex.build_solution_index(root_dir),
+        'analyze_index': lambda: SolutionIndex.analyze_index(solutions, occurrences),
+        'compute_reference_pareto': lambda: Analyzer.compute_reference_pareto(all_final_pareto_df),
+        'hypervolume': lambda: Analyzer.compute_hypervolume(points, reference_point),
+        'igd': lambda: Analyzer.compute_igd(points, reference_pareto),
+        'spread': lambda: Analyzer.compute_spread(points, front),
+        'igd_plus': lambda: qi.igd_plus(points.values, reference_pareto[Analyzer.OBJECTIVES].values),
+        'gd': lambda: qi.gd(points.values, reference_pareto[Analyzer.OBJECTIVES].values),
+        'additive_epsilon': lambda: qi.additive_epsilon(points.values, reference_pareto[Analyzer.OBJECTIVES].values),
+        'generate_walking_path': lambda: [
+            SuperMarketPlotter.generate_walking_path(positions_v1, route, pattern)
+            for route, pattern in zip(routes['IsleOrder'], routes['WalkingPattern'])],
+        'generate_walking_path_v2': lambda: [
+            SuperMarketPlotter_v2.generate_walking_path(positions_v2, f"<->{route}->>", pattern, COLD_AISLES, layout_grid=grid)
+            for route, pattern in zip(routes['IsleOrder'], routes['WalkingPattern'])],
+        'route_evaluator': lambda: evaluator.evaluate(route_codes, pattern_codes),
+        'traffic_heatmap': lambda: TrafficHeatmap.TrafficHeatmap(layout).add_frame(population.assign(Algorithm='A')),
+        'pareto_index': lambda: ParetoIndex.ParetoIndex.from_solutions(solutions),
+        'pareto_query': lambda: pareto_index.budget_batch(budgets),
+        'local_search': lambda: LocalSearch.polish_routes(evaluator, aisle_codes[:POLISH_ROUTES], pattern_codes[:POLISH_ROUTES],
+                                                          max_iterations=3),
+    }
+    # Work items of each benchmark, so sizes can be compared per row / per route
+    items = {'generate_walking_path': len(routes), 'generate_walking_path_v2': len(routes),
+             'route_evaluator': len(route_codes), 'traffic_heatmap': len(population), 'compute_reference_pareto': len(all_final_pareto_df),
+             'local_search': min(POLISH_ROUTES, len(aisle_codes)), 'pareto_index': len(solutions),
+             'pareto_query': len(budgets)}
+    for metric in ['hypervolume', 'igd', 'spread', 'igd_plus', 'gd', 'additive_epsilon']:
+        items[metric] = len(points)
+
+    results = []
+    for name, func in benchmarks.items():
+        result = {'benchmark': name, 'size': size_name, **size, 'rows': rows, 'items': items.get(name, rows),
+                  **measure(func, repeats)}
+        print(f"⏱️ {size_name:7s} {name:26s} {result['seconds']:9.4f}s  peak {result['peak_mb']:8.1f} MB")
+        results.append(result)
+    return results
+
+# 🛠️ Function to compare results with a baseline
+def compare_with_baseline(results, baseline, tolerance):
+    """Prints the time ratio of every benchmark found in both runs; returns the regressions beyond `tolerance`."""
+    previous = {(entry['size'], entry['benchmark']): entry for entry in baseline['results']}
+    regressions = []
+    print("\n📊 **Comparison with baseline:**")
+    for entry in results:
+        before = previous.get((entry['size'], entry['benchmark']))
+        if before is None or before['items'] != entry['items']:
+            continue
+        ratio = entry['seconds'] / before['seconds'] if before['seconds'] > 0 else float('inf')
+        flag = "❌" if ratio > 1 + tolerance else "✅"
+        print(f"{flag} {entry['size']:7s} {entry['benchmark']:26s} x{ratio:5.2f} time, "
+              f"{entry['peak_mb'] - before['peak_mb']:+8.1f} MB peak")
+        if ratio > 1 + tolerance:
+            regressions.append(entry)
+    return regressions
+
+
+# **Main Execution**
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time and memory-profile the analysis pipeline on synthetic run trees")
+    parser.add_argument("--sizes", nargs="+", choices=list(SIZES), default=['small', 'medium'])
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--output", help="Results JSON (default: benchmarks/results/bench_<timestamp>.json)")
+    parser.add_argument("--baseline", help="Earlier results JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown before flagging (0.25 = 25%%)")
+    args = parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory() as work_dir:
+        for size_name in args.sizes:
+            results.extend(benchmark_size(size_name, SIZES[size_name], work_dir, args.repeats))
+
+    report = {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'machine': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'results': results,
+    }
+    output = args.output or os.path.join(os.path.dirname(os.path.abspath(__file__)), "results",
+                                         f"bench_{datetime.now():%Y%m%d_%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as file:
+        json.dump(report, file, indent=2)
+    print(f"\n✅ Results saved to {output}")
+
+    if args.baseline:
+        with open(args.baseline, 'r') as file:
+            regressions = compare_with_baseline(results, json.load(file), args.tolerance)
+        sys.exit(1 if regressions else 0)
@@ -0,0 +1,175 @@
+import os
+import sys
+import json
+import time
+import socket
+import asyncio
+import argparse
+import subprocess
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import matplotlib
+matplotlib.use('Agg')  # The plotter is only used for its per-step walk
+
+import SuperMarketPlotter_v2 as plotter_v2
+from RouteCodec import PATTERNS, ROUTE_SEPARATOR
+from RouteEvaluator import COLD_AISLES
+
+# Load test of the route-evaluation service (RouteService) on localhost. Starts
+# `SuperMarketCLI.py serve` on a free port (or targets --url), then runs --clients concurrent
+# keep-alive clients that each send --requests POST /evaluate batches of random routes.
+# A --repeat share of the routes is drawn from a small hot pool so the result cache gets hits.
+# Reports client-side p50/p99 latency and throughput, the server's /metrics, and checks
+# --verify answers against SuperMarketPlotter_v2.generate_walking_path.
+#
+#   python benchmarks/load_test_service.py --clients 16 --requests 200 --batch 64 --repeat 0.5
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+# 🛠️ Function to send one HTTP/1.1 request over a keep-alive connection
+async def request(reader, writer, method, path, payload=None):
+    """Returns (status, decoded JSON body)."""
+    body = json.dumps(payload).encode() if payload is not None else b''
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\n"
+                 f"Content-Length: {len(body)}\r\n\r\n".encode('latin-1') + body)
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        if name.strip().lower() == 'content-length':
+            length = int(value)
+    return status, json.loads(await reader.readexactly(length))
+
+# 🛠️ Function to open a connection, send one request and close it
+async def fetch(host, port, method, path, payload=None):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        return await request(reader, writer, method, path, payload)
+    finally:
+        writer.close()
+
+# 🛠️ Function to draw random routes over the aisles of a layout
+def random_routes(aisles, count, rng):
+    """Returns (route strings without '<'/'>', pattern names), like the optimizer's stored routes."""
+    routes = [ROUTE_SEPARATOR.join(rng.permutation(aisles)) for _ in range(count)]
+    return routes, [PATTERNS[i] for i in rng.integers(0, len(PATTERNS), count)]
+
+# 🛠️ Function to run one client's requests
+async def client(host, port, aisles, args, seed, hot_pool):
+    """Returns the latency of every request and the (routes, patterns, response) of the first few."""
+    rng = np.random.default_rng(seed)
+    reader, writer = await asyncio.open_connection(host, port)
+    latencies, samples = [], []
+    try:
+        for _ in range(args.requests):
+            routes, patterns = random_routes(aisles, args.batch, rng)
+            for i in np.flatnonzero(rng.random(args.batch) < args.repeat):
+                routes[i], patterns[i] = hot_pool[rng.integers(len(hot_pool))]
+            start = time.perf_counter()
+            status, response = await request(reader, writer, 'POST', '/evaluate', {'routes': routes, 'patterns': patterns})
+            latencies.append(time.perf_counter() - start)
+            if status != 200:
+                raise RuntimeError(f"Server answered {status}: {response}")
+            if len(samples) < args.verify:
+                samples.append((routes, patterns, response))
+    finally:
+        writer.close()
+    return latencies, samples
+
+# 🛠️ Function to check answers against the per-step walk of SuperMarketPlotter_v2
+def verify(samples, layout_file, limit):
+    """Returns (routes checked, mismatches)."""
+    grid = plotter_v2.convert_layout_to_grid(plotter_v2.load_market_layout(layout_file))
+    positions = plotter_v2.find_positions(grid)
+    checked = mismatches = 0
+    for routes, patterns, response in samples:
+        for i, (route, pattern) in enumerate(zip(routes, patterns)):
+            if checked == limit:
+                return checked, mismatches
+            _, step_numbers, _, _, foul_passes, decay_over_time = plotter_v2.generate_walking_path(
+                positions, ['<'] + route.split(ROUTE_SEPARATOR) + ['>'], pattern, COLD_AISLES, layout_grid=grid)
+            expected = (len(step_numbers) - 2, len(foul_passes), decay_over_time[-1][1])
+            actual = (response['WalkingTime'][i], response['FoulPasses'][i], response['ExposureTime'][i])
+            mismatches += expected != tuple(int(value) for value in actual)
+            checked += 1
+    return checked, mismatches
+
+# 🛠️ Function to start the service on a free local port
+def start_server(layout_file, cache_size):
+    with socket.socket() as probe:
+        probe.bind(('127.0.0.1', 0))
+        port = probe.getsockname()[1]
+    process = subprocess.Popen([sys.executable, os.path.join(ROOT, "SuperMarketCLI.py"), "serve", "--port", str(port),
+                                "--layout", layout_file, "--cache-size", str(cache_size)], cwd=ROOT)
+    return process, port
+
+# 🛠️ Function to wait until the service answers /health
+async def wait_ready(host, port, timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            if (await fetch(host, port, 'GET', '/health'))[0] == 200:
+                return
+        except OSError:
+            await asyncio.sleep(0.1)
+    raise TimeoutError(f"Service on {host}:{port} did not start within {timeout}s")
+
+# 🛠️ Function to run the whole load test
+async def load_test(host, port, args):
+    await wait_ready(host, port)
+    layout = plotter_v2.load_market_layout(args.layout)
+    aisles = sorted(set(plotter_v2.find_positions(plotter_v2.convert_layout_to_grid(layout))) - {'<', '>', 'x'})
+    hot_pool = list(zip(*random_routes(aisles, args.hot_routes, np.random.default_rng(0))))
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*[client(host, port, aisles, args, seed + 1, hot_pool) for seed in range(args.clients)])
+    elapsed = time.perf_counter() - start
+    latencies = np.concatenate([result[0] for result in results]) * 1e3
+    _, metrics = await fetch(host, port, 'GET', '/metrics')
+    return latencies, elapsed, [sample for result in results for sample in result[1]], metrics
+
+
+# **Main Execution**
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local load test of the route-evaluation service")
+    parser.add_argument("--url", help="Target a running service (e.g. http://127.0.0.1:8765) instead of starting one")
+    parser.add_argument("--layout", default=os.path.join(ROOT, "market_layout.json"), help="Layout the service evaluates on")
+    parser.add_argument("--clients", type=int, default=16, help="Concurrent keep-alive connections")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per client")
+    parser.add_argument("--batch", type=int, default=64, help="Routes per request")
+    parser.add_argument("--repeat", type=float, default=0.5, help="Share of routes drawn from the hot pool")
+    parser.add_argument("--hot-routes", type=int, default=500, help="Size of the hot pool")
+    parser.add_argument("--cache-size", type=int, default=100_000, help="Result cache of the started service")
+    parser.add_argument("--verify", type=int, default=500, help="Routes checked against generate_walking_path")
+    args = parser.parse_args()
+
+    process = None
+    if args.url:
+        host, port = args.url.split('//')[-1].rstrip('/').rsplit(':', 1)
+        port = int(port)
+    else:
+        process, port = start_server(args.layout, args.cache_size)
+        host = '127.0.0.1'
+    try:
+        latencies, elapsed, samples, metrics = asyncio.run(load_test(host, port, args))
+    finally:
+        if process:
+            process.terminate()
+            process.wait()
+
+    routes = len(latencies) * args.batch
+    p50, p99 = np.percentile(latencies, [50, 99])
+    print(f"⏱️ {len(latencies):,} requests ({routes:,} routes) from {args.clients} clients in {elapsed:.2f}s: "
+          f"{len(latencies) / elapsed:,.0f} requests/s, {routes / elapsed:,.0f} routes/s")
+    print(f"⏱️ Client latency: p50 {p50:.2f}ms, p99 {p99:.2f}ms, max {latencies.max():.2f}ms")
+    print("📊 **Server Metrics:**")
+    print(json.dumps(metrics, indent=2))
+    checked, mismatches = verify(samples, args.layout, args.verify)
+    print(f"🔍 Parity with generate_walking_path: {checked - mismatches}/{checked} routes match")
+    sys.exit(0 if mismatches == 0 else 1)
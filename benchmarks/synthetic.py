@@ -0,0 +1,129 @@
+import os
+import sys
+import json
+import argparse
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from RouteCodec import PATTERNS
+from RouteEvaluator import RouteEvaluator
+
+# Synthetic run trees shaped like the optimizer's output:
+#   Run_<name>/market_layout.json
+#   Run_<name>/Run<i>/<Algorithm>/<Algorithm>_raw_data.csv
+# Layouts are drawn like MarketLayout(rows, cols, ratio) in the C# code, and the objectives
+# of every random route are computed with the optimizer's own model, so the data is
+# self-consistent (RouteEvaluator.validate_frame accepts every row).
+
+ALGORITHMS = ['GeneticAlgorithm', 'MOEADAlgorithm', 'NSGA2Algorithm', 'NSGA3Algorithm', 'SPEA2Algorithm']
+AISLES = [chr(code) for code in range(ord('A'), ord('Z') + 1)]
+FOUL_RATIO = 0.3  # Share of non-aisle cells that are foul in market_layout.json
+
+
+# 🛠️ Function to draw a random market layout
+def random_layout(rows=12, cols=12, foul_ratio=FOUL_RATIO, seed=None):
+    """
+    Places the aisles A-Z on random cells, makes `foul_ratio` of the remaining cells foul ('x'),
+    then puts the entrance '<' and exit '>' on two empty cells. Returns a layout dict.
+    """
+    if rows * cols < len(AISLES) + 2:
+        raise ValueError(f"A {rows}x{cols} layout cannot hold {len(AISLES)} aisles plus entrance and exit")
+    rng = np.random.default_rng(seed)
+    cells = np.full(rows * cols, '0', dtype='<U1')
+    order = rng.permutation(rows * cols)
+    cells[order[:len(AISLES)]] = AISLES
+    empty = order[len(AISLES):]
+    foul_count = int(len(empty) * foul_ratio)
+    cells[empty[:foul_count]] = 'x'
+    zero_cells = empty[foul_count:]
+    if len(zero_cells) < 2:
+        raise ValueError("No room left for the entrance and exit; lower foul_ratio")
+    cells[zero_cells[0]], cells[zero_cells[1]] = '<', '>'
+    return {'Rows': rows, 'Cols': cols, 'IsleMatrix': cells.tolist()}
+
+# 🛠️ Function to draw a large sparse layout with multi-character aisle ids
+def random_sparse_layout(rows=200, cols=300, aisles=1000, cells_per_aisle=3, foul_ratio=0.05, prefix='A',
+                         entrance_exit=True, seed=None):
+    """
+    Places `aisles` aisles named <prefix>0000, <prefix>0001, ... on runs of `cells_per_aisle`
+    horizontally adjacent cells (access cell first), plus '<' and '>' on single cells, and makes
+    `foul_ratio` of the grid foul. Returns a sparse layout dict (see MarketLayout).
+    """
+    rng = np.random.default_rng(seed)
+    slots_per_row = cols // cells_per_aisle
+    extra = 2 if entrance_exit else 0
+    if rows * slots_per_row < aisles + extra:
+        raise ValueError(f"A {rows}x{cols} layout cannot hold {aisles} aisles of {cells_per_aisle} cells")
+    slots = rng.choice(rows * slots_per_row, aisles + extra, replace=False)
+    starts = np.column_stack([slots // slots_per_row, slots % slots_per_row * cells_per_aisle])
+    width = len(str(max(aisles - 1, 0)))
+    layout_aisles = {f"{prefix}{i:0{max(width, 4)}d}": [[int(r), int(c) + k] for k in range(cells_per_aisle)]
+                     for i, (r, c) in enumerate(starts[:aisles])}
+    if entrance_exit:
+        layout_aisles['<'] = [starts[aisles].tolist()]
+        layout_aisles['>'] = [starts[aisles + 1].tolist()]
+    taken = np.zeros(rows * cols, dtype=bool)
+    for cells in layout_aisles.values():
+        taken[[r * cols + c for r, c in cells]] = True
+    candidates = np.flatnonzero(~taken)
+    foul = rng.choice(candidates, min(int(rows * cols * foul_ratio), len(candidates)), replace=False)
+    return {'Format': 'sparse', 'Rows': rows, 'Cols': cols, 'Aisles': layout_aisles,
+            'Foul': np.column_stack([foul // cols, foul % cols]).tolist()}
+
+# 🛠️ Function to generate one algorithm's raw data
+def random_raw_data(evaluator, generations, population, rng):
+    """Returns a raw data table of `generations` x `population` random routes scored like the optimizer."""
+    count = generations * population
+    aisles = np.array([evaluator.codec.index[aisle] for aisle in AISLES], dtype=evaluator.codec.dtype)
+    route_codes = rng.permuted(np.tile(aisles, (count, 1)), axis=1)
+    pattern_codes = rng.integers(0, len(PATTERNS), count)
+    scores = evaluator.evaluate(evaluator.with_entrance_exit(route_codes), pattern_codes, model='optimizer')
+    return pd.DataFrame({
+        'Generation': np.repeat(np.arange(generations), population),
+        'WalkingTime': scores['WalkingTime'],
+        'ExposureTime': scores['ExposureTime'],
+        'IsleOrder': evaluator.codec.decode(route_codes),
+        'WalkingPattern': np.asarray(PATTERNS, dtype=object)[pattern_codes],
+    })
+
+# 🛠️ Function to write a whole synthetic run tree
+def generate_run_tree(output_dir, runs=10, algorithms=3, generations=80, population=500,
+                      rows=12, cols=12, foul_ratio=FOUL_RATIO, seed=0, name="Run_synthetic"):
+    """
+    Writes a run tree with `runs` runs of the first `algorithms` algorithms (or an explicit list),
+    each with `generations` x `population` rows, and returns the path of its Run_ folder.
+    """
+    rng = np.random.default_rng(seed)
+    algorithm_names = ALGORITHMS[:algorithms] if isinstance(algorithms, int) else list(algorithms)
+    root_dir = os.path.join(output_dir, name)
+    os.makedirs(root_dir, exist_ok=True)
+    layout = random_layout(rows, cols, foul_ratio, seed=rng.integers(2**32))
+    with open(os.path.join(root_dir, "market_layout.json"), 'w') as file:
+        json.dump(layout, file)
+    evaluator = RouteEvaluator.from_layout(layout, zigzag='balance')
+    for run in range(1, runs + 1):
+        for algorithm in algorithm_names:
+            algorithm_dir = os.path.join(root_dir, f"Run{run}", algorithm)
+            os.makedirs(algorithm_dir, exist_ok=True)
+            df = random_raw_data(evaluator, generations, population, rng)
+            df.to_csv(os.path.join(algorithm_dir, f"{algorithm}_raw_data.csv"), index=False)
+    return root_dir
+
+
+# **Main Execution**
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a synthetic optimizer run tree")
+    parser.add_argument("output_dir")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--algorithms", type=int, default=3, help=f"How many of {ALGORITHMS}")
+    parser.add_argument("--generations", type=int, default=80)
+    parser.add_argument("--population", type=int, default=500)
+    parser.add_argument("--rows", type=int, default=12)
+    parser.add_argument("--cols", type=int, default=12)
+    parser.add_argument("--foul-ratio", type=float, default=FOUL_RATIO)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    root = generate_run_tree(args.output_dir, args.runs, args.algorithms, args.generations, args.population,
+                             args.rows, args.cols, args.foul_ratio, args.seed)
+    print(f"✅ Synthetic run tree written to {root}")
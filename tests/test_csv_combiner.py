@@ -0,0 +1,25 @@
+import os
+import pandas as pd
+import pytest
+
+from CSV_Combiner import merge_all_runs
+
+# merge_all_runs must align files with other column orders or sets by name, like pd.concat.
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_merge_aligns_columns_by_name(tmp_path, workers):
+    first = pd.DataFrame({'Generation': [0, 1], 'WalkingTime': [5.0, 6.0], 'ExposureTime': [1.0, 2.0],
+                          'IsleOrder': ['A->B', 'B->A'], 'WalkingPattern': ['V2H', 'H2V']})
+    second = first[['ExposureTime', 'Generation', 'IsleOrder', 'WalkingTime', 'WalkingPattern']].assign(Extra=[7, 8])
+    for run, frame in [('Run1', first), ('Run2', second)]:
+        os.makedirs(tmp_path / run / "NSGA2Algorithm")
+        frame.to_csv(tmp_path / run / "NSGA2Algorithm" / "NSGA2Algorithm_raw_data.csv", index=False)
+
+    output_file = str(tmp_path / "merged.csv")
+    merge_all_runs(str(tmp_path), output_file, workers=workers)
+    expected = pd.concat([first.assign(Run='Run1', Algorithm='NSGA2Algorithm'),
+                          second.assign(Run='Run2', Algorithm='NSGA2Algorithm')], ignore_index=True)
+    merged = pd.read_csv(output_file)
+    assert merged.columns[-2:].tolist() == ['Run', 'Algorithm']  # Tags stay last, after every data column
+    pd.testing.assert_frame_equal(merged, expected[merged.columns])
@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+
+from Dominance import dominates, nondominated_mask, non_dominated_ranks
+
+# nondominated_mask and non_dominated_ranks against pairwise dominance checks, with NaN rows mixed in.
+
+
+def brute_force_mask(points):
+    valid = ~np.isnan(points).any(axis=1)
+    return np.array([valid[i] and not any(valid[j] and dominates(points[j], points[i]) for j in range(len(points)))
+                     for i in range(len(points))])
+
+
+@pytest.mark.parametrize("objectives", [2, 3, 4])
+def test_nondominated_mask_with_nan_rows(objectives):
+    rng = np.random.default_rng(objectives)
+    for _ in range(50):
+        points = rng.integers(0, 6, size=(30, objectives)).astype(float)
+        points[rng.random(points.shape) < 0.05] = np.nan
+        assert np.array_equal(nondominated_mask(points), brute_force_mask(points))
+
+
+@pytest.mark.parametrize("objectives", [2, 3])
+def test_nan_rows_do_not_change_other_ranks(objectives):
+    rng = np.random.default_rng(objectives)
+    points = rng.integers(0, 6, size=(40, objectives)).astype(float)
+    with_nan = np.vstack([points, np.full((3, objectives), np.nan)])
+    with_nan[-2, 0] = 0.0  # Partly NaN rows are set aside too
+    ranks = non_dominated_ranks(with_nan)
+    assert np.array_equal(ranks[:len(points)], non_dominated_ranks(points))
+    assert (ranks[len(points):] == ranks[:len(points)].max() + 1).all()
+
+
+def test_nan_in_second_objective_regression():
+    points = [[0, np.nan], [1, 2], [3, 3]]
+    assert nondominated_mask(points).tolist() == [False, True, False]
+    assert non_dominated_ranks(points).tolist() == [3, 1, 2]
@@ -0,0 +1,30 @@
+import numpy as np
+import pytest
+
+from QualityIndicators import hypervolume, hv_contributions
+
+# hv_contributions against brute force: the hypervolume lost by removing one row at a time.
+
+
+def brute_force_contributions(points, reference_point):
+    total = hypervolume(points, reference_point)
+    return np.array([total - hypervolume(np.delete(points, i, axis=0), reference_point) for i in range(len(points))])
+
+
+def random_points(rng, objectives, rows=12):
+    """Integer points (so duplicates and ties occur), some dominated and some outside the box."""
+    return rng.integers(0, 9, size=(rows, objectives)).astype(float)
+
+
+@pytest.mark.parametrize("objectives", [2, 3, 4, 5])
+def test_hv_contributions_match_brute_force(objectives):
+    rng = np.random.default_rng(objectives)
+    reference_point = np.full(objectives, 8.0)
+    for _ in range(100):
+        points = random_points(rng, objectives)
+        assert np.allclose(hv_contributions(points, reference_point), brute_force_contributions(points, reference_point))
+
+
+def test_dominated_row_reexposed_regression():
+    assert hv_contributions([[0, 1], [6, 7]], [8, 8]).tolist() == [54.0, 0.0]
+    assert hv_contributions([[0, 1, 0], [6, 7, 6]], [8, 8, 8]).tolist() == [444.0, 0.0]
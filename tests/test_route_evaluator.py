@@ -0,0 +1,27 @@
+import os
+import pytest
+
+import SuperMarketPlotter_v2 as plotter_v2
+from RouteEvaluator import RouteEvaluator
+from bench_route_evaluator import check_parity, random_routes, multi_cell_layout
+
+# RouteEvaluator's 'decay' model must give the walking time, foul passes and decay of
+# SuperMarketPlotter_v2.generate_walking_path, route for route.
+
+LAYOUT_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "market_layout.json")
+
+
+def test_parity_on_market_layout():
+    grid = plotter_v2.convert_layout_to_grid(plotter_v2.load_market_layout(LAYOUT_FILE))
+    evaluator = RouteEvaluator.from_layout(grid)
+    assert check_parity(evaluator, grid, *random_routes(evaluator, 300, seed=1)) == 0
+
+
+@pytest.mark.parametrize("cells_per_aisle", [1, 3])
+def test_parity_on_sparse_layout(cells_per_aisle):
+    """Multi-cell aisles: walks cross other cells of their target aisle before reaching its access cell."""
+    layout, cold_aisles = multi_cell_layout(cells_per_aisle=cells_per_aisle)
+    evaluator = RouteEvaluator.from_layout(layout, cold_aisles=cold_aisles)
+    route_codes, pattern_codes = random_routes(evaluator, 100, seed=3)
+    assert check_parity(evaluator, layout, route_codes, pattern_codes, cold_aisles=cold_aisles) == 0
+